@@ -0,0 +1,134 @@
+"""
+API Client — one pooled Anthropic client per process.
+
+Every component used to build its own client, so each opened its own
+connections and paid its own TLS handshakes. Clients now come from here
+and are shared: one per API key (and, for the asyncio client, per event
+loop, which its connections belong to), each over a keep-alive
+connection pool.
+
+Synchronous callers run coroutines with run_sync(), on one background
+event loop, so every ClaudeBackend in the process also shares a single
+asyncio client.
+
+Pool sizes come from the environment:
+- GATEKEEPER_API_MAX_CONNECTIONS   connections per client (default 32)
+- GATEKEEPER_API_MAX_KEEPALIVE     idle connections kept open (default 16)
+- GATEKEEPER_API_KEEPALIVE_EXPIRY  seconds an idle connection lives (default 60)
+
+State is dropped in a forked child, which must not reuse the parent's
+sockets or event loop thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+
+import anthropic
+
+
+MAX_CONNECTIONS_ENV = "GATEKEEPER_API_MAX_CONNECTIONS"
+MAX_KEEPALIVE_ENV = "GATEKEEPER_API_MAX_KEEPALIVE"
+KEEPALIVE_EXPIRY_ENV = "GATEKEEPER_API_KEEPALIVE_EXPIRY"
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_MAX_KEEPALIVE = 16
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_clients: Dict[str, anthropic.Anthropic] = {}
+# event loop -> {API key: client}
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def pool_limits() -> Any:
+    """
+    Connection pool limits, from the environment, as the Limits type of
+    the HTTP library this anthropic release is built on.
+    """
+    return type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=int(
+            os.environ.get(MAX_CONNECTIONS_ENV, DEFAULT_MAX_CONNECTIONS)
+        ),
+        max_keepalive_connections=int(
+            os.environ.get(MAX_KEEPALIVE_ENV, DEFAULT_MAX_KEEPALIVE)
+        ),
+        keepalive_expiry=float(
+            os.environ.get(KEEPALIVE_EXPIRY_ENV, DEFAULT_KEEPALIVE_EXPIRY)
+        ),
+    )
+
+
+def _check_fork() -> None:
+    """Forget the parent's clients and loop in a forked child. Holds _lock."""
+    global _pid, _loop
+    if os.getpid() != _pid:
+        _pid = os.getpid()
+        _clients.clear()
+        _async_clients.clear()
+        _loop = None
+
+
+def _api_key(api_key: Optional[str]) -> Optional[str]:
+    return api_key or os.environ.get("ANTHROPIC_API_KEY")
+
+
+def shared_client(api_key: Optional[str] = None) -> anthropic.Anthropic:
+    """The process-wide client for this API key ($ANTHROPIC_API_KEY by default)."""
+    api_key = _api_key(api_key)
+    with _lock:
+        _check_fork()
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = anthropic.Anthropic(
+                api_key=api_key,
+                http_client=anthropic.DefaultHttpxClient(limits=pool_limits()),
+            )
+        return client
+
+
+def shared_async_client(api_key: Optional[str] = None) -> anthropic.AsyncAnthropic:
+    """
+    The asyncio client for this API key, shared within the running event
+    loop. Must be called from a coroutine.
+    """
+    api_key = _api_key(api_key)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _check_fork()
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = clients[api_key] = anthropic.AsyncAnthropic(
+                api_key=api_key,
+                http_client=anthropic.DefaultAsyncHttpxClient(limits=pool_limits()),
+            )
+        return client
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        _check_fork()
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="gatekeeper-api", daemon=True
+            ).start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the process-wide background loop and block until
+    it completes. Safe from any thread except that loop's own.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
@@ -0,0 +1,73 @@
+"""
+Archive Reader — streams the members of wheels, zips and tarballs.
+
+Built artifacts are gated without extracting them: members are read
+straight out of the archive, one at a time and in archive order, and
+named "archive!member" in findings. Tarballs are opened as a stream, so
+compressed tars are decompressed in a single forward pass.
+
+Path rules and profiles see a member as a file in a directory named after
+its archive (see rule_path), so "pkg.whl!secrets/key.py" lies under
+"secrets" just like "pkg/secrets/key.py" would.
+"""
+
+import re
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Tuple
+
+
+ZIP_SUFFIXES = (".whl", ".zip")
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar")
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+MEMBER_SEPARATOR = "!"
+
+# The separator right after an archive name; "!" elsewhere is a plain character
+_MEMBER_BOUNDARY = re.compile(
+    "(%s)%s" % ("|".join(re.escape(s) for s in ARCHIVE_SUFFIXES), re.escape(MEMBER_SEPARATOR)),
+    re.IGNORECASE,
+)
+
+# Archives that cannot be read at all
+ARCHIVE_ERRORS = (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError)
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def member_path(archive: str, member: str) -> str:
+    return f"{archive}{MEMBER_SEPARATOR}{member}"
+
+
+def rule_path(path: str) -> str:
+    """path with each "archive!" boundary turned into a "/" separator."""
+    if MEMBER_SEPARATOR not in path:
+        return path
+    return _MEMBER_BOUNDARY.sub(r"\1/", path)
+
+
+def iter_members(path: str) -> Iterator[Tuple[str, int, BinaryIO]]:
+    """
+    (name, size, file object) for every regular file in the archive.
+    Each file object is only readable until the next member is requested;
+    what is left of it unread is skipped. Raises one of ARCHIVE_ERRORS if
+    the archive is unreadable.
+    """
+    if path.lower().endswith(ZIP_SUFFIXES):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                with zf.open(info) as f:
+                    yield info.filename, info.file_size, f
+        return
+
+    with tarfile.open(path, "r|*") as tf:
+        for member in tf:
+            if not member.isfile():
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                yield member.name, member.size, f
@@ -6,8 +6,11 @@ Handles processing multiple Python files with glob pattern support.
 
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from judge import judge_code
+from file_classifier import FileClassifier
+from ignore_rules import IgnoreMatcher
+from tree_walker import glob_files
 from loop_controller import run_loop
 
 
@@ -17,7 +20,8 @@ MAX_FILES = 1000
 def find_python_files(
     patterns: List[str],
     exclude_patterns: List[str] = None,
-    recursive: bool = True
+    recursive: bool = True,
+    classifier: Optional[FileClassifier] = None
 ) -> List[Path]:
     """
     Find all Python files matching patterns.
@@ -26,6 +30,7 @@ def find_python_files(
         patterns: List of glob patterns to include
         exclude_patterns: List of glob patterns to exclude
         recursive: Search subdirectories
+        classifier: Leaves out (and counts) generated and vendored files
     
     Returns:
         List of Python file paths
@@ -33,31 +38,31 @@ def find_python_files(
     if exclude_patterns is None:
         exclude_patterns = []
     
-    all_files = set()
     cwd = Path.cwd()
+    ignore = IgnoreMatcher.discover(str(cwd))
+    
+    def _expand(pattern_list: List[str]) -> set:
+        expanded = []
+        for pattern in pattern_list:
+            if recursive and '**' not in pattern:
+                pattern = f"**/{pattern}"
+            expanded.append(pattern)
+        return set(glob_files(expanded, base=str(cwd), ignore=ignore))
     
-    # Find files matching include patterns
-    for pattern in patterns:
-        if recursive and '**' not in pattern:
-            pattern = f"**/{pattern}"
-        
-        matched = list(cwd.glob(pattern))
-        all_files.update(matched)
+    # Find files matching include patterns (ignored directories are pruned)
+    all_files = _expand(patterns)
     
     # Filter out excluded patterns
-    excluded_files = set()
-    for pattern in exclude_patterns:
-        if recursive and '**' not in pattern:
-            pattern = f"**/{pattern}"
-        
-        matched = list(cwd.glob(pattern))
-        excluded_files.update(matched)
+    excluded_files = _expand(exclude_patterns) if exclude_patterns else set()
     
     # Keep only Python files that aren't excluded
     result = []
-    for f in all_files:
-        if f.is_file() and f.suffix == '.py' and f not in excluded_files:
-            result.append(f)
+    for rel in all_files - excluded_files:
+        if not rel.endswith('.py'):
+            continue
+        if classifier is not None and classifier.classify_file(rel):
+            continue
+        result.append(cwd / rel)
     
     return sorted(result)
 
@@ -85,19 +90,22 @@ def process_batch(
         Batch processing summary
     """
     
-    # Find all matching files
-    all_files = find_python_files(paths, exclude_patterns, recursive)
+    # Find all matching files, leaving out generated and vendored ones
+    classifier = FileClassifier(str(Path.cwd()))
+    all_files = find_python_files(paths, exclude_patterns, recursive, classifier)
     
     # Safety limit
     if len(all_files) > MAX_FILES:
         return {
             "total_files": len(all_files),
+            "skipped_files": dict(classifier.skipped),
             "ci_pass": False,
             "error": f"Refusing to process {len(all_files)} files (limit {MAX_FILES})"
         }
     
     results = {
         "total_files": len(all_files),
+        "skipped_files": dict(classifier.skipped),
         "compliant_files": 0,
         "non_compliant_files": 0,
         "files_repaired": 0,
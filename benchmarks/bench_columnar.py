@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scalar vs columnar policy evaluation.
+
+Evaluates POLICY_RULES over --findings synthetic findings (default 1M)
+both ways, checks the results are identical, and reports timings.
+
+    python benchmarks/bench_columnar.py --findings 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import policy_columnar  # noqa: E402
+from policy_engine import Finding, apply_policy_engine  # noqa: E402
+
+
+def synthetic_findings(n: int):
+    """Findings grouped by directory, as the scanner's walk yields them."""
+    rng = random.Random(0)
+    dirs = [f"pkg{i}/mod{j}" for i in range(50) for j in range(20)] + ["secrets", "private"]
+    per_dir = max(1, n // len(dirs))
+    return [
+        Finding(
+            id=f"/repo/{d}/f{i}.py",
+            type="file",
+            path=f"/repo/{d}/f{i}.py",
+            signal="missing_metadata" if i % 97 == 0 else "ok",
+            metadata={"line_count": rng.randint(1, 510)},
+        )
+        for i, d in ((i, dirs[(i // per_dir) % len(dirs)]) for i in range(n))
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    findings = synthetic_findings(args.findings)
+
+    scalar_s, scalar = timed(lambda: apply_policy_engine(findings))
+    columnar_s, columnar = timed(lambda: apply_policy_engine(findings, columnar=True))
+
+    assert scalar == columnar, "columnar results differ from scalar"
+
+    print(json.dumps({
+        "findings": args.findings,
+        "numpy": policy_columnar.np is not None,
+        "judgements": len(scalar["judgements"]),
+        "scalar_seconds": round(scalar_s, 3),
+        "columnar_seconds": round(columnar_s, 3),
+        "speedup": round(scalar_s / columnar_s, 2) if columnar_s else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: scanner._read_file_metadata vs the old text-mode count.
+
+The old implementation decoded the whole file as UTF-8 and iterated it
+line by line. The new one counts newline bytes over mmap'd chunks and
+computes every other metadata field (sha256, encoding, ...) in the same
+pass. Both are run on a generated text file and a binary blob of
+--size-mb each (default 2048 MB).
+
+    python benchmarks/bench_line_count.py --size-mb 2048
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import _read_file_metadata  # noqa: E402
+
+
+def legacy_line_count(path: str):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in f)
+
+
+def write_text(path: str, size: int) -> None:
+    block = b"".join(
+        b"x" * (i % 120) + b"\n" for i in range(4096)
+    )
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            f.write(block)
+            written += len(block)
+
+
+def write_binary(path: str, size: int) -> None:
+    block = os.urandom(1 << 20)
+    with open(path, "wb") as f:
+        f.write(b"\x00" * 16)
+        for _ in range(max(1, size >> 20)):
+            f.write(block)
+
+
+def timed(fn, path):
+    start = time.perf_counter()
+    result = fn(path)
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=2048)
+    args = parser.parse_args()
+    size = args.size_mb << 20
+
+    report = {"size_mb": args.size_mb}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, writer in (("text", write_text), ("binary", write_binary)):
+            path = os.path.join(tmp, kind)
+            writer(path, size)
+
+            legacy_s, legacy_count = timed(legacy_line_count, path)
+            new_s, metadata = timed(_read_file_metadata, path)
+
+            report[kind] = {
+                "legacy_seconds": round(legacy_s, 3),
+                "mmap_seconds": round(new_s, 3),
+                "speedup": round(legacy_s / new_s, 2) if new_s else None,
+                "legacy_line_count": legacy_count,
+                "line_count": metadata["line_count"],
+            }
+            os.remove(path)
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
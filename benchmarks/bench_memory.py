@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held by a synthetic scan, old vs compact representation.
+
+Builds --files findings (default 1M) shaped like a full scan's output,
+plus a judgement for every 20th file, once with the previous dict-backed
+frozen dataclasses and once with the slotted Finding / PolicyJudgement
+and FileMetadata. The encoding string is rebuilt per file, as it is when
+metadata is loaded back from the scan index. Reports tracemalloc's
+retained and peak bytes for each.
+
+    python benchmarks/bench_memory.py --files 1000000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_metadata import FileMetadata  # noqa: E402
+from policy_engine import Finding, PolicyJudgement  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LegacyFinding:
+    id: str
+    type: str
+    path: str
+    signal: str
+    metadata: Dict
+
+
+@dataclass(frozen=True)
+class LegacyJudgement:
+    finding_id: str
+    rule_id: str
+    status: str
+    confidence: float
+    reason: str
+    suggested_fix: Optional[str] = None
+
+
+def fresh(s: str) -> str:
+    """An equal but distinct string object, like one decoded from JSON."""
+    return json.loads(json.dumps(s))
+
+
+def synthetic_scan(n: int, finding_cls, judgement_cls, metadata_cls):
+    findings = []
+    judgements = []
+    for i in range(n):
+        path = f"/repo/pkg{i % 1000}/mod{i % 37}/file{i}.py"
+        metadata = metadata_cls({
+            "line_count": i % 700,
+            "size": (i % 700) * 31,
+            "sha256": f"{i:064x}",
+            "binary": False,
+            "encoding": fresh("utf-8"),
+            "shebang": None,
+            "header": f'"""Module {i}."""\n\nimport os\n',
+        })
+        findings.append(finding_cls(
+            id=path, type="file", path=path, signal="ok", metadata=metadata,
+        ))
+        if i % 20 == 0:
+            judgements.append(judgement_cls(
+                finding_id=path,
+                rule_id="FILE_TOO_LARGE",
+                status="warn",
+                confidence=0.75,
+                reason="File exceeds the recommended maximum line count.",
+            ))
+    return findings, judgements
+
+
+def measure(n: int, *classes) -> Dict[str, int]:
+    gc.collect()
+    tracemalloc.start()
+    scan = synthetic_scan(n, *classes)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del scan
+    return {"retained_bytes": current, "peak_bytes": peak}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    old = measure(args.files, LegacyFinding, LegacyJudgement, dict)
+    new = measure(args.files, Finding, PolicyJudgement, FileMetadata)
+
+    print(json.dumps({
+        "files": args.files,
+        "old": old,
+        "new": new,
+        "retained_ratio": round(new["retained_bytes"] / old["retained_bytes"], 3),
+        "bytes_per_file_old": old["retained_bytes"] // args.files,
+        "bytes_per_file_new": new["retained_bytes"] // args.files,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
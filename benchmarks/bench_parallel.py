@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential vs process-pool policy evaluation.
+
+Writes --files synthetic source files to a temporary tree, scans it with
+all metadata deferred (so line counting happens inside rule evaluation),
+then evaluates POLICY_RULES sequentially and with --workers processes,
+checks the results are identical, and reports timings.
+
+    python benchmarks/bench_parallel.py --files 5000 --workers 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scanner  # noqa: E402
+from policy_engine import apply_policy_engine  # noqa: E402
+
+
+def write_tree(root: str, n: int) -> None:
+    rng = random.Random(0)
+    for i in range(n):
+        d = os.path.join(root, f"pkg{i % 50}")
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"f{i}.py"), "w") as f:
+            f.write("x = 1  # padding padding padding\n" * rng.randint(10, 4000))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    scanner._git_changed_files = lambda *args: set()
+
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root, args.files)
+
+        def run(workers):
+            findings = scanner.iter_scan_target(root, fields=(), workers=1)
+            return apply_policy_engine(findings, workers=workers)
+
+        sequential_s, sequential = timed(lambda: run(1))
+        parallel_s, parallel = timed(lambda: run(args.workers))
+
+    assert sequential == parallel, "sharded results differ from sequential"
+
+    print(json.dumps({
+        "files": args.files,
+        "workers": args.workers,
+        "judgements": len(sequential["judgements"]),
+        "sequential_seconds": round(sequential_s, 3),
+        "parallel_seconds": round(parallel_s, 3),
+        "speedup": round(sequential_s / parallel_s, 2) if parallel_s else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold vs warm scan_target with the persistent scan index.
+
+Builds a synthetic tree (default 500k files) and reports wall time for
+a cold scan (empty index) and a warm scan (every entry reused).
+
+    python benchmarks/bench_scan_index.py --files 500000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scanner import scan_target  # noqa: E402
+from scan_index import ScanIndex  # noqa: E402
+
+
+def build_tree(root: str, files: int, per_dir: int) -> None:
+    for i in range(files):
+        d = os.path.join(root, f"d{i // per_dir:05d}")
+        if i % per_dir == 0:
+            os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, f"f{i}.py"), "w") as f:
+            f.write("x = 1\n" * (i % 20 + 1))
+
+
+def timed_scan(root: str, index: ScanIndex) -> float:
+    start = time.perf_counter()
+    scan_target(root, index=index)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500_000)
+    parser.add_argument("--per-dir", type=int, default=1000)
+    parser.add_argument("--dir", help="Existing tree to scan instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.dir or os.path.join(tmp, "tree")
+        if not args.dir:
+            build_tree(root, args.files, args.per_dir)
+
+        index_path = os.path.join(tmp, "scan_index.json")
+
+        cold_index = ScanIndex.load(index_path)
+        cold = timed_scan(root, cold_index)
+        cold_index.save()
+
+        warm_index = ScanIndex.load(index_path)
+        warm = timed_scan(root, warm_index)
+
+        print(json.dumps({
+            "files": len(warm_index.entries),
+            "cold_seconds": round(cold, 3),
+            "warm_seconds": round(warm, 3),
+            "warm_hits": warm_index.hits,
+            "warm_misses": warm_index.misses,
+            "speedup": round(cold / warm, 2) if warm else None,
+        }, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
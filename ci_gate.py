@@ -11,6 +11,7 @@ Responsibilities:
 - Exit with correct semantics
 """
 
+import hashlib
 import os
 import sys
 from pathlib import Path
@@ -18,6 +19,11 @@ from pathlib import Path
 from gatekeeper_config import load_config
 from multi_judge import MultiAgentCodeJudge
 from artifact_writer import save_ci_summary
+from file_classifier import SNIFF_BYTES, FileClassifier
+from gate_memo import GateMemo, gate_fingerprint, git_tree_oid, merkle
+from gatekeeper.version import __version__
+from ignore_rules import IgnoreMatcher
+from tree_walker import glob_files
 from utils import print_header
 
 
@@ -39,20 +45,80 @@ def exit_error():
 # --------------------------------------------------
 # File collection
 # --------------------------------------------------
-def collect_files(include_paths: list[str]) -> dict[str, str]:
+def collect_files(
+    include_paths: list[str],
+    classifier: FileClassifier | None = None,
+) -> dict[str, str]:
+    """
+    Read the included files. With a classifier, generated and vendored
+    files are left out (and counted); path matches are never read.
+    """
     files: dict[str, str] = {}
-
-    for pattern in include_paths:
-        for path in Path(".").glob(pattern):
-            if path.is_file():
-                try:
-                    files[str(path)] = path.read_text()
-                except Exception:
-                    pass
+    ignore = IgnoreMatcher.discover(".")
+
+    for rel in glob_files(include_paths, base=".", ignore=ignore):
+        if classifier is not None and classifier.classify(rel):
+            continue
+        path = Path(rel)
+        try:
+            code = path.read_text()
+        except Exception:
+            continue
+        if classifier is not None:
+            kind = classifier.classify_head(rel, code[:SNIFF_BYTES])
+            if kind is not None:
+                classifier.count(kind)
+                continue
+        files[str(path)] = code
 
     return files
 
 
+# --------------------------------------------------
+# Memoization
+# --------------------------------------------------
+CONFIG_PATH = ".gatekeeper.yml"
+
+
+def ci_fingerprint(tree: str, mode: str) -> str:
+    """The tree together with the config, mode and release judging it."""
+    return gate_fingerprint(
+        tree,
+        config=hashlib.sha256(Path(CONFIG_PATH).read_bytes()).hexdigest(),
+        mode=mode,
+        release=__version__,
+    )
+
+
+def content_tree(files: dict[str, str]) -> str:
+    """Merkle hash over collected file contents."""
+    return merkle(
+        (path, hashlib.sha256(code.encode("utf-8", "surrogateescape")).hexdigest())
+        for path, code in files.items()
+    )
+
+
+# --------------------------------------------------
+# Judge
+# --------------------------------------------------
+def run_judge(config, files: dict[str, str], classifier: FileClassifier) -> dict:
+    judge = MultiAgentCodeJudge(
+        model=config.runtime.model,
+        profile=config.profile,
+        max_tokens=config.runtime.max_tokens,
+        temperature=config.runtime.temperature,
+        timeout=config.runtime.timeout,
+        cost_limit_usd=config.runtime.cost_limit_usd,
+    )
+
+    try:
+        return judge.judge_repo(files, classifier)
+    except Exception as exc:
+        print("\n❌ Internal error during CI execution")
+        print(f"   {type(exc).__name__}: {exc}")
+        exit_error()
+
+
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
@@ -66,7 +132,7 @@ def main():
     # Load config
     # --------------------------------------------------
     try:
-        config = load_config(".gatekeeper.yml")
+        config = load_config(CONFIG_PATH)
     except Exception as exc:
         print("\n❌ Config error:")
         print(f"   {exc}")
@@ -78,33 +144,37 @@ def main():
         print("⚠️  No files to check")
         exit_ok()
 
-    files = collect_files(include_paths)
-
-    if not files:
-        print("⚠️  No matching files found")
-        exit_ok()
-
-    # --------------------------------------------------
-    # Initialize judge
-    # --------------------------------------------------
-    judge = MultiAgentCodeJudge(
-        model=config.runtime.model,
-        profile=config.profile,
-        max_tokens=config.runtime.max_tokens,
-        temperature=config.runtime.temperature,
-        timeout=config.runtime.timeout,
-        cost_limit_usd=config.runtime.cost_limit_usd,
-    )
-
-    # --------------------------------------------------
-    # Run judge
-    # --------------------------------------------------
-    try:
-        result = judge.judge_repo(files)
-    except Exception as exc:
-        print("\n❌ Internal error during CI execution")
-        print(f"   {type(exc).__name__}: {exc}")
-        exit_error()
+    # A clean checkout of a tree gated before (a retry, another pipeline
+    # on the same commit) reuses the stored result without reading files;
+    # otherwise the collected contents are fingerprinted instead.
+    memo = None
+    if os.environ.get("GATEKEEPER_MEMO", "on") != "off":
+        memo = GateMemo.load()
+    tree = git_tree_oid(".") if memo is not None else None
+    fingerprint = ci_fingerprint(tree, mode) if tree else None
+    result = memo.lookup(fingerprint) if fingerprint else None
+
+    if result is None:
+        classifier = FileClassifier(".")
+        files = collect_files(include_paths, classifier)
+
+        if not files:
+            print("⚠️  No matching files found")
+            exit_ok()
+
+        if memo is not None and fingerprint is None:
+            fingerprint = ci_fingerprint(content_tree(files), mode)
+            result = memo.lookup(fingerprint)
+
+    if result is not None:
+        result["memoized"] = True
+    else:
+        result = run_judge(config, files, classifier)
+        result["memoized"] = False
+        # Partial results under the cost limit are not worth keeping
+        if memo is not None and not result["cost_limit_hit"]:
+            memo.store(fingerprint, result)
+            memo.save()
 
     # --------------------------------------------------
     # Persist artifacts
@@ -116,7 +186,11 @@ def main():
     # --------------------------------------------------
     print_header("RESULT SUMMARY")
 
+    if result["memoized"]:
+        print("♻️  Identical tree already gated — stored result reused")
     print(f"Files processed: {result['files_processed']} / {result['files_total']}")
+    for kind, count in sorted(result["skipped_files"].items()):
+        print(f"Skipped {kind + ':':<10}{count}")
     print(f"Average score:   {result['average_score']:.2f}")
     print(f"Threshold:       {result['threshold']:.2f}")
 
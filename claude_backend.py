@@ -7,15 +7,27 @@ Enterprise guarantees:
 - Cost tracking per call
 - Structured failure responses (no surprise crashes)
 - CI-safe fallback signaling
+- asyncio-native, with a bounded number of requests in flight
+
+AsyncClaudeBackend is the implementation: its judge() is a coroutine,
+so a pipeline can gather hundreds of them while a semaphore keeps at
+most max_concurrency requests open per event loop, and backoff between retries sleeps
+without blocking the event loop (and without holding a slot).
+ClaudeBackend is the blocking wrapper for synchronous callers.
+
+Neither owns an API client: requests go through the process-wide pooled
+clients of api_client, so connections are reused across instances.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
-import time
-import anthropic
+import weakref
 from typing import Dict, Any, Optional
 
+from api_client import run_sync, shared_async_client
+
 # ------------------------------------------------------------
 # Pricing table (USD per 1M tokens)
 # ------------------------------------------------------------
@@ -32,11 +44,12 @@ PRICING = {
 MAX_RETRIES = 3
 BACKOFF_SECONDS = [1, 2, 4]  # exponential
 DEFAULT_TIMEOUT = 30.0
+MAX_CONCURRENCY = 16  # requests in flight per AsyncClaudeBackend
 
 
-class ClaudeBackend:
+class AsyncClaudeBackend:
     """
-    Hardened Claude API client.
+    Hardened asyncio Claude API client.
 
     Never raises on transient failures.
     Always returns structured results.
@@ -48,23 +61,25 @@ class ClaudeBackend:
         max_tokens: int = 1500,
         temperature: float = 0.0,
         timeout: Optional[float] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
         **_ignored: Dict,
     ):
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        self.api_key = os.environ.get("ANTHROPIC_API_KEY")
 
-        self.available = bool(api_key)
+        self.available = bool(self.api_key)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.timeout = timeout or DEFAULT_TIMEOUT
+        self.max_concurrency = max_concurrency
 
-        self.client = (
-            anthropic.Anthropic(api_key=api_key)
-            if api_key
-            else None
-        )
+        # None: the pooled client shared by the running event loop
+        self.client = None
+
+        # event loop -> semaphore; one per loop, created inside it on first use
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
-        # ---- Usage tracking (per-call) ----
+        # ---- Usage tracking (last completed call) ----
         self.last_usage = {
             "input_tokens": 0,
             "output_tokens": 0,
@@ -109,7 +124,7 @@ class ClaudeBackend:
     # --------------------------------------------------------
     # Primary API
     # --------------------------------------------------------
-    def judge(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    async def judge(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """
         Execute a Claude request.
 
@@ -132,24 +147,31 @@ class ClaudeBackend:
                 "usage": self.last_usage,
             }
 
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        client = self.client or shared_async_client(self.api_key)
         messages = [{"role": "user", "content": user_prompt}]
 
         for attempt in range(MAX_RETRIES):
             try:
-                msg = self.client.messages.create(
-                    model=self.model,
-                    system=system_prompt,
-                    messages=messages,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    timeout=self.timeout,
-                )
+                async with semaphore:
+                    msg = await client.messages.create(
+                        model=self.model,
+                        system=system_prompt,
+                        messages=messages,
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        timeout=self.timeout,
+                    )
 
                 usage = msg.usage or {}
                 input_tokens = usage.input_tokens or 0
                 output_tokens = usage.output_tokens or 0
 
-                self.last_usage = {
+                call_usage = {
                     "input_tokens": input_tokens,
                     "output_tokens": output_tokens,
                     "total_tokens": input_tokens + output_tokens,
@@ -157,13 +179,14 @@ class ClaudeBackend:
                         input_tokens, output_tokens
                     ),
                 }
+                self.last_usage = call_usage
 
                 return {
                     "ok": True,
                     "text": msg.content[0].text.strip(),
                     "error_type": None,
                     "retryable": False,
-                    "usage": self.last_usage,
+                    "usage": call_usage,
                 }
 
             except Exception as exc:
@@ -178,7 +201,8 @@ class ClaudeBackend:
                         "usage": self.last_usage,
                     }
 
-                time.sleep(BACKOFF_SECONDS[attempt])
+                # Outside the semaphore: a backing-off call frees its slot
+                await asyncio.sleep(BACKOFF_SECONDS[attempt])
 
         # Should never reach here
         return {
@@ -190,6 +214,51 @@ class ClaudeBackend:
         }
 
 
+class ClaudeBackend:
+    """
+    Blocking wrapper around AsyncClaudeBackend, same result contract.
+
+    Requests run on the process-wide background loop of api_client, so
+    it can be used from any thread but not from inside a running event
+    loop (await AsyncClaudeBackend.judge there instead).
+    """
+
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        max_tokens: int = 1500,
+        temperature: float = 0.0,
+        timeout: Optional[float] = None,
+        **_ignored: Dict,
+    ):
+        self.backend = AsyncClaudeBackend(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=timeout,
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.backend.available
+
+    @property
+    def model(self) -> str:
+        return self.backend.model
+
+    @property
+    def timeout(self) -> float:
+        return self.backend.timeout
+
+    @property
+    def last_usage(self) -> Dict[str, Any]:
+        return self.backend.last_usage
+
+    def judge(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Execute a Claude request, blocking until it completes."""
+        return run_sync(self.backend.judge(system_prompt, user_prompt))
+
+
 # ------------------------------------------------------------
 # Manual sanity check
 # ------------------------------------------------------------
@@ -2,10 +2,25 @@
 
 import argparse
 import json
+import os
+import subprocess
 import sys
 
-from scanner import scan_target
-from policy_engine import apply_policy_engine
+from scanner import HEAD_FIELDS, content_hash, iter_scan_staged, iter_scan_target
+from scan_index import ScanIndex
+from commit_audit import audit_commits
+from git_blobs import list_commits
+from judgement_cache import JudgementCache, rules_fingerprint
+from gate_memo import GateMemo, gate_fingerprint, git_tree_oid, index_merkle
+from gatekeeper.version import __version__
+from policy_aggregate import (
+    AGGREGATE_METADATA_FIELDS,
+    AggregateState,
+    load_baseline_file_count,
+    save_baseline_file_count,
+)
+from policy_engine import RULE_SETS, apply_policy_engine, required_metadata_fields
+from pr_diff import resolve_changes
 from repair_engine import propose_repairs, apply_repairs
 from claude_proposer import propose_repairs_with_claude
 
@@ -14,14 +29,139 @@ MAX_REPAIR_ITERATIONS = 3
 AUDIT_LOG = ".gatekeeper/repair_audit.jsonl"
 
 
-def run_gate_mode(target: str, repair: bool, propose: bool) -> int:
+def _record_hashes(findings, hashes):
+    """Pass findings through, remembering each file's content hash."""
+    for finding in findings:
+        hashes[finding.path] = content_hash(finding)
+        yield finding
+
+
+def _gate_fingerprint(target, rules, index, base_branch, **options) -> str | None:
+    """
+    Fingerprint of the target tree (its git tree OID, else a Merkle hash
+    from the scan index) and of what the result depends on, the release
+    included; None if the tree cannot be fingerprinted without reading it.
+    """
+    tree = git_tree_oid(target)
+    if tree is None and index is not None:
+        tree = index_merkle(target, index)
+    if tree is None:
+        return None
+
+    root = os.path.abspath(target)
+    changes = resolve_changes(target, base_branch)
+    return gate_fingerprint(
+        tree,
+        target=root,
+        rules=rules_fingerprint(rules),
+        release=__version__,
+        changed=sorted(os.path.relpath(p, root) for p in changes.paths()) if changes else [],
+        **options,
+    )
+
+
+def _diff_scan(target, base_branch) -> bool:
+    """Does the scan of target see only the files a PR changes (see pr_diff)?"""
+    if not target:
+        return False
+    changes = resolve_changes(target, base_branch)
+    return changes is not None and bool(changes.files)
+
+
+def run_gate_mode(
+    target: str,
+    repair: bool,
+    propose: bool,
+    use_index: bool = False,
+    rule_set: str = "default",
+    workers: int = 1,
+    fail_fast: bool = False,
+    use_cache: bool = False,
+    aggregate: bool = False,
+    staged: bool = False,
+    base_branch: str | None = None,
+    use_memo: bool = False,
+) -> int:
     iteration = 0
     previous_violations = None
+    index = ScanIndex.load() if use_index else None
+    cache = JudgementCache.load() if use_cache else None
+    # A PR diff or the staged files are only part of the repository: the
+    # aggregate rules mean nothing over them, and their file count must
+    # not become the baseline of the next full scan
+    if aggregate and (staged or _diff_scan(target, base_branch)):
+        aggregate = False
+    baseline_file_count = load_baseline_file_count() if aggregate else None
+    rules = RULE_SETS[rule_set]
+    # Repair needs every violation and comparable counts between iterations
+    fail_fast = fail_fast and not repair
+    # With a process pool, leave metadata to LazyMetadata so full file reads
+    # run in the workers; the scan index only records eagerly computed
+    # metadata. Header sniffs stay in the scan, which sets the signal.
+    # Staged blobs are read whole in the scan either way.
+    fields = required_metadata_fields(rules)
+    if workers > 1 and index is None and not staged:
+        fields = HEAD_FIELDS if fields is None else fields & HEAD_FIELDS
+    # Cached judgements are keyed on the content hash (staged blobs bring
+    # their OID instead)
+    if cache is not None and fields is not None and not staged:
+        fields = fields | {"sha256"}
+    if aggregate and fields is not None:
+        fields = fields | AGGREGATE_METADATA_FIELDS
+
+    # An identical tree gated before gets its stored result back. Repair
+    # changes the tree, and staged content is not the tree.
+    memo = fingerprint = None
+    if use_memo and target and not repair and not staged:
+        memo = GateMemo.load()
+        fingerprint = _gate_fingerprint(
+            target,
+            rules,
+            index,
+            base_branch,
+            fail_fast=fail_fast,
+            aggregate=aggregate,
+            baseline_file_count=baseline_file_count,
+        )
+        stored = memo.lookup(fingerprint) if fingerprint else None
+        if stored is not None:
+            stored["memoized"] = True
+            print(json.dumps(stored, indent=2))
+            return 0 if stored["gate_pass"] else 1
 
     while True:
-        findings = scan_target(target)
-        result = apply_policy_engine(findings)
+        # Findings stream straight from the walk into the policy engine
+        hashes = {}
+        if staged:
+            findings = iter_scan_staged(target or ".", fields=fields)
+        else:
+            findings = iter_scan_target(
+                target, index=index, fields=fields, base_branch=base_branch
+            )
+            # Files the PR only renamed keep their cached judgements
+            changes = resolve_changes(target, base_branch) if cache is not None and target else None
+            if changes is not None:
+                cache.carry_over(changes.renames())
+        if repair:
+            findings = _record_hashes(findings, hashes)
+        state = AggregateState(baseline_file_count) if aggregate else None
+
+        result = apply_policy_engine(
+            findings,
+            rules=rules,
+            workers=workers,
+            fail_fast=fail_fast,
+            cache=cache,
+            aggregate=state,
+        )
+        if index is not None:
+            index.save()
+        if cache is not None:
+            cache.save()
+
         summary = result["policy_summary"]
+        if state is not None and not summary.truncated:
+            save_baseline_file_count(state)
 
         gate_output = {
             "gate_pass": summary.violations == 0,
@@ -29,8 +169,15 @@ def run_gate_mode(target: str, repair: bool, propose: bool) -> int:
             "warnings": summary.warnings,
             "checked_rules": summary.checked_rules,
             "profile": summary.profile,
+            "truncated": summary.truncated,
+            "skipped": summary.skipped,
             "iteration": iteration,
         }
+        if memo is not None:
+            gate_output["memoized"] = False
+            if fingerprint:
+                memo.store(fingerprint, gate_output)
+                memo.save()
 
         print(json.dumps(gate_output, indent=2))
 
@@ -62,6 +209,7 @@ def run_gate_mode(target: str, repair: bool, propose: bool) -> int:
             allowed_files=allowed_files,
             audit_log_path=AUDIT_LOG,
             iteration=iteration,
+            content_hashes=hashes,
         )
 
         if not changed:
@@ -70,6 +218,26 @@ def run_gate_mode(target: str, repair: bool, propose: bool) -> int:
         iteration += 1
 
 
+def run_audit_mode(
+    target: str | None,
+    rev_range: str | None = None,
+    last: int | None = None,
+    tags: bool = False,
+    rule_set: str = "default",
+) -> int:
+    """Audit a range of commits without checking them out (see commit_audit)."""
+    repo = target or "."
+    try:
+        commits = list_commits(repo, rev_range=rev_range, last=last, tags=tags)
+    except subprocess.CalledProcessError as exc:
+        print(exc.stderr.decode(errors="replace").strip(), file=sys.stderr)
+        return 2
+    result = audit_commits(commits, repo=repo, rules=RULE_SETS[rule_set]).to_dict()
+
+    print(json.dumps(result, indent=2))
+    return 0 if result["audit_pass"] else 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("target", nargs="?", help="Target file or directory")
@@ -80,11 +248,105 @@ def main() -> int:
         action="store_true",
         help="Allow Claude to propose RepairPlans (proposal-only)",
     )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Reuse metadata for unchanged files from .gatekeeper/scan_index.json",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse policy judgements for unchanged files from .gatekeeper/judgement_cache.json",
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Also run the repo-level aggregate rules (duplicates, size, growth)",
+    )
+    parser.add_argument(
+        "--rule-set",
+        choices=sorted(RULE_SETS),
+        default="default",
+        help="Policy rules to run; the scanner only computes what they read",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Evaluate policy rules on this many processes (default: 1)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop scanning at the first blocking violation (pre-commit)",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check the content staged in the git index, not the working tree (pre-commit)",
+    )
+
+    parser.add_argument(
+        "--base",
+        metavar="BRANCH",
+        help="Target branch of the PR; only files changed since its merge-base are "
+        "scanned (default: $GATEKEEPER_BASE_BRANCH, $GITHUB_BASE_REF, main, master)",
+    )
+
+    parser.add_argument(
+        "--memo",
+        action="store_true",
+        help="Return the stored result when this exact tree was gated before "
+        "(.gatekeeper/gate_memo.json)",
+    )
+    audit = parser.add_mutually_exclusive_group()
+    audit.add_argument(
+        "--audit",
+        metavar="RANGE",
+        help="Audit every commit in a git rev-list range (e.g. v1.0..HEAD) "
+        "from the object store, without checking them out",
+    )
+    audit.add_argument(
+        "--audit-last",
+        metavar="N",
+        type=int,
+        help="Audit the last N commits of HEAD",
+    )
+    audit.add_argument(
+        "--audit-tags",
+        action="store_true",
+        help="Audit the commit of every tag",
+    )
 
     args = parser.parse_args()
 
+    if args.staged and args.repair:
+        parser.error("--repair edits the working tree and cannot be combined with --staged")
+
+    if args.audit or args.audit_last is not None or args.audit_tags:
+        return run_audit_mode(
+            args.target,
+            rev_range=args.audit,
+            last=args.audit_last,
+            tags=args.audit_tags,
+            rule_set=args.rule_set,
+        )
+
     if args.gate:
-        return run_gate_mode(args.target, args.repair, args.propose)
+        return run_gate_mode(
+            args.target,
+            args.repair,
+            args.propose,
+            use_index=args.index,
+            rule_set=args.rule_set,
+            workers=args.workers,
+            fail_fast=args.fail_fast,
+            use_cache=args.cache,
+            aggregate=args.aggregate,
+            staged=args.staged,
+            base_branch=args.base,
+            use_memo=args.memo,
+        )
 
     print({"success": True})
     return 0
@@ -1,4 +1,5 @@
 import json
+import sys
 from typing import List
 
 from repair_engine import RepairPlan, ALLOWED_ACTIONS
@@ -84,9 +85,9 @@ def propose_repairs_with_claude(
 
             plans.append(
                 RepairPlan(
-                    rule_id=item["rule_id"],
+                    rule_id=sys.intern(item["rule_id"]),
                     file_path=item["file_path"],
-                    action=action,
+                    action=sys.intern(action),
                     description=item.get("description", ""),
                 )
             )
@@ -0,0 +1,192 @@
+"""
+Commit Audit — policy rules over a range of commits, without checkouts.
+
+Every file of every audited commit is read from the object store, but
+the rules run once per distinct (path, blob) pair, since path rules
+depend on the path, and their judgements are mapped back to every
+commit holding that pair, so the cost follows the number of distinct
+blobs, not commits times files. A blob is read through one
+git_blobs.CatFileBatch; the fields the verdicts need of the most recent
+MAX_MEMO_BLOBS blobs are kept for other paths holding them (renames,
+copies), so memory does not grow with the length of the range.
+
+The audit passes or fails as the gate does: a warning under a
+fail_on_warnings profile counts as a violation.
+
+Ignored paths are left out, as in a scan; generated and vendored files
+(see file_classifier) are judged by policy_engine.SKIPPED_FILE_RULES only.
+"""
+
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import AbstractSet, Callable, Dict, List, Optional, Sequence, Tuple
+
+from file_classifier import FileClassifier
+from file_metadata import FileMetadata
+from git_blobs import CatFileBatch, git_toplevel, tree_blobs
+from ignore_rules import IgnoreMatcher
+from policy_engine import (
+    POLICY_RULES,
+    PolicyJudgement,
+    _count_judgement,
+    new_policy_summary,
+    required_metadata_fields,
+)
+from scanner import blob_finding, blob_metadata
+
+
+MAX_MEMO_BLOBS = 4096
+
+
+@dataclass
+class AuditEntry:
+    """The judgements for one (path, blob) pair and the commits holding it."""
+    path: str
+    blob: str
+    judgements: List[PolicyJudgement]
+    commits: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AuditResult:
+    commits: List[str]
+    entries: List[AuditEntry]
+    blobs_read: int = 0
+    pairs_judged: int = 0
+    skipped: Dict[str, int] = field(default_factory=dict)
+
+    def occurrences(self, status: str) -> int:
+        """Judgements of this status, counted once per commit they apply to."""
+        return sum(
+            len(entry.commits)
+            for entry in self.entries
+            for j in entry.judgements
+            if j.status == status
+        )
+
+    def to_dict(self) -> Dict:
+        summary = new_policy_summary()
+        for entry in self.entries:
+            for j in entry.judgements:
+                for _ in entry.commits:
+                    _count_judgement(summary, j)
+        return {
+            "audit_pass": summary.violations == 0,
+            "commits": len(self.commits),
+            "blobs_read": self.blobs_read,
+            "pairs_judged": self.pairs_judged,
+            "violations": summary.violations,
+            "warnings": summary.warnings,
+            "skipped": self.skipped,
+            "results": [
+                {
+                    "path": entry.path,
+                    "blob": entry.blob,
+                    "rule_id": j.rule_id,
+                    "status": j.status,
+                    "reason": j.reason,
+                    "commits": entry.commits,
+                }
+                for entry in self.entries
+                for j in entry.judgements
+            ],
+        }
+
+
+def audit_commits(
+    commits: Sequence[str],
+    repo: str = ".",
+    rules: Optional[Sequence[Callable]] = None,
+    classify: bool = True,
+) -> AuditResult:
+    """Run the rules (POLICY_RULES by default) over the files of each commit."""
+    rules = POLICY_RULES if rules is None else rules
+    top = git_toplevel(repo)
+    if top is None:
+        return AuditResult(commits=list(commits), entries=[])
+
+    fields = required_metadata_fields(rules)
+    ignore = IgnoreMatcher.discover(top)
+    classifier = FileClassifier(top) if classify else None
+    result = AuditResult(commits=list(commits), entries=[])
+
+    memo = _BlobMemo(fields)
+    # None for pairs that are left out or have nothing to report
+    pairs: Dict[Tuple[str, str], Optional[AuditEntry]] = {}
+
+    with CatFileBatch(top) as blobs:
+        for commit in commits:
+            for rel, oid in tree_blobs(top, commit):
+                key = (rel, oid)
+                if key not in pairs:
+                    entry = _judge(
+                        rel, oid, top, rules, ignore, classifier, blobs, memo
+                    )
+                    if entry is not None:
+                        result.pairs_judged += 1
+                    pairs[key] = entry if entry is not None and entry.judgements else None
+                    if pairs[key] is not None:
+                        result.entries.append(entry)
+                if pairs[key] is not None:
+                    pairs[key].commits.append(commit)
+
+    result.blobs_read = memo.reads
+    if classifier is not None:
+        result.skipped = dict(classifier.skipped)
+    return result
+
+
+class _BlobMemo:
+    """
+    Metadata of the most recently read blobs, least recently used first,
+    cut down to the fields the rules read and the header the finding's
+    signal comes from. None for blobs that could not be read.
+    """
+
+    def __init__(self, fields: Optional[AbstractSet[str]]):
+        self.keep = None if fields is None else frozenset(fields) | {"header"}
+        self.entries: "OrderedDict[str, Optional[FileMetadata]]" = OrderedDict()
+        self.reads = 0
+
+    def get(self, oid: str, blobs: CatFileBatch) -> Optional[FileMetadata]:
+        if oid in self.entries:
+            self.entries.move_to_end(oid)
+            return self.entries[oid]
+
+        data = blobs.read(oid)
+        metadata = None
+        if data is not None:
+            self.reads += 1
+            metadata = blob_metadata(oid, data, self.keep)
+            if self.keep is not None:
+                metadata = FileMetadata({k: v for k, v in metadata.items() if k in self.keep})
+
+        self.entries[oid] = metadata
+        while len(self.entries) > MAX_MEMO_BLOBS:
+            self.entries.popitem(last=False)
+        return metadata
+
+
+def _judge(
+    rel: str,
+    oid: str,
+    top: str,
+    rules: Sequence[Callable],
+    ignore: IgnoreMatcher,
+    classifier: Optional[FileClassifier],
+    blobs: CatFileBatch,
+    memo: _BlobMemo,
+) -> Optional[AuditEntry]:
+    """An entry for a pair seen for the first time; None if it is left out."""
+    path = os.path.join(top, rel)
+    if ignore.is_excluded(path):
+        return None
+
+    metadata = memo.get(oid, blobs)
+    if metadata is None:
+        return None
+
+    finding = blob_finding(path, metadata, classifier, rel)
+    judgements = [j for j in (rule(finding) for rule in rules) if j]
+    return AuditEntry(path=rel, blob=oid, judgements=judgements)
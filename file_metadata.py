@@ -0,0 +1,72 @@
+"""
+File Metadata — compact, read-only metadata attached to scanner Findings.
+
+A per-file dict costs a hash table plus a key slot for every field, which
+dominates memory once a scan holds millions of findings. FileMetadata
+stores the scanner's fields in __slots__ instead and behaves as a
+read-only Mapping, so rules keep using metadata.get("line_count").
+
+Fields that were not computed are simply absent (their slot is unset).
+Keys outside METADATA_FIELDS go to a side dict created on first use.
+Small enumerated string values are interned, so metadata loaded back
+from JSON (the scan index) shares one copy per distinct value.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+
+METADATA_FIELDS = (
+    "line_count", "size", "sha256", "binary", "encoding", "shebang", "header",
+    "line_stats", "secrets",
+)
+
+_FIELDS = frozenset(METADATA_FIELDS)
+_INTERNED = frozenset({"encoding", "shebang"})
+
+
+class FileMetadata(Mapping):
+    __slots__ = METADATA_FIELDS + ("_extra",)
+
+    def __init__(self, data: Optional[Mapping] = None):
+        if data:
+            for key, value in data.items():
+                self._set(key, value)
+
+    def _set(self, key: str, value: Any) -> None:
+        if key in _FIELDS:
+            if key in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+            return
+
+        try:
+            extra = self._extra
+        except AttributeError:
+            extra = self._extra = {}
+        extra[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            if key in _FIELDS:
+                return getattr(self, key)
+            return self._extra[key]
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in METADATA_FIELDS:
+            if hasattr(self, key):
+                yield key
+        yield from getattr(self, "_extra", ())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def computed(self) -> Dict[str, Any]:
+        """The fields present right now, as a plain dict."""
+        return {key: self[key] for key in FileMetadata.__iter__(self)}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.computed()!r})"
@@ -0,0 +1,186 @@
+"""
+Gate Memo — whole gate results memoized by tree fingerprint.
+
+A CI retry, or a second pipeline on the same commit, gates an identical
+tree. The tree is fingerprinted up front and the stored result of an
+earlier run is returned instead of scanning and judging it again.
+
+The fingerprint of the files is, in order of preference:
+- the git tree OID of the target at HEAD, when the work tree under it
+  is clean (nothing modified, no untracked files) and git ignores no
+  file the scan would read (git honours nested .gitignore files,
+  .git/info/exclude and global excludes, IgnoreMatcher does not);
+- a Merkle hash over the content hashes in the scan index, when every
+  file under the target is indexed and unchanged;
+- a Merkle hash over content the caller has already read.
+It is combined with everything else the result depends on (the rules
+fingerprint, config, options) by gate_fingerprint().
+
+Gatekeeper's own state under .gatekeeper/ (this memo, the scan index,
+caches and artifacts) never makes the tree count as modified.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from git_blobs import git_toplevel
+from ignore_rules import IgnoreMatcher
+from scan_index import ScanIndex
+from tree_walker import iter_files
+
+
+MEMO_PATH = Path(".gatekeeper/gate_memo.json")
+MEMO_VERSION = 1
+MAX_ENTRIES = 256
+
+STATE_DIR = ".gatekeeper/"
+
+
+def git_tree_oid(path: str = ".", ignore: Optional[IgnoreMatcher] = None) -> Optional[str]:
+    """
+    "git:<tree OID>" of path at HEAD if the work tree under it is clean,
+    else None. Files git ignores but `ignore` does not (so the scan would
+    read them) also make it unclean.
+    """
+    path = os.path.abspath(path)
+    top = git_toplevel(path if os.path.isdir(path) else os.path.dirname(path))
+    if top is None:
+        return None
+    rel = os.path.relpath(path, top)
+    ignore = ignore or IgnoreMatcher.discover(path)
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", top, *args], capture_output=True, text=True, check=True
+        ).stdout
+
+    try:
+        status = git(
+            "status", "--porcelain", "-z", "--untracked-files=all", "--ignored=matching",
+            "--", rel,
+        )
+        for entry in status.split("\0"):
+            # "XY <path>"; rename sources follow as entries of their own
+            name = entry[3:] if len(entry) > 3 and entry[2] == " " else entry
+            if not name or name.startswith(STATE_DIR):
+                continue
+            # Ignored directories are listed once, with a trailing /
+            if entry.startswith("!! ") and ignore.is_excluded(
+                os.path.join(top, name.rstrip("/")), name.endswith("/")
+            ):
+                continue
+            return None
+        oid = git("rev-parse", "HEAD^{tree}" if rel == "." else f"HEAD:{rel}").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"git:{oid}"
+
+
+def merkle(digests: Iterable[Tuple[str, str]]) -> str:
+    """Hash over (relative path, content hash) pairs, in any order."""
+    h = hashlib.sha256()
+    for path, digest in sorted(digests):
+        h.update(f"{path}\0{digest}\n".encode("utf-8", "surrogateescape"))
+    return f"merkle:{h.hexdigest()}"
+
+
+def index_merkle(
+    path: str,
+    index: ScanIndex,
+    ignore: Optional[IgnoreMatcher] = None,
+) -> Optional[str]:
+    """
+    Merkle hash of the files under path from the content hashes the scan
+    index recorded, or None as soon as one file is not indexed or has
+    changed since (no file is read).
+    """
+    root = os.path.abspath(path)
+    ignore = ignore or IgnoreMatcher.discover(root)
+    digests = []
+    for entry in iter_files(root, ignore):
+        rel = os.path.relpath(entry.path, root).replace(os.sep, "/")
+        if rel.startswith(STATE_DIR):
+            continue
+        try:
+            digest = index.recorded_hash(entry.path, entry.stat())
+        except OSError:
+            return None
+        if digest is None:
+            return None
+        digests.append((rel, digest))
+    return merkle(digests)
+
+
+def gate_fingerprint(tree: str, **settings) -> str:
+    """Fingerprint of a tree together with every setting the result depends on."""
+    state = {"version": MEMO_VERSION, "tree": tree, "settings": settings}
+    return hashlib.sha256(
+        json.dumps(state, sort_keys=True, default=repr).encode("utf-8")
+    ).hexdigest()
+
+
+class GateMemo:
+    def __init__(self, path: str | Path = MEMO_PATH):
+        self.path = Path(path)
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------
+    @classmethod
+    def load(cls, path: str | Path = MEMO_PATH) -> "GateMemo":
+        """Load the memo, starting empty if it is missing or unreadable."""
+        memo = cls(path)
+        if not memo.path.exists():
+            return memo
+
+        try:
+            data = json.loads(memo.path.read_text())
+        except Exception:
+            return memo
+
+        if data.get("version") == MEMO_VERSION:
+            memo.entries = OrderedDict(data.get("entries", {}))
+
+        return memo
+
+    def save(self) -> None:
+        """Atomically persist the memo."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w") as f:
+            json.dump(
+                {"version": MEMO_VERSION, "entries": self.entries},
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.path)
+
+    # --------------------------------------------------------
+    # Lookup / update
+    # --------------------------------------------------------
+    def lookup(self, fingerprint: str) -> Optional[Dict]:
+        """The stored result for this fingerprint, if any."""
+        result = self.entries.get(fingerprint)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(fingerprint)
+        return dict(result)
+
+    def store(self, fingerprint: str, result: Dict) -> None:
+        """Remember a result, evicting the least recently used beyond MAX_ENTRIES."""
+        self.entries[fingerprint] = dict(result)
+        self.entries.move_to_end(fingerprint)
+        while len(self.entries) > MAX_ENTRIES:
+            self.entries.popitem(last=False)
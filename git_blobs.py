@@ -0,0 +1,137 @@
+"""
+Git Blobs — staged content read through one `git cat-file --batch`.
+
+Pre-commit gating checks what is about to be committed, which is the
+index, not the working tree. staged_blobs() lists the staged files with
+their blob OIDs in a single `git diff --cached`, and CatFileBatch keeps
+one long-lived `git cat-file --batch` process to read the blobs, instead
+of spawning git once per file.
+
+A blob OID is already a hash of the content, so it doubles as the
+content key for caches (see scanner.content_hash), and audits over many
+commits (see commit_audit) read every distinct blob once.
+"""
+
+import os
+import subprocess
+import threading
+from typing import List, Optional, Tuple
+
+
+# Regular and executable files; symlinks and submodules are not content
+BLOB_MODES = ("100644", "100755")
+
+
+def _git(repo: str, *args: str) -> bytes:
+    return subprocess.run(
+        ["git", "-C", repo, *args],
+        capture_output=True,
+        check=True,
+    ).stdout
+
+
+def git_toplevel(path: str = ".") -> Optional[str]:
+    """The work tree root containing path, or None outside a repository."""
+    try:
+        out = _git(path, "rev-parse", "--show-toplevel")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return os.fsdecode(out.rstrip(b"\n"))
+
+
+def staged_blobs(repo: str = ".") -> List[Tuple[str, str]]:
+    """
+    Sorted (path relative to the top level, blob OID) pairs for the files
+    added, copied or modified in the index; a rename counts as an add.
+    Empty when repo is not inside a git repository.
+    """
+    try:
+        out = _git(
+            repo, "diff", "--cached", "--raw", "-z", "--no-abbrev",
+            "--no-renames", "--diff-filter=ACM",
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    # ":<old mode> <new mode> <old oid> <new oid> <status>\0<path>\0"
+    fields = out.split(b"\0")
+    blobs = []
+    for info, path in zip(fields[0::2], fields[1::2]):
+        _, mode, _, oid, _ = info.decode("ascii").split(" ")
+        if mode in BLOB_MODES:
+            blobs.append((os.fsdecode(path), oid))
+    return sorted(blobs)
+
+
+def list_commits(
+    repo: str = ".",
+    rev_range: Optional[str] = None,
+    last: Optional[int] = None,
+    tags: bool = False,
+) -> List[str]:
+    """
+    Commit OIDs to audit, newest first: those in a rev-list range (a
+    single revision means everything reachable from it), the last N
+    commits of HEAD, or the commit of every tag.
+    """
+    if tags:
+        args = ["rev-list", "--no-walk", "--tags"]
+    elif last is not None:
+        args = ["rev-list", f"--max-count={last}", "HEAD"]
+    else:
+        args = ["rev-list", rev_range or "HEAD"]
+    return _git(repo, *args).decode("ascii").split()
+
+
+def tree_blobs(repo: str, commit: str) -> List[Tuple[str, str]]:
+    """(path relative to the top level, blob OID) for every file in a commit."""
+    # "<mode> <type> <oid>\t<path>\0"
+    blobs = []
+    for entry in _git(repo, "ls-tree", "-r", "-z", "--full-tree", commit).split(b"\0"):
+        if not entry:
+            continue
+        info, path = entry.split(b"\t", 1)
+        mode, _, oid = info.decode("ascii").split(" ")
+        if mode in BLOB_MODES:
+            blobs.append((os.fsdecode(path), oid))
+    return blobs
+
+
+class CatFileBatch:
+    """
+    A persistent `git cat-file --batch` process. read() is thread-safe;
+    requests are answered one at a time over the same pipes.
+    """
+
+    def __init__(self, repo: str = "."):
+        self._proc = subprocess.Popen(
+            ["git", "-C", repo, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+
+    def read(self, oid: str) -> Optional[bytes]:
+        """The blob's content, or None if the object is missing or not a blob."""
+        with self._lock:
+            self._proc.stdin.write(oid.encode("ascii") + b"\n")
+            self._proc.stdin.flush()
+
+            # "<oid> <type> <size>\n<content>\n", or "<oid> missing\n"
+            header = self._proc.stdout.readline().split()
+            if len(header) != 3:
+                return None
+            data = self._proc.stdout.read(int(header[2]) + 1)[:-1]
+            return data if header[1] == b"blob" else None
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
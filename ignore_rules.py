@@ -0,0 +1,200 @@
+"""
+Ignore Rules — compiled .gitignore / .gatekeeperignore matching.
+
+One IgnoreMatcher is shared by the scanner, the batch processor and the
+CI file collector. Walkers consult it for every directory *before*
+descending, so ignored trees (.git, node_modules, caches, artifacts) are
+never enumerated. Gatekeeper's own state directory (.gatekeeper/, with
+its caches, index and memo) is always ignored, like .git.
+
+Supported syntax is the gitignore subset used in practice: comments,
+negation (!), directory-only patterns (trailing /), anchored patterns
+(leading or inner /), *, ?, [...] and **. Only the ignore files at the
+matcher base are read; nested .gitignore files are not.
+"""
+
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+
+IGNORE_FILES = (".gitignore", ".gatekeeperignore")
+
+# Always pruned, regardless of ignore files
+DEFAULT_PATTERNS = (".git/", ".gatekeeper/")
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob body ('/'-separated, no leading /) to a regex."""
+    out = []
+    i = 0
+    n = len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and (i == 0 or pattern[i - 1] == "/"):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = pattern.find("]", i + 2)
+            if j == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:j]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+
+    return "".join(out)
+
+
+def compile_glob(pattern: str) -> "re.Pattern[str]":
+    """
+    Compile a pathlib-style glob (always anchored at the base directory)
+    into a regex matched against '/'-separated relative paths.
+    """
+    pattern = pattern.replace(os.sep, "/")
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+    return re.compile(f"^{_translate(pattern)}$")
+
+
+def _compile_ignore(line: str) -> Optional[Tuple["re.Pattern[str]", bool, bool]]:
+    """Compile one ignore-file line to (regex, negated, dir_only)."""
+    line = line.rstrip("\n").rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    prefix = "" if anchored else "(?:.*/)?"
+
+    return re.compile(f"^{prefix}{_translate(line)}$"), negated, dir_only
+
+
+class IgnoreMatcher:
+    """
+    Matches paths relative to `base`. Later patterns override earlier
+    ones, as in gitignore.
+    """
+
+    def __init__(self, patterns: Iterable[str] = (), base: str = "."):
+        self.base = os.path.abspath(base)
+        self._rules = [
+            rule for rule in map(_compile_ignore, (*DEFAULT_PATTERNS, *patterns))
+            if rule is not None
+        ]
+        self._has_negation = any(neg for _, neg, _ in self._rules)
+
+        # Fast path: without negations a single union regex per kind decides
+        self._any_path = self._union(r for r, _, d in self._rules if not d)
+        self._dir_only = self._union(r for r, _, d in self._rules if d)
+
+    @staticmethod
+    def _union(regexes) -> Optional["re.Pattern[str]"]:
+        parts = [r.pattern for r in regexes]
+        if not parts:
+            return None
+        return re.compile("|".join(f"(?:{p})" for p in parts))
+
+    @classmethod
+    def from_files(cls, base: str) -> "IgnoreMatcher":
+        """Build a matcher from the ignore files found directly in base."""
+        patterns: List[str] = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(base, name), encoding="utf-8") as f:
+                    patterns.extend(f.read().splitlines())
+            except OSError:
+                continue
+        return cls(patterns, base=base)
+
+    @classmethod
+    def discover(cls, path: str) -> "IgnoreMatcher":
+        """
+        Use the enclosing git work tree as the base if there is one,
+        otherwise the scanned path itself.
+        """
+        start = os.path.abspath(path)
+        if not os.path.isdir(start):
+            start = os.path.dirname(start)
+
+        current = start
+        while True:
+            if os.path.exists(os.path.join(current, ".git")):
+                return cls.from_files(current)
+            parent = os.path.dirname(current)
+            if parent == current:
+                return cls.from_files(start)
+            current = parent
+
+    # --------------------------------------------------------
+    # Matching
+    # --------------------------------------------------------
+    def relative(self, path: str) -> Optional[str]:
+        """'/'-separated path relative to base, or None if outside it."""
+        path = os.path.abspath(path)
+        if path == self.base:
+            return ""
+        prefix = self.base.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        return path[len(prefix):].replace(os.sep, "/")
+
+    def match(self, rel: str, is_dir: bool) -> bool:
+        """Is this single entry ignored? Parents are not consulted."""
+        if not rel:
+            return False
+
+        if not self._has_negation:
+            if self._any_path is not None and self._any_path.match(rel):
+                return True
+            return bool(is_dir and self._dir_only is not None and self._dir_only.match(rel))
+
+        for regex, negated, dir_only in reversed(self._rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel):
+                return not negated
+        return False
+
+    def is_excluded(self, path: str, is_dir: bool = False) -> bool:
+        """Is path ignored, either directly or through an ignored parent?"""
+        rel = self.relative(path)
+        if rel is None or not rel:
+            return False
+
+        parts = rel.split("/")
+        for i in range(1, len(parts)):
+            if self.match("/".join(parts[:i]), True):
+                return True
+        return self.match(rel, is_dir)
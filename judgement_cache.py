@@ -0,0 +1,267 @@
+"""
+Judgement Cache — persistent policy judgements across gate runs.
+
+Policy rules are pure functions of a finding's path and content, so their
+judgements can be reused for as long as neither changes. Entries are keyed
+by path and validated against the content hash the scanner computed.
+
+The whole cache is tied to a fingerprint of the rule set and the settings
+rules read (FORBIDDEN_PATHS, MAX_LINE_COUNT, MAX_LINE_LENGTH, the header
+requirement and profiles.OWNERSHIP_RULES), and of the detectors behind
+the metadata they judge (secret_scan's signatures and thresholds, and the
+statistics line_stats computes); when any of them changes, every entry
+is dropped.
+
+Files a PR only renamed (see pr_diff) carry their entry over from the old
+path, as long as the rules that look at the path alone judge both paths
+the same and the suffix is unchanged.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import line_stats
+import policy_engine
+import profiles
+import secret_scan
+from policy_engine import Finding, PolicyJudgement
+from scanner import content_hash
+
+
+CACHE_PATH = Path(".gatekeeper/judgement_cache.json")
+CACHE_VERSION = 1
+
+
+def _rule_identity(rule: Callable) -> List:
+    """Name and compiled body of a rule, so editing it changes the fingerprint."""
+    code = getattr(rule, "__code__", None)
+    body = None
+    if code is not None:
+        consts = [c for c in code.co_consts if isinstance(c, (str, int, float, type(None)))]
+        body = hashlib.sha256(
+            code.co_code + repr((consts, code.co_names)).encode("utf-8")
+        ).hexdigest()
+    return [
+        getattr(rule, "__module__", None),
+        getattr(rule, "__qualname__", repr(rule)),
+        body,
+    ]
+
+
+def rules_fingerprint(rules: Sequence[Callable]) -> str:
+    """Fingerprint of the rules and the module settings they depend on."""
+    state = {
+        "rules": [_rule_identity(rule) for rule in rules],
+        "forbidden_paths": list(policy_engine.FORBIDDEN_PATHS),
+        "max_line_count": policy_engine.MAX_LINE_COUNT,
+        "max_line_length": policy_engine.MAX_LINE_LENGTH,
+        "required_header_markers": list(policy_engine.REQUIRED_HEADER_MARKERS),
+        "header_required_suffixes": list(policy_engine.HEADER_REQUIRED_SUFFIXES),
+        "ownership_rules": [list(rule) for rule in profiles.OWNERSHIP_RULES],
+        "secret_signatures": [
+            [s.name, list(s.anchors), s.pattern.pattern, s.pattern.flags, s.entropy_group]
+            for s in secret_scan.SIGNATURES
+        ],
+        "secret_min_entropy": secret_scan.MIN_ENTROPY,
+        "secret_min_generic_length": secret_scan.MIN_GENERIC_LENGTH,
+        "secret_max_reported": secret_scan.MAX_REPORTED,
+        "line_stats_keys": list(line_stats.LINE_STATS_KEYS),
+    }
+    return hashlib.sha256(
+        json.dumps(state, sort_keys=True, default=repr).encode("utf-8")
+    ).hexdigest()
+
+
+class JudgementCache:
+    def __init__(self, path: str | Path = CACHE_PATH):
+        self.path = Path(path)
+        self.fingerprint: Optional[str] = None
+        self.entries: Dict[str, Dict] = {}
+        self.renames: Dict[str, str] = {}
+        self._path_rules: Optional[List[Callable]] = None
+        self.hits = 0
+        self.misses = 0
+
+    # --------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------
+    @classmethod
+    def load(cls, path: str | Path = CACHE_PATH) -> "JudgementCache":
+        """Load the cache, starting empty if it is missing or unreadable."""
+        cache = cls(path)
+        if not cache.path.exists():
+            return cache
+
+        try:
+            data = json.loads(cache.path.read_text())
+        except Exception:
+            return cache
+
+        if data.get("version") == CACHE_VERSION:
+            cache.fingerprint = data.get("fingerprint")
+            cache.entries = data.get("entries", {})
+
+        return cache
+
+    def save(self) -> None:
+        """Atomically persist the cache."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w") as f:
+            json.dump(
+                {
+                    "version": CACHE_VERSION,
+                    "fingerprint": self.fingerprint,
+                    "entries": self.entries,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.path)
+
+    # --------------------------------------------------------
+    # Lookup / update
+    # --------------------------------------------------------
+    def bind(self, rules: Sequence[Callable]) -> None:
+        """Use the cache for these rules, dropping entries made for others."""
+        fingerprint = rules_fingerprint(rules)
+        if fingerprint != self.fingerprint:
+            self.fingerprint = fingerprint
+            self.entries = {}
+
+        # Rules reading no metadata judge the path alone; with an undeclared
+        # rule there is no telling, and renames are never carried over
+        declared = [getattr(rule, "metadata_fields", None) for rule in rules]
+        self._path_rules = None if None in declared else [
+            rule for rule, fields in zip(rules, declared) if not fields
+        ]
+
+    def carry_over(self, renames: Dict[str, str]) -> None:
+        """Let pure renames (new path -> old path) reuse the old path's entry."""
+        self.renames = dict(renames)
+
+    def _path_verdicts(self, path: str, signal: str) -> List:
+        finding = Finding(id=path, type="file", path=path, signal=signal, metadata={})
+        return [
+            (j.rule_id, j.status, j.reason, j.suggested_fix)
+            for j in (rule(finding) for rule in self._path_rules)
+            if j
+        ]
+
+    def _renamed_entry(self, finding: Finding, sha256: str) -> Optional[Dict]:
+        old_path = self.renames.get(finding.path)
+        entry = self.entries.get(old_path) if old_path else None
+        if (
+            entry is None
+            or entry["sha256"] != sha256
+            or self._path_rules is None
+            or os.path.splitext(old_path)[1] != os.path.splitext(finding.path)[1]
+            or self._path_verdicts(old_path, finding.signal)
+            != self._path_verdicts(finding.path, finding.signal)
+        ):
+            return None
+
+        self.entries[finding.path] = entry
+        return entry
+
+    def lookup(self, finding: Finding, sha256: str) -> Optional[List[PolicyJudgement]]:
+        """
+        Cached judgements for the finding if its content is unchanged, here
+        or, for a carried-over rename, at its old path.
+        """
+        entry = self.entries.get(finding.path)
+        if entry is None or entry["sha256"] != sha256:
+            entry = self._renamed_entry(finding, sha256)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [
+            PolicyJudgement(
+                finding_id=finding.id,
+                rule_id=sys.intern(rule_id),
+                status=sys.intern(status),
+                confidence=confidence,
+                reason=reason,
+                suggested_fix=suggested_fix,
+            )
+            for rule_id, status, confidence, reason, suggested_fix in entry["judgements"]
+        ]
+
+    def record(
+        self,
+        finding: Finding,
+        sha256: str,
+        judgements: Iterable[PolicyJudgement],
+    ) -> None:
+        self.entries[finding.path] = {
+            "sha256": sha256,
+            "judgements": [
+                [j.rule_id, j.status, j.confidence, j.reason, j.suggested_fix]
+                for j in judgements
+            ],
+        }
+
+
+def iter_cached(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+    cache: JudgementCache,
+    evaluate_rows: Callable[[List[Finding]], Iterator[Sequence[PolicyJudgement]]],
+    chunk_size: int = 1,
+) -> Iterator[PolicyJudgement]:
+    """
+    Yield judgements in input order, taking unchanged findings from the
+    cache and passing only the others to evaluate_rows, which must yield
+    one sequence of judgements per finding it is given. Findings without
+    a content hash are always evaluated and never recorded.
+
+    A run of consecutive misses is evaluated as soon as a hit follows it,
+    it holds chunk_size findings, or the input ends; hits are yielded as
+    they are read. Judgements therefore stream as the findings do (a
+    fail-fast run over a warm cache stops at the first blocking one), and
+    at most chunk_size findings are held at a time.
+    """
+    cache.bind(rules)
+    misses: List[Tuple[Finding, Optional[str]]] = []
+
+    for finding in findings:
+        sha256 = content_hash(finding)
+        cached = cache.lookup(finding, sha256) if sha256 else None
+        if cached is None:
+            misses.append((finding, sha256))
+            if len(misses) >= chunk_size:
+                yield from _evaluate_misses(misses, cache, evaluate_rows)
+            continue
+
+        if misses:
+            yield from _evaluate_misses(misses, cache, evaluate_rows)
+        yield from cached
+
+    if misses:
+        yield from _evaluate_misses(misses, cache, evaluate_rows)
+
+
+def _evaluate_misses(
+    misses: List[Tuple[Finding, Optional[str]]],
+    cache: JudgementCache,
+    evaluate_rows: Callable[[List[Finding]], Iterator[Sequence[PolicyJudgement]]],
+) -> Iterator[PolicyJudgement]:
+    """Evaluate and record a run of misses, emptying it."""
+    run = list(misses)
+    misses.clear()
+    rows = evaluate_rows([finding for finding, _ in run])
+    try:
+        for (finding, sha256), row in zip(run, rows):
+            if sha256:
+                cache.record(finding, sha256, row)
+            yield from row
+    finally:
+        if hasattr(rows, "close"):
+            rows.close()
@@ -0,0 +1,89 @@
+"""
+Line Stats — per-line content statistics over raw file bytes.
+
+The content rules (long lines, trailing whitespace, tab indentation, CRLF
+endings) all need to look at every line. Rather than iterating lines in
+Python, the newline offsets of the whole buffer are found once and every
+statistic is derived from them with array operations. The buffer can be
+an mmap, which NumPy reads without copying.
+
+Lines are split on b"\\n"; a "\\r" before it belongs to the line ending.
+Lengths are in bytes, excluding the line ending. NumPy is used when it is
+installed; otherwise the same statistics are computed with bytes methods.
+"""
+
+from typing import Dict
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+LINE_STATS_KEYS = ("max_line_length", "trailing_whitespace", "tab_indented", "crlf")
+
+_LF, _CR, _TAB, _SPACE = 10, 13, 9, 32
+
+
+def _empty() -> Dict[str, int]:
+    return dict.fromkeys(LINE_STATS_KEYS, 0)
+
+
+def _line_stats_numpy(buffer) -> Dict[str, int]:
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    size = len(data)
+
+    # Line i is terminated by newlines[i], if there is one
+    newlines = np.flatnonzero(data == _LF)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [size]))
+    if starts[-1] == size:
+        # Content ending in a newline has no further line
+        starts, ends = starts[:-1], ends[:-1]
+
+    crlf = np.zeros(len(ends), dtype=bool)
+    terminated = len(newlines)
+    crlf[:terminated] = (newlines > starts[:terminated]) & (data[newlines - 1] == _CR)
+    ends = ends - crlf
+
+    lengths = ends - starts
+    nonempty = lengths > 0
+    last = data[ends[nonempty] - 1]
+    first = data[starts[nonempty]]
+
+    return {
+        "max_line_length": int(lengths.max(initial=0)),
+        "trailing_whitespace": int(np.count_nonzero((last == _SPACE) | (last == _TAB))),
+        "tab_indented": int(np.count_nonzero(first == _TAB)),
+        "crlf": int(np.count_nonzero(crlf)),
+    }
+
+
+def _line_stats_python(buffer) -> Dict[str, int]:
+    lines = bytes(buffer).split(b"\n")
+    terminated = len(lines) - 1
+    if lines[-1] == b"":
+        lines.pop()
+
+    stats = _empty()
+    for i, line in enumerate(lines):
+        if i < terminated and line.endswith(b"\r"):
+            stats["crlf"] += 1
+            line = line[:-1]
+        if not line:
+            continue
+        stats["max_line_length"] = max(stats["max_line_length"], len(line))
+        if line[-1] in (_SPACE, _TAB):
+            stats["trailing_whitespace"] += 1
+        if line[0] == _TAB:
+            stats["tab_indented"] += 1
+    return stats
+
+
+def line_stats(buffer) -> Dict[str, int]:
+    """Statistics for LINE_STATS_KEYS over a bytes-like buffer."""
+    if not len(buffer):
+        return _empty()
+    if np is not None:
+        return _line_stats_numpy(buffer)
+    return _line_stats_python(buffer)
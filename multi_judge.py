@@ -4,6 +4,7 @@ Hard contract: ALWAYS returns a complete result schema.
 """
 
 from engines.v1 import EngineV1
+from file_classifier import SNIFF_BYTES, FileClassifier
 
 
 class MultiAgentCodeJudge:
@@ -52,12 +53,24 @@ class MultiAgentCodeJudge:
             "pass": passed,
         }
 
-    def judge_repo(self, files: dict[str, str]) -> dict:
+    def judge_repo(
+        self,
+        files: dict[str, str],
+        classifier: FileClassifier | None = None,
+    ) -> dict:
+        """
+        Judge every file, except generated and vendored ones (see
+        file_classifier), which are counted in "skipped_files" instead.
+        """
+        classifier = classifier or FileClassifier()
         results = []
         non_compliant_files = []
         cost_limit_hit = False
 
         for path, code in files.items():
+            if classifier.classify(path, code[:SNIFF_BYTES]):
+                continue
+
             cost = self.engine.get_cost_summary()["estimated_cost_usd"]
 
             if cost >= (self.cost_limit_usd * 0.9):
@@ -86,4 +99,5 @@ class MultiAgentCodeJudge:
             "cost_limit_hit": cost_limit_hit,
             "files_processed": len(results),
             "files_total": len(files),
+            "skipped_files": dict(classifier.skipped),
         }
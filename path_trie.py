@@ -0,0 +1,169 @@
+"""
+Path Trie — compiled path-component matching with per-directory memoization.
+
+Replaces the `f"/{pattern}/" in f"/{path}/"` idiom used for ownership
+rules and forbidden paths. Patterns are split into components and stored
+in a trie. A lookup returns the value of the earliest-listed pattern that
+appears as a contiguous run of the path's components, which is exactly
+what the substring test checks.
+
+The component walk over a file's parent directory is memoized, so files
+in an already-seen directory cost one dict lookup for the directory plus
+one trie step per live partial match for the basename.
+"""
+
+import os
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Node:
+    __slots__ = ("children", "order")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.order: Optional[int] = None
+
+
+class PathTrie(Generic[T]):
+    def __init__(self, patterns: Iterable[Tuple[str, T]], normalize: bool = False):
+        """
+        patterns: (pattern, value) pairs; earlier pairs win.
+        normalize: apply os.path.normpath to looked-up paths first.
+        """
+        self._root = _Node()
+        self._values: List[T] = []
+        self._normalize = normalize
+        self._dirs: Dict[Optional[str], Tuple[Optional[int], Tuple[_Node, ...]]] = {}
+
+        for order, (pattern, value) in enumerate(patterns):
+            node = self._root
+            for comp in pattern.split("/"):
+                node = node.children.setdefault(comp, _Node())
+            if node.order is None:
+                node.order = order
+            self._values.append(value)
+
+    # --------------------------------------------------------
+    # Matching
+    # --------------------------------------------------------
+    def _walk(self, comps: Iterable[str]) -> Tuple[Optional[int], Tuple[_Node, ...]]:
+        """Best match fully inside comps, plus partial matches still open."""
+        root = self._root
+        best = None
+        active: Tuple[_Node, ...] = ()
+
+        for comp in comps:
+            advanced = []
+            for node in (*active, root):
+                child = node.children.get(comp)
+                if child is None:
+                    continue
+                if child.order is not None and (best is None or child.order < best):
+                    best = child.order
+                if child.children:
+                    advanced.append(child)
+            active = tuple(advanced)
+
+        return best, active
+
+    def _dir_state(self, dir_key: Optional[str]) -> Tuple[Optional[int], Tuple[_Node, ...]]:
+        """
+        Memoized (best, candidates) for a parent directory, where candidates
+        are the open partial matches plus the root, ready for the basename.
+        """
+        state = self._dirs.get(dir_key)
+        if state is None:
+            best, active = (
+                self._walk(self._dir_comps(dir_key)) if dir_key is not None else (None, ())
+            )
+            state = (best, (*active, self._root))
+            self._dirs[dir_key] = state
+        return state
+
+    def _dir_comps(self, dir_key: str) -> List[str]:
+        if not self._normalize:
+            return dir_key.split("/")
+
+        # dir_key keeps its trailing "/" so normpath sees "//" prefixes intact
+        norm = "/".join(os.path.normpath(dir_key).split(os.sep))
+        if norm == ".":
+            return []
+        comps = norm.split("/")
+        if norm.endswith("/"):
+            comps.pop()
+        return comps
+
+    def _best_order(self, path: str) -> Optional[int]:
+        i = path.rfind("/")
+        base = path[i + 1:]
+
+        if self._normalize:
+            if base in ("", ".", ".."):
+                norm = "/".join(os.path.normpath(path).split(os.sep))
+                return self._walk(norm.split("/"))[0]
+            dir_key = path[:i + 1] if i >= 0 else None
+        else:
+            dir_key = path[:i] if i >= 0 else None
+
+        best, candidates = self._dir_state(dir_key)
+
+        for node in candidates:
+            child = node.children.get(base)
+            if child is not None and child.order is not None:
+                if best is None or child.order < best:
+                    best = child.order
+
+        return best
+
+    def lookup(self, path: str, default: Optional[T] = None) -> Optional[T]:
+        best = self._best_order(path)
+        return default if best is None else self._values[best]
+
+    def matches(self, path: str) -> bool:
+        return self._best_order(path) is not None
+
+    def match_mask(self, paths: Iterable[str]) -> List[bool]:
+        """
+        matches() over many paths, with the per-path work inlined. Used by
+        the columnar policy evaluator.
+        """
+        normalize = self._normalize
+        dir_state = self._dir_state
+        out = []
+
+        # Walk order groups files by directory; reuse the previous state
+        # -2 is no rfind() result, so the first path always looks up its state
+        last_dir = ""
+        last_len = -2
+        state = None
+
+        for path in paths:
+            i = path.rfind("/")
+            base = path[i + 1:]
+
+            if normalize and base in ("", ".", ".."):
+                out.append(self._best_order(path) is not None)
+                continue
+
+            if i != last_len or not path.startswith(last_dir):
+                if i < 0:
+                    dir_key = None
+                else:
+                    dir_key = path[:i + 1] if normalize else path[:i]
+                state = dir_state(dir_key)
+                last_dir = path[:i + 1] if i >= 0 else ""
+                last_len = i
+
+            best, candidates = state
+            if best is None:
+                for node in candidates:
+                    child = node.children.get(base)
+                    if child is not None and child.order is not None:
+                        best = child.order
+                        break
+            out.append(best is not None)
+
+        return out
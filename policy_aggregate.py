@@ -0,0 +1,297 @@
+"""
+Repo-level aggregate policy rules.
+
+Per-file rules judge one finding at a time; aggregate rules judge the
+repository as a whole (duplicated content, total size, the share of
+oversized files, growth of the file count). They are evaluated from an
+AggregateState that consumes the finding stream without retaining it:
+
+- HyperLogLog sketches estimate the distinct paths and distinct contents,
+- bottom-k samples keep a bounded set of example paths,
+- everything else is a plain counter.
+
+Every part is mergeable, and the merge does not depend on how findings
+were split or in which order they arrived, so shard states built in
+worker processes (see policy_parallel) combine into exactly the state a
+sequential run builds.
+"""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import policy_engine
+from policy_engine import Finding, PolicyJudgement
+
+
+AGGREGATE_PATH = Path(".gatekeeper/aggregate.json")
+
+# finding_id of aggregate judgements; resolves to the default profile
+REPO_FINDING_ID = "<repo>"
+
+MAX_REPO_BYTES = 1 << 30
+MAX_DUPLICATE_FRACTION = 0.05
+MAX_OVERSIZED_FRACTION = 0.10
+MAX_FILE_COUNT_GROWTH = 0.50
+# Smaller files (empty __init__.py, one-line stubs) are identical by
+# nature and never count as duplicated content
+MIN_DUPLICATE_BYTES = 64
+
+# Fields AggregateState.add reads from Finding.metadata
+AGGREGATE_METADATA_FIELDS = frozenset({"sha256", "size", "line_count"})
+
+HLL_PRECISION = 12      # 4096 registers, ~1.6% standard error
+SAMPLE_SIZE = 8
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash (the builtin hash() is salted per process)."""
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+# ----------------------------
+# Sketches
+# ----------------------------
+
+class HyperLogLog:
+    """Distinct-count estimator over 64-bit hashes; merge takes register maxima."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, h: int) -> None:
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is far more accurate for small cardinalities
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class BottomKSample:
+    """
+    Keeps the k items with the smallest hash keys, with a count per key.
+
+    Unlike a reservoir sample it needs no random state, so the sample of a
+    merged state is the same however the stream was sharded.
+    """
+
+    def __init__(self, k: int = SAMPLE_SIZE):
+        self.k = k
+        self.items: Dict[int, Tuple[str, int]] = {}     # key -> (item, count)
+
+    def _threshold(self) -> Optional[int]:
+        if len(self.items) < self.k:
+            return None
+        return max(self.items)
+
+    def add(self, key: int, item: str, count: int = 1) -> None:
+        current = self.items.get(key)
+        if current is not None:
+            self.items[key] = (min(current[0], item), current[1] + count)
+            return
+
+        threshold = self._threshold()
+        if threshold is not None and key > threshold:
+            return
+        self.items[key] = (item, count)
+        if len(self.items) > self.k:
+            del self.items[max(self.items)]
+
+    def merge(self, other: "BottomKSample") -> None:
+        for key, (item, count) in other.items.items():
+            self.add(key, item, count)
+
+    def sample(self) -> List[Tuple[str, int]]:
+        return [self.items[key] for key in sorted(self.items)]
+
+
+# ----------------------------
+# Aggregate state
+# ----------------------------
+
+class AggregateState:
+    """
+    Everything the aggregate rules read, built incrementally from findings.
+
+    baseline_file_count is the distinct file count of an earlier run, for
+    the growth rule (None disables it).
+    """
+
+    def __init__(self, baseline_file_count: Optional[int] = None):
+        self.baseline_file_count = baseline_file_count
+        self.files = 0
+        self.hashed_files = 0
+        self.total_size = 0
+        self.oversized = 0
+        self.paths = HyperLogLog()
+        self.contents = HyperLogLog()
+        self.content_sample = BottomKSample()
+        self.oversized_sample = BottomKSample()
+
+    def add(self, finding: Finding) -> None:
+        if finding.type in policy_engine.SKIPPED_FINDING_TYPES:
+            return
+        metadata = finding.metadata
+        path_hash = _hash64(finding.path)
+        self.files += 1
+        self.paths.add(path_hash)
+
+        size = metadata.get("size")
+        if isinstance(size, int):
+            self.total_size += size
+
+        sha256 = metadata.get("sha256")
+        if sha256 and isinstance(size, int) and size >= MIN_DUPLICATE_BYTES:
+            content = int(sha256[:16], 16)
+            self.hashed_files += 1
+            self.contents.add(content)
+            self.content_sample.add(content, finding.path)
+
+        line_count = metadata.get("line_count")
+        if isinstance(line_count, int) and line_count > policy_engine.MAX_LINE_COUNT:
+            self.oversized += 1
+            self.oversized_sample.add(path_hash, finding.path)
+
+    def observe(self, findings: Iterable[Finding]) -> Iterator[Finding]:
+        """Pass findings through, adding each one to the state."""
+        for finding in findings:
+            self.add(finding)
+            yield finding
+
+    def merge(self, other: "AggregateState") -> None:
+        self.files += other.files
+        self.hashed_files += other.hashed_files
+        self.total_size += other.total_size
+        self.oversized += other.oversized
+        self.paths.merge(other.paths)
+        self.contents.merge(other.contents)
+        self.content_sample.merge(other.content_sample)
+        self.oversized_sample.merge(other.oversized_sample)
+
+    def file_count(self) -> int:
+        return min(self.paths.estimate(), self.files)
+
+    def duplicate_fraction(self) -> float:
+        if not self.hashed_files:
+            return 0.0
+        distinct = min(self.contents.estimate(), self.hashed_files)
+        return 1 - distinct / self.hashed_files
+
+    def judgements(self) -> Iterator[PolicyJudgement]:
+        for rule in AGGREGATE_RULES:
+            judgement = rule(self)
+            if judgement:
+                yield judgement
+
+
+# ----------------------------
+# Aggregate rules
+# ----------------------------
+
+def _examples(sample: BottomKSample) -> str:
+    return ", ".join(item for item, _ in sample.sample())
+
+
+def rule_duplicate_files(state: AggregateState) -> Optional[PolicyJudgement]:
+    fraction = state.duplicate_fraction()
+    if fraction > MAX_DUPLICATE_FRACTION:
+        duplicated = [item for item, count in state.content_sample.sample() if count > 1]
+        reason = f"About {fraction:.0%} of files duplicate the content of another file."
+        if duplicated:
+            reason += f" Examples: {', '.join(duplicated)}."
+        return PolicyJudgement(
+            finding_id=REPO_FINDING_ID,
+            rule_id="REPO_DUPLICATE_FILES",
+            status="warn",
+            confidence=0.7,
+            reason=reason,
+        )
+    return None
+
+
+def rule_repo_too_large(state: AggregateState) -> Optional[PolicyJudgement]:
+    if state.total_size > MAX_REPO_BYTES:
+        return PolicyJudgement(
+            finding_id=REPO_FINDING_ID,
+            rule_id="REPO_TOO_LARGE",
+            status="warn",
+            confidence=0.9,
+            reason=f"Scanned files total {state.total_size} bytes, above {MAX_REPO_BYTES}.",
+        )
+    return None
+
+
+def rule_oversized_fraction(state: AggregateState) -> Optional[PolicyJudgement]:
+    if state.files and state.oversized / state.files > MAX_OVERSIZED_FRACTION:
+        return PolicyJudgement(
+            finding_id=REPO_FINDING_ID,
+            rule_id="REPO_OVERSIZED_FRACTION",
+            status="warn",
+            confidence=0.8,
+            reason=(
+                f"{state.oversized} of {state.files} files exceed the recommended "
+                f"maximum line count. Examples: {_examples(state.oversized_sample)}."
+            ),
+        )
+    return None
+
+
+def rule_file_count_growth(state: AggregateState) -> Optional[PolicyJudgement]:
+    baseline = state.baseline_file_count
+    count = state.file_count()
+    if baseline and count > baseline * (1 + MAX_FILE_COUNT_GROWTH):
+        return PolicyJudgement(
+            finding_id=REPO_FINDING_ID,
+            rule_id="REPO_FILE_COUNT_GROWTH",
+            status="warn",
+            confidence=0.7,
+            reason=f"The repository grew from about {baseline} to about {count} files.",
+        )
+    return None
+
+
+AGGREGATE_RULES: List[Callable[[AggregateState], Optional[PolicyJudgement]]] = [
+    rule_duplicate_files,
+    rule_repo_too_large,
+    rule_oversized_fraction,
+    rule_file_count_growth,
+]
+
+
+# ----------------------------
+# Baseline persistence
+# ----------------------------
+
+def load_baseline_file_count(path: str | Path = AGGREGATE_PATH) -> Optional[int]:
+    """File count recorded by the last complete run, if any."""
+    try:
+        return json.loads(Path(path).read_text()).get("file_count")
+    except Exception:
+        return None
+
+
+def save_baseline_file_count(state: AggregateState, path: str | Path = AGGREGATE_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"file_count": state.file_count()}))
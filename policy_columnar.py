@@ -0,0 +1,164 @@
+"""
+Columnar policy evaluation.
+
+Findings are held as column arrays (ids, paths, line counts, signals) and
+rules with a vectorized form are evaluated over a whole batch at once.
+Only the rows a vector rule flags go through the scalar rule, which then
+builds the judgement, so judgement objects are created only for hits.
+Rules without a vectorized form run per finding as usual.
+
+Results (judgements and their order) are identical to the scalar path.
+NumPy is used when it is installed; otherwise the same column operations
+run on plain lists.
+"""
+
+from typing import Callable, Dict, List, Sequence
+
+import policy_engine
+from archive_reader import rule_path
+from policy_engine import Finding, PolicyJudgement
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+DEFAULT_BATCH_SIZE = 65536
+
+# Stand-in for line counts that are missing or not ints; never "too large"
+_NO_LINE_COUNT = -1
+_MAX_INT64 = (1 << 63) - 1
+
+
+class FindingBatch:
+    """
+    Column-oriented view over a sequence of findings. Columns are built
+    on first use, so a batch only pays for what the active rules read.
+    """
+
+    def __init__(self, findings: Sequence[Finding]):
+        self.findings = findings
+        self._columns: Dict[str, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def _column(self, name: str, build: Callable[[], object]):
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = build()
+        return column
+
+    @property
+    def paths(self) -> List[str]:
+        return self._column("paths", lambda: [f.path for f in self.findings])
+
+    @property
+    def signals(self) -> List[str]:
+        return self._column("signals", lambda: [f.signal for f in self.findings])
+
+    @property
+    def line_counts(self):
+        def build():
+            values = [
+                lc if isinstance(lc, int) else _NO_LINE_COUNT
+                for lc in [f.metadata.get("line_count") for f in self.findings]
+            ]
+            if np is None:
+                return values
+            try:
+                return np.fromiter(values, dtype=np.int64, count=len(values))
+            except OverflowError:
+                clamped = [min(v, _MAX_INT64) for v in values]
+                return np.fromiter(clamped, dtype=np.int64, count=len(clamped))
+
+        return self._column("line_counts", build)
+
+
+# ----------------------------
+# Column operations
+# ----------------------------
+
+def _nonzero(mask) -> List[int]:
+    if np is not None and isinstance(mask, np.ndarray):
+        return np.flatnonzero(mask).tolist()
+    return [i for i, hit in enumerate(mask) if hit]
+
+
+def _greater_than(column, threshold: int):
+    if np is not None:
+        return column > threshold
+    return [v > threshold for v in column]
+
+
+def _equals(column: List[str], value: str) -> List[bool]:
+    # Object-dtype comparisons gain nothing from NumPy; stay on lists
+    return [v == value for v in column]
+
+
+# ----------------------------
+# Vectorized rules
+# ----------------------------
+
+def _vec_forbidden_path(batch: FindingBatch):
+    return policy_engine._forbidden_paths_trie().match_mask(map(rule_path, batch.paths))
+
+
+def _vec_missing_metadata(batch: FindingBatch):
+    return _equals(batch.signals, "missing_metadata")
+
+
+def _vec_file_too_large(batch: FindingBatch):
+    return _greater_than(batch.line_counts, policy_engine.MAX_LINE_COUNT)
+
+
+VECTOR_RULES: Dict[Callable, Callable] = {
+    policy_engine.rule_forbidden_path: _vec_forbidden_path,
+    policy_engine.rule_missing_metadata: _vec_missing_metadata,
+    policy_engine.rule_file_too_large: _vec_file_too_large,
+}
+
+
+def _hits_by_row(
+    findings: Sequence[Finding],
+    rules: Sequence[Callable],
+) -> Dict[int, List[PolicyJudgement]]:
+    """Judgements of the rows that have any, each in rule order."""
+    batch = FindingBatch(findings)
+    hits: Dict[int, List[PolicyJudgement]] = {}
+
+    for rule in rules:
+        vector_rule = VECTOR_RULES.get(rule)
+        rows = (
+            _nonzero(vector_rule(batch))
+            if vector_rule is not None
+            else range(len(batch))
+        )
+        for row in rows:
+            judgement = rule(findings[row])
+            if judgement:
+                hits.setdefault(row, []).append(judgement)
+
+    return hits
+
+
+def evaluate_rows(
+    findings: Sequence[Finding],
+    rules: Sequence[Callable],
+) -> List[Sequence[PolicyJudgement]]:
+    """Each finding's judgements, in rule order."""
+    hits = _hits_by_row(findings, rules)
+    return [hits.get(row, ()) for row in range(len(findings))]
+
+
+def evaluate_batch(
+    findings: Sequence[Finding],
+    rules: Sequence[Callable],
+) -> List[PolicyJudgement]:
+    """
+    Evaluate rules over a batch, returning judgements in the same order as
+    the scalar loop (by finding, then by rule).
+    """
+    hits = _hits_by_row(findings, rules)
+    return [j for row in sorted(hits) for j in hits[row]]
@@ -1,24 +1,44 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
-import os
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
+from archive_reader import rule_path
+from file_classifier import GENERATED, VENDORED
+from path_trie import PathTrie
 from profiles import resolve_profile
 
+if TYPE_CHECKING:
+    from judgement_cache import JudgementCache
+    from policy_aggregate import AggregateState
+
 
 # ----------------------------
 # Data contracts
 # ----------------------------
+# Slotted: a scan can hold millions of these. Scanner findings carry a
+# compact file_metadata.FileMetadata; any Mapping works.
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Finding:
     id: str
     type: str
     path: str
     signal: str
-    metadata: Dict
+    metadata: Mapping[str, Any]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PolicyJudgement:
     finding_id: str
     rule_id: str
@@ -35,6 +55,8 @@ class PolicySummary:
     warnings: int
     passes: int
     profile: str
+    truncated: bool = False     # fail-fast stopped before all findings ran
+    skipped: Dict[str, int] = field(default_factory=dict)   # generated/vendored files
 
 
 # ----------------------------
@@ -43,16 +65,76 @@ class PolicySummary:
 
 FORBIDDEN_PATHS = ("secrets", "private", ".env")
 MAX_LINE_COUNT = 500
+MAX_LINE_LENGTH = 120
+
+# Source files must name their license near the top: one of these markers
+# (case-insensitive) has to appear in the scanner's header. Empty files
+# are exempt.
+REQUIRED_HEADER_MARKERS = ("spdx-license-identifier", "copyright", "license")
+HEADER_REQUIRED_SUFFIXES = (".py", ".js", ".ts", ".go", ".java", ".c", ".h", ".cpp", ".rs", ".sh")
+
+
+_forbidden_trie: Optional[PathTrie] = None
+_forbidden_source = None
+
+
+def _forbidden_paths_trie() -> PathTrie:
+    """FORBIDDEN_PATHS compiled to a trie, recompiled if the tuple is rebound."""
+    global _forbidden_trie, _forbidden_source
+
+    if _forbidden_source is not FORBIDDEN_PATHS:
+        _forbidden_trie = PathTrie(((p, True) for p in FORBIDDEN_PATHS), normalize=True)
+        _forbidden_source = FORBIDDEN_PATHS
+
+    return _forbidden_trie
+
+
+def uses_metadata(*fields: str) -> Callable:
+    """
+    Declare which Finding.metadata fields a rule reads, so the scanner can
+    skip computing the rest. A rule without the declaration is assumed to
+    read every field.
+    """
+    def decorate(rule: Callable) -> Callable:
+        rule.metadata_fields = frozenset(fields)
+        return rule
+    return decorate
+
+
+def required_metadata_fields(rules: Iterable[Callable]) -> Optional[FrozenSet[str]]:
+    """Union of the fields the rules read; None if any rule is undeclared."""
+    fields: FrozenSet[str] = frozenset()
+    for rule in rules:
+        declared = getattr(rule, "metadata_fields", None)
+        if declared is None:
+            return None
+        fields |= declared
+    return fields
+
+
+def is_missing_header(path: str, header: Optional[str]) -> bool:
+    """
+    Does a source file lack the required license header? header is the
+    scanner's metadata["header"]; None (binary or unread) never counts.
+    """
+    if not header or not path.endswith(HEADER_REQUIRED_SUFFIXES):
+        return False
+    header = header.lower()
+    return not any(marker in header for marker in REQUIRED_HEADER_MARKERS)
 
 
-def _normalized_path(path: str) -> str:
-    norm = os.path.normpath(path)
-    return "/".join(norm.split(os.sep))
+def _is_forbidden(path: str) -> bool:
+    """
+    Does any FORBIDDEN_PATHS entry appear as whole components of the
+    normalized path (archive members included, see archive_reader.rule_path)?
+    Memoized per parent directory.
+    """
+    return _forbidden_paths_trie().matches(rule_path(path))
 
 
+@uses_metadata()
 def rule_forbidden_path(finding: Finding) -> Optional[PolicyJudgement]:
-    norm_path = _normalized_path(finding.path)
-    if any(f"/{p}/" in f"/{norm_path}/" for p in FORBIDDEN_PATHS):
+    if _is_forbidden(finding.path):
         return PolicyJudgement(
             finding_id=finding.id,
             rule_id="FORBIDDEN_PATH",
@@ -63,6 +145,8 @@ def rule_forbidden_path(finding: Finding) -> Optional[PolicyJudgement]:
     return None
 
 
+# The scanner sets the signal from the sniffed header (is_missing_header)
+@uses_metadata("header")
 def rule_missing_metadata(finding: Finding) -> Optional[PolicyJudgement]:
     if finding.signal == "missing_metadata":
         return PolicyJudgement(
@@ -75,6 +159,7 @@ def rule_missing_metadata(finding: Finding) -> Optional[PolicyJudgement]:
     return None
 
 
+@uses_metadata("line_count")
 def rule_file_too_large(finding: Finding) -> Optional[PolicyJudgement]:
     line_count = finding.metadata.get("line_count")
     if isinstance(line_count, int) and line_count > MAX_LINE_COUNT:
@@ -88,48 +173,389 @@ def rule_file_too_large(finding: Finding) -> Optional[PolicyJudgement]:
     return None
 
 
+# ----------------------------
+# Content rules (from metadata["line_stats"], see line_stats)
+# ----------------------------
+
+def _line_stat(finding: Finding, key: str) -> int:
+    stats = finding.metadata.get("line_stats")
+    return stats.get(key, 0) if isinstance(stats, Mapping) else 0
+
+
+@uses_metadata("line_stats")
+def rule_line_too_long(finding: Finding) -> Optional[PolicyJudgement]:
+    if _line_stat(finding, "max_line_length") > MAX_LINE_LENGTH:
+        return PolicyJudgement(
+            finding_id=finding.id,
+            rule_id="LINE_TOO_LONG",
+            status="warn",
+            confidence=0.8,
+            reason="File has lines longer than the recommended maximum length.",
+        )
+    return None
+
+
+@uses_metadata("line_stats")
+def rule_trailing_whitespace(finding: Finding) -> Optional[PolicyJudgement]:
+    if _line_stat(finding, "trailing_whitespace"):
+        return PolicyJudgement(
+            finding_id=finding.id,
+            rule_id="TRAILING_WHITESPACE",
+            status="warn",
+            confidence=0.9,
+            reason="File has lines ending in trailing whitespace.",
+            suggested_fix="Strip trailing whitespace.",
+        )
+    return None
+
+
+@uses_metadata("line_stats")
+def rule_tab_indentation(finding: Finding) -> Optional[PolicyJudgement]:
+    if _line_stat(finding, "tab_indented"):
+        return PolicyJudgement(
+            finding_id=finding.id,
+            rule_id="TAB_INDENTATION",
+            status="warn",
+            confidence=0.8,
+            reason="File has lines indented with tabs.",
+        )
+    return None
+
+
+@uses_metadata("line_stats")
+def rule_crlf_line_endings(finding: Finding) -> Optional[PolicyJudgement]:
+    if _line_stat(finding, "crlf"):
+        return PolicyJudgement(
+            finding_id=finding.id,
+            rule_id="CRLF_LINE_ENDINGS",
+            status="warn",
+            confidence=0.9,
+            reason="File uses CRLF line endings.",
+            suggested_fix="Convert line endings to LF.",
+        )
+    return None
+
+
+@uses_metadata("secrets")
+def rule_hardcoded_secret(finding: Finding) -> Optional[PolicyJudgement]:
+    secrets = finding.metadata.get("secrets")
+    if secrets:
+        where = ", ".join(f"{name} on line {line}" for name, line in secrets)
+        return PolicyJudgement(
+            finding_id=finding.id,
+            rule_id="HARDCODED_SECRET",
+            status="fail",
+            confidence=0.9,
+            reason=f"File appears to contain hardcoded credentials ({where}).",
+            suggested_fix="Move the credential to the environment or a secret store and rotate it.",
+        )
+    return None
+
+
+# Rules that still judge generated and vendored files. Their markers are
+# trivial to fake, so neither a forbidden path nor a credential may hide
+# behind them. The scanner gives such files the "skipped" signal and only
+# these rules' fields, so every other rule passes them.
+SKIPPED_FILE_RULES = [
+    rule_forbidden_path,
+    rule_hardcoded_secret,
+]
+SKIPPED_FILE_FIELDS = required_metadata_fields(SKIPPED_FILE_RULES)
+
 POLICY_RULES = [
     rule_forbidden_path,
     rule_missing_metadata,
     rule_file_too_large,
+    rule_hardcoded_secret,
+]
+
+CONTENT_RULES = [
+    rule_line_too_long,
+    rule_trailing_whitespace,
+    rule_tab_indentation,
+    rule_crlf_line_endings,
 ]
 
+# Named subsets of the rules selectable from the CLI. "paths" reads no
+# metadata, so a scan for it never opens a file; "content" adds the
+# CONTENT_RULES, which all read the one line_stats field.
+RULE_SETS: Dict[str, List[Callable]] = {
+    "default": POLICY_RULES,
+    "paths": [rule_forbidden_path],
+    "content": POLICY_RULES + CONTENT_RULES,
+}
+
 
 # ----------------------------
 # Policy engine (profile-aware aggregation ONLY)
 # ----------------------------
 
-def apply_policy_engine(findings: List[Finding]) -> Dict:
-    judgements: List[PolicyJudgement] = []
+def new_policy_summary(rules: Optional[Sequence[Callable]] = None) -> PolicySummary:
+    """Summary for a run that has not seen any findings yet."""
+    rules = POLICY_RULES if rules is None else rules
+    return PolicySummary(
+        checked_rules=len(rules),
+        violations=0,
+        warnings=0,
+        passes=len(rules),
+        profile="default",
+    )
+
 
+def _count_judgement(summary: PolicySummary, j: PolicyJudgement) -> bool:
+    """Fold a judgement into the summary; True if it blocks the gate."""
+    profile = resolve_profile(j.finding_id)
+    blocking = False
+    if j.status == "fail":
+        summary.violations += 1
+        blocking = True
+    elif j.status == "warn":
+        summary.warnings += 1
+        if profile.fail_on_warnings:
+            summary.violations += 1
+            blocking = True
+
+    summary.passes = summary.checked_rules - summary.violations - summary.warnings
+    return blocking
+
+
+def _profile_from_first(
+    findings: Iterable[Finding],
+    summary: PolicySummary,
+) -> Iterator[Finding]:
+    """Pass findings through, taking the run's profile from the first one."""
+    first = True
     for finding in findings:
-        for rule in POLICY_RULES:
+        if first:
+            summary.profile = resolve_profile(finding.path).name
+            first = False
+        yield finding
+
+
+# Finding types the scanner's file_classifier gives files nobody reviews
+SKIPPED_FINDING_TYPES = frozenset({GENERATED, VENDORED})
+
+
+def _count_skipped(
+    findings: Iterable[Finding],
+    summary: PolicySummary,
+) -> Iterator[Finding]:
+    """Pass findings through, counting generated and vendored ones by type."""
+    skipped = summary.skipped
+    for finding in findings:
+        if finding.type in SKIPPED_FINDING_TYPES:
+            skipped[finding.type] = skipped.get(finding.type, 0) + 1
+        yield finding
+
+
+def _batched(findings: Iterable[Finding], size: int) -> Iterator[List[Finding]]:
+    batch: List[Finding] = []
+    for finding in findings:
+        batch.append(finding)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_scalar(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+) -> Iterator[PolicyJudgement]:
+    for finding in findings:
+        for rule in rules:
             judgement = rule(finding)
             if judgement:
-                judgements.append(judgement)
-
-    violations = 0
-    warnings = 0
-
-    for j in judgements:
-        profile = resolve_profile(j.finding_id)
-        if j.status == "fail":
-            violations += 1
-        elif j.status == "warn":
-            warnings += 1
-            if profile.fail_on_warnings:
-                violations += 1
-
-    profile_name = (
-        resolve_profile(findings[0].path).name if findings else "default"
-    )
+                yield judgement
+
+
+def _iter_scalar_rows(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+) -> Iterator[List[PolicyJudgement]]:
+    for finding in findings:
+        yield [j for j in (rule(finding) for rule in rules) if j]
+
+
+def _iter_columnar(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+    batch_size: int,
+    rows: bool = False,
+) -> Iterator:
+    from policy_columnar import evaluate_batch, evaluate_rows
 
-    summary = PolicySummary(
-        checked_rules=len(POLICY_RULES),
-        violations=violations,
-        warnings=warnings,
-        passes=len(POLICY_RULES) - violations - warnings,
-        profile=profile_name,
+    evaluate = evaluate_rows if rows else evaluate_batch
+    for batch in _batched(findings, batch_size):
+        yield from evaluate(batch, rules)
+
+
+def _evaluate(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+    columnar: bool,
+    batch_size: Optional[int],
+    workers: int,
+    rows: bool = False,
+    aggregate: Optional["AggregateState"] = None,
+) -> Iterator:
+    """
+    Judgements from the selected evaluator, in input order; rows=True
+    yields one sequence of judgements per finding instead. aggregate is
+    fed from the shards on the process pool and ignored otherwise.
+    """
+    if workers > 1:
+        from policy_parallel import DEFAULT_SHARD_SIZE, iter_sharded
+        return iter_sharded(
+            findings, rules, workers, batch_size or DEFAULT_SHARD_SIZE, columnar, rows,
+            aggregate,
+        )
+    if columnar:
+        from policy_columnar import DEFAULT_BATCH_SIZE
+        return _iter_columnar(findings, rules, batch_size or DEFAULT_BATCH_SIZE, rows)
+    if rows:
+        return _iter_scalar_rows(findings, rules)
+    return _iter_scalar(findings, rules)
+
+
+def _miss_chunk_size(columnar: bool, batch_size: Optional[int], workers: int) -> int:
+    """
+    How many cache misses to evaluate together: one at a time for the
+    scalar loop, which streams them anyway, else what the evaluator
+    takes in before yielding (a batch, or a shard per worker).
+    """
+    if workers > 1:
+        from policy_parallel import DEFAULT_SHARD_SIZE
+        return (batch_size or DEFAULT_SHARD_SIZE) * workers
+    if columnar:
+        from policy_columnar import DEFAULT_BATCH_SIZE
+        return batch_size or DEFAULT_BATCH_SIZE
+    return 1
+
+
+def _then_aggregate(
+    judgements: Iterator[PolicyJudgement],
+    aggregate: "AggregateState",
+) -> Iterator[PolicyJudgement]:
+    yield from judgements
+    yield from aggregate.judgements()
+
+
+def iter_policy_engine(
+    findings: Iterable[Finding],
+    summary: PolicySummary,
+    columnar: bool = False,
+    batch_size: Optional[int] = None,
+    rules: Optional[Sequence[Callable]] = None,
+    workers: int = 1,
+    fail_fast: bool = False,
+    cache: Optional["JudgementCache"] = None,
+    aggregate: Optional["AggregateState"] = None,
+) -> Iterator[PolicyJudgement]:
+    """
+    Streaming policy evaluation.
+
+    Consumes findings lazily and yields judgements as they are produced,
+    keeping `summary` up to date after every judgement. No finding is
+    retained once its rules have run.
+
+    columnar=True evaluates batches of `batch_size` findings with the
+    vectorized rules in policy_columnar (one batch is held at a time);
+    judgements are identical.
+
+    rules defaults to POLICY_RULES; see RULE_SETS.
+
+    workers > 1 evaluates shards of `batch_size` findings on a process pool
+    (see policy_parallel); judgements and summary are identical.
+
+    fail_fast=True stops at the first blocking judgement (a fail, or a
+    warn under a fail_on_warnings profile): that judgement is the last one
+    yielded, summary.truncated is set, and the findings iterator is closed
+    so the scan stops too.
+
+    cache (a judgement_cache.JudgementCache) serves the judgements of
+    findings whose content hash is unchanged since an earlier run with the
+    same rules and settings; only the others are evaluated, and their
+    judgements are recorded. Order is unchanged.
+
+    aggregate (a policy_aggregate.AggregateState) adds the repo-level
+    aggregate rules: every finding is folded into it as it streams past
+    (inside the workers when sharding), and its judgements follow the
+    per-file ones once the stream is exhausted.
+
+    Generated and vendored findings (see file_classifier) are counted in
+    summary.skipped and left out of the aggregate; of the rules, only
+    SKIPPED_FILE_RULES can flag them.
+    """
+    rules = POLICY_RULES if rules is None else rules
+    source = findings
+    findings = _profile_from_first(_count_skipped(findings, summary), summary)
+
+    # Cache hits never reach the workers, so then aggregate here instead
+    shard_aggregate = aggregate if workers > 1 and cache is None else None
+    if aggregate is not None:
+        from policy_aggregate import AGGREGATE_RULES
+        summary.checked_rules += len(AGGREGATE_RULES)
+        summary.passes += len(AGGREGATE_RULES)
+        if shard_aggregate is None:
+            findings = aggregate.observe(findings)
+
+    if cache is not None:
+        from judgement_cache import iter_cached
+        chunk_size = _miss_chunk_size(columnar, batch_size, workers)
+        judgements = iter_cached(
+            findings,
+            rules,
+            cache,
+            # A pool for a short run of misses would cost more than it saves
+            lambda misses: _evaluate(
+                misses, rules, columnar, batch_size,
+                workers if len(misses) >= chunk_size else 1, rows=True,
+            ),
+            chunk_size,
+        )
+    else:
+        judgements = _evaluate(
+            findings, rules, columnar, batch_size, workers, aggregate=shard_aggregate
+        )
+
+    if aggregate is not None:
+        judgements = _then_aggregate(judgements, aggregate)
+
+    for judgement in judgements:
+        blocking = _count_judgement(summary, judgement)
+        yield judgement
+
+        if blocking and fail_fast:
+            summary.truncated = True
+            judgements.close()
+            if hasattr(source, "close"):
+                source.close()
+            return
+
+
+def apply_policy_engine(
+    findings: Iterable[Finding],
+    columnar: bool = False,
+    rules: Optional[Sequence[Callable]] = None,
+    workers: int = 1,
+    fail_fast: bool = False,
+    cache: Optional["JudgementCache"] = None,
+    aggregate: Optional["AggregateState"] = None,
+) -> Dict:
+    summary = new_policy_summary(rules)
+    judgements: List[PolicyJudgement] = list(
+        iter_policy_engine(
+            findings,
+            summary,
+            columnar=columnar,
+            rules=rules,
+            workers=workers,
+            fail_fast=fail_fast,
+            cache=cache,
+            aggregate=aggregate,
+        )
     )
 
     return {
@@ -0,0 +1,108 @@
+"""
+Sharded policy evaluation on a process pool.
+
+Findings are cut into fixed-size shards in input order and each shard is
+evaluated in a worker process. Shard results are consumed in submission
+order, so judgements come back in exactly the order the sequential loop
+produces them, and the caller folds them into the PolicySummary the same
+way. At most a few shards per worker are in flight at a time.
+
+Rules and findings are pickled to the workers: rules must be module-level
+functions, and module settings (FORBIDDEN_PATHS, MAX_LINE_COUNT, ...) are
+the ones the worker processes see. Findings scanned with LazyMetadata
+compute their deferred fields inside the workers.
+
+Workers are started by a fork server (spawned where there is none), not
+forked from the caller: the caller has threads running (scanner pools,
+the API client's event loop), and a child forked while another thread
+holds a lock can deadlock on it. Workers therefore import the modules
+afresh and see their settings as defined on disk, not as patched at
+runtime in the caller.
+
+With an AggregateState, each worker also folds its shard into a fresh
+state, and the shard states are merged into the caller's as they return.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from policy_engine import Finding, _batched, _iter_scalar, _iter_scalar_rows
+
+if TYPE_CHECKING:
+    from policy_aggregate import AggregateState
+
+
+DEFAULT_SHARD_SIZE = 4096
+
+START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _evaluate_shard(
+    shard: List[Finding],
+    rules: Sequence[Callable],
+    columnar: bool,
+    rows: bool = False,
+    aggregate: bool = False,
+) -> Tuple[List, Optional["AggregateState"]]:
+    state = None
+    if aggregate:
+        from policy_aggregate import AggregateState
+        state = AggregateState()
+        for finding in shard:
+            state.add(finding)
+
+    if rows:
+        if columnar:
+            from policy_columnar import evaluate_rows
+            return evaluate_rows(shard, rules), state
+        return list(_iter_scalar_rows(shard, rules)), state
+    if columnar:
+        from policy_columnar import evaluate_batch
+        return evaluate_batch(shard, rules), state
+    return list(_iter_scalar(shard, rules)), state
+
+
+def iter_sharded(
+    findings: Iterable[Finding],
+    rules: Sequence[Callable],
+    workers: int,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    columnar: bool = False,
+    rows: bool = False,
+    aggregate: Optional["AggregateState"] = None,
+) -> Iterator:
+    """
+    Yield judgements in input order, evaluating shards on `workers` processes.
+
+    rows=True yields each finding's judgements as one sequence instead.
+    Shard aggregate states are merged into `aggregate` when it is given.
+    """
+    rules = list(rules)
+    max_pending = workers * 2
+    pending = deque()
+
+    def collect(future):
+        results, state = future.result()
+        if aggregate is not None:
+            aggregate.merge(state)
+        return results
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD)
+    )
+    try:
+        for shard in _batched(findings, shard_size):
+            pending.append(executor.submit(
+                _evaluate_shard, shard, rules, columnar, rows, aggregate is not None
+            ))
+            if len(pending) >= max_pending:
+                yield from collect(pending.popleft())
+
+        while pending:
+            yield from collect(pending.popleft())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
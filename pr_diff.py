@@ -0,0 +1,149 @@
+"""
+PR Diff — the files a pull request changes, against its merge-base.
+
+Diffing against HEAD~1 only sees the last commit of a multi-commit PR.
+resolve_changes() instead finds the merge-base of HEAD and the target
+branch and diffs from there with rename detection (`--name-status -z
+-M`), then overlays uncommitted changes to tracked files. The committed
+part is memoized per (merge-base, HEAD) pair, so repeated scans in one
+process (repair iterations, the judgement cache) run git diff once.
+
+The target branch is the one given, else $GATEKEEPER_BASE_BRANCH, else
+the PR base GitHub Actions exports ($GITHUB_BASE_REF), else the first of
+DEFAULT_BASE_BRANCHES that exists. Without any, HEAD~1 is the base.
+"""
+
+import functools
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from git_blobs import git_toplevel
+
+
+BASE_BRANCH_ENV = "GATEKEEPER_BASE_BRANCH"
+DEFAULT_BASE_BRANCHES = ("origin/main", "origin/master", "main", "master")
+FALLBACK_BASE = "HEAD~1"
+
+
+@dataclass(frozen=True)
+class ChangedFile:
+    path: str                       # relative to the top level
+    status: str                     # A, C, M, R or T; deletions are not listed
+    old_path: Optional[str] = None  # renames and copies
+    similarity: Optional[int] = None
+
+    @property
+    def pure_rename(self) -> bool:
+        """Renamed with identical content."""
+        return self.status == "R" and self.similarity == 100
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    top: str
+    base: str       # merge-base commit
+    head: str
+    files: Tuple[ChangedFile, ...]
+
+    def paths(self) -> Set[str]:
+        """Absolute paths of every changed file."""
+        return {os.path.join(self.top, f.path) for f in self.files}
+
+    def renames(self) -> Dict[str, str]:
+        """Absolute new path -> absolute old path for the pure renames."""
+        return {
+            os.path.join(self.top, f.path): os.path.join(self.top, f.old_path)
+            for f in self.files
+            if f.pure_rename
+        }
+
+
+def _git(top: str, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", top, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def _parse_name_status(out: str) -> Iterator[Tuple[str, Optional[ChangedFile]]]:
+    """(path, ChangedFile or None for a deletion) from `--name-status -z`."""
+    fields = iter(out.split("\0"))
+    for status in fields:
+        if not status:
+            continue
+        kind = status[0]
+        if kind in "RC":
+            old_path, path = next(fields), next(fields)
+            yield path, ChangedFile(path, kind, old_path, int(status[1:] or 0))
+        else:
+            path = next(fields)
+            yield path, None if kind == "D" else ChangedFile(path, kind)
+
+
+def _name_status(top: str, *revs: str) -> Dict[str, Optional[ChangedFile]]:
+    return dict(_parse_name_status(
+        _git(top, "diff", "--name-status", "-z", "-M", *revs)
+    ))
+
+
+@functools.lru_cache(maxsize=32)
+def _committed_changes(top: str, base: str, head: str) -> Dict[str, Optional[ChangedFile]]:
+    return _name_status(top, base, head)
+
+
+def base_branch_candidates(base_branch: Optional[str] = None) -> Tuple[str, ...]:
+    if base_branch:
+        return (base_branch,)
+    if os.environ.get(BASE_BRANCH_ENV):
+        return (os.environ[BASE_BRANCH_ENV],)
+    if os.environ.get("GITHUB_BASE_REF"):
+        return (f"origin/{os.environ['GITHUB_BASE_REF']}",) + DEFAULT_BASE_BRANCHES
+    return DEFAULT_BASE_BRANCHES
+
+
+def merge_base(top: str, base_branch: Optional[str] = None) -> Optional[str]:
+    """The merge-base of HEAD and the target branch, else HEAD~1's commit."""
+    for ref in base_branch_candidates(base_branch) + (FALLBACK_BASE,):
+        try:
+            return _git(top, "merge-base", ref, "HEAD").strip()
+        except subprocess.CalledProcessError:
+            continue
+    return None
+
+
+def resolve_changes(path: str = ".", base_branch: Optional[str] = None) -> Optional[ChangeSet]:
+    """
+    The changes of the branch checked out at path: committed since the
+    merge-base, plus uncommitted changes to tracked files. None outside a
+    repository or when no base can be found (e.g. a single commit).
+    """
+    path = os.path.abspath(path)
+    top = git_toplevel(path if os.path.isdir(path) else os.path.dirname(path))
+    if top is None:
+        return None
+
+    try:
+        head = _git(top, "rev-parse", "HEAD").strip()
+        base = merge_base(top, base_branch)
+        if base is None:
+            return None
+        changes = dict(_committed_changes(top, base, head))
+        for file_path, change in _name_status(top, "HEAD").items():
+            committed = changes.get(file_path)
+            if committed is not None and change is not None and change.status == "M":
+                # Still added or renamed by the PR, but no longer identical
+                change = ChangedFile(file_path, committed.status, committed.old_path)
+            changes[file_path] = change
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return ChangeSet(
+        top=top,
+        base=base,
+        head=head,
+        files=tuple(f for _, f in sorted(changes.items()) if f is not None),
+    )
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Optional
+
+from archive_reader import rule_path
+from path_trie import PathTrie
 
 
 @dataclass(frozen=True)
@@ -30,19 +33,32 @@ PROFILES: Dict[str, Profile] = {
 
 
 # Ownership mapping: path prefix → profile
-OWNERSHIP_RULES = [
+# (a tuple: rebinding it recompiles the lookup trie, mutation would not)
+OWNERSHIP_RULES = (
     ("/secrets", "strict"),
     ("/private", "strict"),
     ("/src", "default"),
-]
+)
+
+_ownership_trie: Optional[PathTrie] = None
+_ownership_source = None
 
 
 def resolve_profile(path: str) -> Profile:
     """
     Resolve profile based on ownership rules.
     First match wins.
+
+    Rules are compiled into a path-component trie memoized per parent
+    directory, so lookups cost O(path depth).
     """
-    for prefix, profile_name in OWNERSHIP_RULES:
-        if f"/{prefix.strip('/')}/" in f"/{path}/":
-            return PROFILES[profile_name]
-    return PROFILES["default"]
+    global _ownership_trie, _ownership_source
+
+    if _ownership_source is not OWNERSHIP_RULES:
+        _ownership_trie = PathTrie(
+            (prefix.strip("/"), profile_name)
+            for prefix, profile_name in OWNERSHIP_RULES
+        )
+        _ownership_source = OWNERSHIP_RULES
+
+    return PROFILES[_ownership_trie.lookup(rule_path(path), "default")]
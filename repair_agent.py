@@ -5,16 +5,11 @@ This module uses Claude to generate repair patches
 that conform to repair_schema.py format.
 """
 
-import os
 import json
-from anthropic import Anthropic
+from api_client import shared_client
 from repair_schema import validate_patch
 
 
-# Initialize Claude client
-client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-
-
 def build_repair_prompt(code: str, failures: str, profile: str) -> str:
     """Build the repair agent prompt."""
     return f"""You are a precise code repair agent. Your job is to fix ONLY the specific failures provided.
@@ -81,7 +76,7 @@ def generate_repairs(
     
     # Call Claude
     try:
-        message = client.messages.create(
+        message = shared_client().messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=4000,
             messages=[{
@@ -1,4 +1,4 @@
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 import os
 import json
 import hashlib
@@ -29,11 +29,16 @@ def apply_repairs(
     allowed_files: Set[str],
     audit_log_path: str,
     iteration: int,
+    content_hashes: Optional[Dict[str, str]] = None,
 ) -> bool:
     """
     Phase 5A.x: audit-only repair loop.
     Never mutates files. Always returns False.
+
+    content_hashes maps scanned paths to the sha256 the scanner already
+    computed; those files are not rehashed for before_hash.
     """
+    content_hashes = content_hashes or {}
 
     audit_entry = {
         "iteration": iteration,
@@ -50,7 +55,7 @@ def apply_repairs(
         if real_path not in allowed_realpaths:
             continue
 
-        before = _file_hash(real_path)
+        before = content_hashes.get(plan.file_path) or _file_hash(real_path)
         after = before  # inert by design
 
         audit_entry["repairs"].append(
@@ -0,0 +1,133 @@
+"""
+Scan Index — persistent per-file metadata cache for the scanner.
+
+Entries are keyed by absolute path and validated against the file's
+(inode, mtime_ns, size) signature. When the signature still matches, the
+cached Finding metadata is reused and the file is never reopened. The
+content hash recorded on the last read is kept alongside the entry.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+
+INDEX_PATH = Path(".gatekeeper/scan_index.json")
+INDEX_VERSION = 5
+
+
+class ScanIndex:
+    def __init__(self, path: str | Path = INDEX_PATH):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------
+    @classmethod
+    def load(cls, path: str | Path = INDEX_PATH) -> "ScanIndex":
+        """Load the index, starting empty if it is missing or unreadable."""
+        index = cls(path)
+        if not index.path.exists():
+            return index
+
+        try:
+            data = json.loads(index.path.read_text())
+        except Exception:
+            return index
+
+        if data.get("version") == INDEX_VERSION:
+            index.entries = data.get("entries", {})
+
+        return index
+
+    def save(self) -> None:
+        """Atomically persist the index."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "entries": self.entries},
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.path)
+
+    # --------------------------------------------------------
+    # Lookup / update
+    # --------------------------------------------------------
+    def lookup(self, path: str, st: os.stat_result) -> Optional[Dict]:
+        """
+        Return cached metadata if the file is unchanged since it was indexed.
+        """
+        with self._lock:
+            self._seen.add(path)
+            entry = self.entries.get(path)
+
+            if (
+                entry is not None
+                and entry["inode"] == st.st_ino
+                and entry["mtime_ns"] == st.st_mtime_ns
+                and entry["size"] == st.st_size
+            ):
+                self.hits += 1
+                return dict(entry["metadata"])
+
+            self.misses += 1
+            return None
+
+    def recorded_hash(self, path: str, st: os.stat_result) -> Optional[str]:
+        """
+        The content hash recorded for the file if it is unchanged since,
+        without counting as a lookup.
+        """
+        with self._lock:
+            entry = self.entries.get(path)
+        if (
+            entry is not None
+            and entry["inode"] == st.st_ino
+            and entry["mtime_ns"] == st.st_mtime_ns
+            and entry["size"] == st.st_size
+        ):
+            return entry["content_hash"]
+        return None
+
+    def record(
+        self,
+        path: str,
+        st: os.stat_result,
+        content_hash: Optional[str],
+        metadata: Dict,
+    ) -> None:
+        entry = {
+            "inode": st.st_ino,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "content_hash": content_hash,
+            "metadata": dict(metadata),
+        }
+        with self._lock:
+            self._seen.add(path)
+            self.entries[path] = entry
+
+    def prune(self, root: str) -> int:
+        """
+        Drop entries under root that were not seen during this run.
+
+        Only meaningful after a complete walk of root.
+        """
+        prefix = root.rstrip(os.sep) + os.sep
+        stale = [
+            p for p in self.entries
+            if p.startswith(prefix) and p not in self._seen
+        ]
+        for p in stale:
+            del self.entries[p]
+        return len(stale)
@@ -1,69 +1,778 @@
+import codecs
+import hashlib
+import io
+import mmap
 import os
-import subprocess
-from typing import List, Set
+from collections.abc import Mapping
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Set
 
-from policy_engine import Finding
+from archive_reader import ARCHIVE_ERRORS, is_archive, iter_members, member_path
+from file_classifier import FileClassifier
+from file_metadata import METADATA_FIELDS, FileMetadata
+from git_blobs import CatFileBatch, git_toplevel, staged_blobs
+from policy_engine import SKIPPED_FILE_FIELDS, Finding, is_missing_header
+from ignore_rules import IgnoreMatcher
+from line_stats import line_stats
+from pr_diff import resolve_changes
+from scan_index import ScanIndex
+from secret_scan import find_secrets
+from tree_walker import bounded_map, iter_files
 
 
-def _git_changed_files(base_ref: str = "HEAD~1") -> Set[str]:
+CHUNK_SIZE = 1 << 20
+BINARY_SNIFF_BYTES = 8192
+HEADER_BYTES = 512
+# Archive members up to this size are held in memory for CONTENT_FIELDS;
+# larger ones are only streamed and get None for them
+MAX_MEMBER_BUFFER = 64 << 20
+
+# Fields that need the whole content, and fields the first block settles
+FULL_PASS_FIELDS = frozenset({"line_count", "sha256", "encoding"})
+HEAD_FIELDS = frozenset({"binary", "shebang", "header"})
+# Fields derived from the whole mapped content at once
+CONTENT_FIELDS = frozenset({"line_stats", "secrets"})
+
+
+def _git_changed_files(path: str = ".", base_branch: Optional[str] = None) -> Set[str]:
+    """Absolute paths the branch at path changes (see pr_diff)."""
+    changes = resolve_changes(path, base_branch)
+    return changes.paths() if changes is not None else set()
+
+
+def _iter_chunks(f, size: int) -> Iterator[bytes]:
+    """
+    Yield the file's bytes in CHUNK_SIZE blocks, from an mmap when the
+    file supports it and from large buffered reads otherwise.
+    """
+    mm = None
+    if size > 0:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None
+
+    if mm is None:
+        yield from iter(lambda: f.read(CHUNK_SIZE), b"")
+        return
+
     try:
-        result = subprocess.run(
-            ["git", "diff", "--name-only", base_ref],
-            capture_output=True,
-            text=True,
-            check=True,
+        for offset in range(0, len(mm), CHUNK_SIZE):
+            yield mm[offset:offset + CHUNK_SIZE]
+    finally:
+        mm.close()
+
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _header_fields(head: bytes, encoding: Optional[str]) -> Dict:
+    """shebang and header text from the first block of a text file."""
+    if encoding is None:
+        return {"shebang": None, "header": None}
+
+    text_encoding = "utf-8" if encoding in ("ascii", "unknown") else encoding
+    header = head[:HEADER_BYTES]
+    if len(head) > HEADER_BYTES and b"\n" in header:
+        header = header[:header.rindex(b"\n") + 1]
+    header_text = header.decode(text_encoding, errors="ignore")
+
+    shebang = None
+    if header_text.startswith("#!"):
+        shebang = header_text.splitlines()[0].strip()
+
+    return {"shebang": shebang, "header": header_text}
+
+
+def _metadata_from_chunks(
+    chunks: Iterable[bytes],
+    fields: Optional[AbstractSet[str]] = None,
+) -> Dict:
+    """
+    Compute metadata fields from a single pass over the content.
+
+    Text is never decoded for counting. A NUL byte in the first
+    BINARY_SNIFF_BYTES (without a UTF-16/32 BOM) marks the content as
+    binary, and binary content gets no line_count or encoding. For text,
+    line_count follows Python's universal-newline rules (\n, \r\n and
+    lone \r all end a line), matching iteration over the opened file.
+    encoding is "ascii", "utf-8", a BOM-declared encoding, or "unknown"
+    when the bytes are not valid UTF-8.
+
+    fields limits the work to the named fields (None means all of them).
+    The HEAD_FIELDS always come along since they cost nothing extra, and
+    when no FULL_PASS_FIELDS are wanted only the first block is read.
+    """
+    wanted = METADATA_FIELDS if fields is None else fields
+    hashing = "sha256" in wanted
+    counting = "line_count" in wanted
+    validating = "encoding" in wanted
+
+    h = hashlib.sha256()
+    size = 0
+    complete = True
+    head = None
+    binary = False
+    encoding = "ascii"
+    decoder = None
+    lf = cr = crlf = 0
+    prev_cr = False
+    last = b""
+
+    for chunk in chunks:
+        if hashing:
+            h.update(chunk)
+        size += len(chunk)
+
+        if head is None:
+            head = chunk[:max(BINARY_SNIFF_BYTES, HEADER_BYTES)]
+            for bom, name in _BOMS:
+                if head.startswith(bom):
+                    encoding = name
+                    break
+            else:
+                binary = b"\0" in head[:BINARY_SNIFF_BYTES]
+        if not (hashing or ((counting or validating) and not binary)):
+            complete = False
+            break
+        if binary:
+            continue
+
+        if counting:
+            lf += chunk.count(b"\n")
+            if b"\r" in chunk:
+                cr += chunk.count(b"\r")
+                crlf += chunk.count(b"\r\n")
+            if prev_cr and chunk[:1] == b"\n":
+                crlf += 1
+            prev_cr = chunk[-1:] == b"\r"
+            last = chunk[-1:]
+
+        # UTF-8 validation only starts at the first non-ASCII chunk
+        if validating and encoding in ("ascii", "utf-8") and (decoder or not chunk.isascii()):
+            decoder = decoder or codecs.getincrementaldecoder("utf-8")()
+            try:
+                decoder.decode(chunk)
+                encoding = "utf-8"
+            except UnicodeDecodeError:
+                encoding = "unknown"
+
+    if decoder is not None and encoding == "utf-8":
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            encoding = "unknown"
+
+    metadata: Dict = {}
+    if counting:
+        metadata["line_count"] = None if binary else (
+            lf + cr - crlf + (1 if last not in (b"", b"\n", b"\r") else 0)
         )
-        return {
-            os.path.abspath(line.strip())
-            for line in result.stdout.splitlines()
-            if line.strip()
-        }
+    if complete:
+        metadata["size"] = size
+    if hashing:
+        metadata["sha256"] = h.hexdigest()
+    metadata["binary"] = binary
+    if validating:
+        metadata["encoding"] = None if binary else encoding
+    # Header decoding only depends on the BOM, never on full validation
+    metadata.update(_header_fields(head or b"", None if binary else encoding))
+    return metadata
+
+
+def _content_from_buffer(buffer, wanted: AbstractSet[str]) -> Dict:
+    metadata: Dict = {}
+    if "line_stats" in wanted:
+        metadata["line_stats"] = line_stats(buffer)
+    if "secrets" in wanted:
+        metadata["secrets"] = [list(hit) for hit in find_secrets(buffer)]
+    return metadata
+
+
+def _file_content_fields(f, size: int, wanted: AbstractSet[str]) -> Dict:
+    """
+    The wanted CONTENT_FIELDS over the whole file, mapped once rather
+    than read when possible.
+    """
+    if size == 0:
+        return _content_from_buffer(b"", wanted)
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        f.seek(0)
+        return _content_from_buffer(f.read(), wanted)
+    try:
+        return _content_from_buffer(mm, wanted)
+    finally:
+        mm.close()
+
+
+def _read_file_metadata(path: str, fields: Optional[AbstractSet[str]] = None) -> Dict:
+    """
+    Read a file once and compute its metadata fields (all by default).
+    Without FULL_PASS_FIELDS only the first BINARY_SNIFF_BYTES are read.
+    CONTENT_FIELDS of text files come from the mapped file after the
+    chunked pass, whose pages are then already cached.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if fields is not None and not fields & FULL_PASS_FIELDS:
+                # The first block settles every other field; read only that
+                chunks = iter((f.read(max(BINARY_SNIFF_BYTES, HEADER_BYTES)),))
+            else:
+                chunks = _iter_chunks(f, size)
+            metadata = _metadata_from_chunks(chunks, fields)
+            metadata.setdefault("size", size)
+            content = CONTENT_FIELDS if fields is None else CONTENT_FIELDS & fields
+            if content and metadata["binary"]:
+                metadata.update(dict.fromkeys(content))
+            elif content:
+                metadata.update(_file_content_fields(f, size, content))
+            return metadata
     except Exception:
-        return set()
+        return {"line_count": None}
 
 
-def _scan_file(path: str) -> Finding:
+def _read_stream_metadata(
+    f,
+    size: int,
+    fields: Optional[AbstractSet[str]] = None,
+) -> Dict:
+    """
+    _read_file_metadata() for a file object that can be read only once,
+    front to back (an archive member or a blob).
+    """
+    content = CONTENT_FIELDS if fields is None else CONTENT_FIELDS & fields
+    buffer = None
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            line_count = sum(1 for _ in f)
+        if fields is not None and not fields & FULL_PASS_FIELDS and not content:
+            chunks = iter((f.read(max(BINARY_SNIFF_BYTES, HEADER_BYTES)),))
+        elif size <= MAX_MEMBER_BUFFER:
+            buffer = f.read()
+            chunks = iter((buffer,))
+        else:
+            chunks = iter(lambda: f.read(CHUNK_SIZE), b"")
+        metadata = _metadata_from_chunks(chunks, fields)
     except Exception:
-        line_count = None
+        return {"line_count": None}
+
+    metadata["size"] = size
+    if content and (metadata["binary"] or buffer is None):
+        metadata.update(dict.fromkeys(content))
+    elif content:
+        metadata.update(_content_from_buffer(buffer, content))
+    return metadata
+
+
+class LazyMetadata(FileMetadata):
+    """
+    FileMetadata whose missing fields are computed on first access.
+
+    Fields already known (computed eagerly by the scanner or taken from the
+    scan index) are served directly. Reading any other field opens the file
+    once: HEAD_FIELDS need only its first block, any FULL_PASS_FIELD
+    computes all of them in one pass, CONTENT_FIELDS map the file, and
+    "size" is a stat. Fields that could not be computed read as None.
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: str, data: Optional[Mapping] = None):
+        super().__init__(data)
+        self.path = path
+
+    def _load(self, key: str) -> None:
+        if key == "size":
+            try:
+                self._set("size", os.stat(self.path).st_size)
+            except OSError:
+                self._set("size", None)
+            return
+
+        if key in HEAD_FIELDS:
+            group = HEAD_FIELDS
+        elif key in CONTENT_FIELDS:
+            group = CONTENT_FIELDS | HEAD_FIELDS
+        else:
+            group = FULL_PASS_FIELDS | HEAD_FIELDS
+        missing = {field for field in group if not hasattr(self, field)}
+        computed = _read_file_metadata(self.path, missing)
+        for field in missing:
+            self._set(field, computed.get(field))
+        for field, value in computed.items():
+            if field not in self:
+                self._set(field, value)
+
+    def __getitem__(self, key: str):
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            if key not in METADATA_FIELDS:
+                raise
+        self._load(key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key) -> bool:
+        # Membership never triggers a read
+        try:
+            super().__getitem__(key)
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        yield from METADATA_FIELDS
+        yield from getattr(self, "_extra", ())
+
+    def __len__(self) -> int:
+        return len(METADATA_FIELDS) + len(getattr(self, "_extra", ()))
+
+    def __repr__(self) -> str:
+        return f"LazyMetadata({self.path!r}, {self.computed()!r})"
+
+
+def content_hash(finding: Finding) -> Optional[str]:
+    """
+    sha256 of a finding's content as computed by the scanner, so callers
+    (judgement cache, repair audit) can key on it without rehashing. Staged
+    findings are keyed on their git blob OID instead, which is never
+    rehashed. None if the scanner did not compute it; this never reads
+    the file.
+    """
+    metadata = finding.metadata
+    if isinstance(metadata, LazyMetadata):
+        return metadata.computed().get("sha256")
+    return metadata.get("blob_oid") or metadata.get("sha256")
+
+
+def _scan_file(
+    path: str,
+    index: Optional[ScanIndex] = None,
+    st: Optional[os.stat_result] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    classifier: Optional[FileClassifier] = None,
+) -> Finding:
+    """
+    fields=None computes every metadata field up front. Otherwise only the
+    named fields are computed here (none at all means the file is not
+    opened) and the rest are left to LazyMetadata.
+
+    With an index, unchanged files get the fields it already holds, and
+    only missing ones are read. The sha256 is always computed for an
+    index entry, whatever the fields, so partial entries still identify
+    the content (see gate_memo.index_merkle).
+
+    The signal is "missing_metadata" when the header was read and lacks
+    the required license marker (see policy_engine.is_missing_header).
+
+    With a classifier, files it recognizes as generated or vendored come
+    back with that type, signal "skipped" and only the fields of the
+    rules that still judge them (see _skipped_finding), through the index
+    like any other file; a path match means the file is opened only if
+    those fields (or, with an index, its hash) are wanted.
+    """
+    if classifier is not None:
+        kind = classifier.classify(path)
+        if kind is not None:
+            return _skipped_finding(
+                path, kind, _indexed_metadata(path, index, st, _skipped_fields(fields))
+            )
+
+    metadata = _indexed_metadata(
+        path, index, st, METADATA_FIELDS if fields is None else fields
+    )
+
+    if fields is not None:
+        metadata = LazyMetadata(path, metadata)
+    else:
+        metadata = FileMetadata(metadata)
+
+    return _file_finding(path, metadata, classifier)
+
+
+def _indexed_metadata(
+    path: str,
+    index: Optional[ScanIndex],
+    st: Optional[os.stat_result],
+    fields: Iterable[str],
+) -> Optional[Dict]:
+    """
+    The fields of a file, taken from the index where it has them; None if
+    none are wanted or known. Only the fields the index does not have yet
+    are read. An indexed file is always hashed, and its entry grows with
+    each read.
+    """
+    metadata = None
+
+    if index is not None:
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            st = None
+
+        if st is not None:
+            metadata = index.lookup(path, st)
+
+    wanted = set(fields)
+    if index is not None and st is not None:
+        wanted.add("sha256")
+    if metadata is not None:
+        wanted.difference_update(metadata)
+
+    if wanted:
+        computed = _read_file_metadata(path, wanted)
+        metadata = {**(metadata or {}), **computed}
+        # A failed read computes no hash and is not recorded
+        if index is not None and st is not None and metadata.get("sha256"):
+            index.record(path, st, metadata["sha256"], metadata)
+
+    return metadata
+
+
+def _file_finding(
+    path: str,
+    metadata: FileMetadata,
+    classifier: Optional[FileClassifier],
+    name: Optional[str] = None,
+) -> Finding:
+    """
+    The finding for a file whose path did not classify it; name is what
+    the classifier sees (the member name inside an archive).
+    """
+    # Never triggers a lazy read: an unread header leaves the signal alone
+    header = metadata["header"] if "header" in metadata else None
+
+    if classifier is not None and header:
+        kind = classifier.classify_head(name or path, header)
+        if kind is not None:
+            classifier.count(kind)
+            return _skipped_finding(path, kind, metadata)
 
     return Finding(
         id=path,
         type="file",
         path=path,
-        signal="ok",
-        metadata={"line_count": line_count},
+        signal="missing_metadata" if is_missing_header(path, header) else "ok",
+        metadata=metadata,
     )
 
 
-def scan_target(path: str) -> List[Finding]:
-    findings: List[Finding] = []
+def _skipped_fields(fields: Optional[AbstractSet[str]]) -> AbstractSet[str]:
+    """The SKIPPED_FILE_FIELDS among the fields a scan computes."""
+    return SKIPPED_FILE_FIELDS if fields is None else SKIPPED_FILE_FIELDS & fields
+
+
+def _skipped_finding(path: str, kind: str, metadata: Optional[Mapping] = None) -> Finding:
+    """
+    A generated or vendored file's finding. Of its metadata only the
+    SKIPPED_FILE_FIELDS are kept, so only policy_engine.SKIPPED_FILE_RULES
+    can flag it.
+    """
+    kept = {k: metadata[k] for k in SKIPPED_FILE_FIELDS if k in metadata} if metadata else None
+    return Finding(
+        id=path,
+        type=kind,
+        path=path,
+        signal="skipped",
+        metadata=FileMetadata(kept),
+    )
+
+
+def iter_scan_archive(
+    path: str,
+    fields: Optional[AbstractSet[str]] = None,
+    classifier: Optional[FileClassifier] = None,
+    index: Optional[ScanIndex] = None,
+    st: Optional[os.stat_result] = None,
+) -> Iterator[Finding]:
+    """
+    Findings for the members of a wheel, zip or tarball (see
+    archive_reader), streamed out of the archive without extracting it.
+    Paths read "archive!member". Members cannot be reopened, so their
+    metadata is computed up front and never lazily. An archive that
+    cannot be opened is scanned as a plain file; one that breaks part way
+    ends with the members read so far.
+
+    With an index, a fully read archive is recorded under its own path,
+    hash and the metadata of every member; while it is unchanged, and the
+    recorded members hold the wanted fields, the findings come from there
+    and the archive is not opened.
+    """
+    # A generated or vendored archive makes every member one
+    archive_kind = classifier.classify(path) if classifier is not None else None
+    wanted = _skipped_fields(fields)
+
+    if index is not None:
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            st = None
+    cached = index.lookup(path, st) if index is not None and st is not None else None
+    recorded = cached.get("members") if cached else None
+    if recorded is not None and _members_cover(recorded, fields, archive_kind, classifier):
+        for name, metadata in recorded:
+            kind = _member_kind(name, archive_kind, classifier)
+            yield _member_finding(path, name, kind, metadata, classifier)
+        return
+
+    members = iter_members(path)
+    read: List[List] = []
+    try:
+        for name, size, f in members:
+            kind = _member_kind(name, archive_kind, classifier)
+            if kind is not None:
+                metadata = _read_stream_metadata(f, size, wanted) if wanted else {}
+            else:
+                metadata = _read_stream_metadata(f, size, fields)
+            read.append([name, metadata])
+            yield _member_finding(path, name, kind, metadata, classifier)
+    except ARCHIVE_ERRORS:
+        if not read:
+            yield _scan_file(path, fields=fields)
+        return
+    finally:
+        members.close()
+
+    if index is not None and st is not None:
+        sha256 = _read_file_metadata(path, {"sha256"}).get("sha256")
+        if sha256:
+            index.record(path, st, sha256, {"sha256": sha256, "members": read})
+
+
+def _member_kind(
+    name: str,
+    archive_kind: Optional[str],
+    classifier: Optional[FileClassifier],
+) -> Optional[str]:
+    if archive_kind is None and classifier is not None:
+        return classifier.classify(name)
+    return archive_kind
+
+
+def _member_finding(
+    path: str,
+    name: str,
+    kind: Optional[str],
+    metadata: Dict,
+    classifier: Optional[FileClassifier],
+) -> Finding:
+    member = member_path(path, name)
+    if kind is not None:
+        return _skipped_finding(member, kind, metadata)
+    return _file_finding(member, FileMetadata(metadata), classifier, name)
+
 
+def _members_cover(
+    recorded: List[List],
+    fields: Optional[AbstractSet[str]],
+    archive_kind: Optional[str],
+    classifier: Optional[FileClassifier],
+) -> bool:
+    """Do the recorded members hold every field this scan wants of them?"""
+    full = set(METADATA_FIELDS if fields is None else fields)
+    skipped = _skipped_fields(fields)
+    for name, metadata in recorded:
+        by_path = archive_kind or (classifier.classify_path(name) if classifier else None)
+        if not (skipped if by_path else full) <= metadata.keys():
+            return False
+    return True
+
+
+def iter_scan_staged(
+    path: str,
+    fields: Optional[Iterable[str]] = None,
+    ignore: Optional[IgnoreMatcher] = None,
+    classify: bool = True,
+) -> Iterator[Finding]:
+    """
+    Scan the staged content of the files under path instead of the
+    working tree (see git_blobs): only files added or modified in the
+    index are scanned, and their blobs are read through one persistent
+    `git cat-file --batch`. Findings carry work tree paths, eager
+    metadata (for the named fields, all by default) and the blob's
+    "blob_oid", which content_hash() returns.
+    """
+    root = os.path.abspath(path)
+    top = git_toplevel(root if os.path.isdir(root) else os.path.dirname(root))
+    if top is None:
+        return
+
+    if fields is not None:
+        fields = frozenset(fields)
+    ignore = ignore or IgnoreMatcher.discover(root)
+    classifier = FileClassifier(top) if classify else None
+    prefix = root if root.endswith(os.sep) else root + os.sep
+
+    with CatFileBatch(top) as blobs:
+        for rel, oid in staged_blobs(top):
+            file_path = os.path.join(top, rel)
+            if not (file_path == root or file_path.startswith(prefix)):
+                continue
+            if ignore.is_excluded(file_path):
+                continue
+
+            data = blobs.read(oid)
+            if data is None:
+                continue
+            yield blob_finding(file_path, blob_metadata(oid, data, fields), classifier, rel)
+
+
+def blob_metadata(
+    oid: str,
+    data: bytes,
+    fields: Optional[AbstractSet[str]] = None,
+) -> FileMetadata:
+    """Metadata of a git blob's content, carrying its "blob_oid"."""
+    metadata = _read_stream_metadata(io.BytesIO(data), len(data), fields)
+    metadata["blob_oid"] = oid
+    return FileMetadata(metadata)
+
+
+def blob_finding(
+    path: str,
+    metadata: FileMetadata,
+    classifier: Optional[FileClassifier] = None,
+    name: Optional[str] = None,
+) -> Finding:
+    """
+    The finding for a blob at path, given its blob_metadata(), which can
+    be shared by every path holding the same blob. name is the path the
+    classifier sees, relative to its base. Generated and vendored blobs
+    are still read, for the rules that judge them anyway.
+    """
+    if classifier is not None:
+        kind = classifier.classify_path(name or path)
+        if kind is not None:
+            classifier.count(kind)
+            return _skipped_finding(path, kind, metadata)
+    return _file_finding(path, metadata, classifier, name)
+
+
+def _scan_path(
+    path: str,
+    index: Optional[ScanIndex],
+    st: Optional[os.stat_result] = None,
+    fields: Optional[AbstractSet[str]] = None,
+    classifier: Optional[FileClassifier] = None,
+) -> Iterable[Finding]:
+    """
+    A file's finding, or every member's finding for an archive, streamed
+    out of it as the caller iterates.
+    """
+    if is_archive(path):
+        return iter_scan_archive(path, fields, classifier, index, st)
+    return (_scan_file(path, index, st, fields, classifier),)
+
+
+def _scan_entry(
+    entry: os.DirEntry,
+    index: Optional[ScanIndex],
+    fields: Optional[AbstractSet[str]] = None,
+    classifier: Optional[FileClassifier] = None,
+) -> Iterable[Finding]:
+    st = None
+    if index is not None:
+        try:
+            st = entry.stat()
+        except OSError:
+            pass
+    return _scan_path(entry.path, index, st, fields, classifier)
+
+
+def iter_scan_target(
+    path: str,
+    index: Optional[ScanIndex] = None,
+    workers: Optional[int] = None,
+    ignore: Optional[IgnoreMatcher] = None,
+    fields: Optional[Iterable[str]] = None,
+    classify: bool = True,
+    base_branch: Optional[str] = None,
+) -> Iterator[Finding]:
+    """
+    Scan a target directory, yielding file Findings as they are produced.
+
+    Ignored directories (see ignore_rules) are pruned during the walk; by
+    default the matcher is discovered from the enclosing repository.
+    Per-file reads run on a bounded thread pool (workers=1 disables it),
+    so memory stays bounded regardless of tree size. Findings always come
+    out in the same sorted walk order.
+
+    fields names the metadata fields the active rules read (see
+    policy_engine.required_metadata_fields); the others are computed
+    lazily if something asks for them. None computes everything eagerly.
+
+    classify=True sorts out generated and vendored files (see
+    file_classifier) as findings of that type, reading them only for the
+    rules that judge them anyway; the policy engine counts them.
+
+    Wheels, zips and tarballs, whether the target itself or found in the
+    tree, are scanned as virtual directories (see iter_scan_archive).
+
+    When the checked-out branch changes files under path relative to its
+    merge-base with base_branch (see pr_diff), only those are scanned.
+    """
     if not path or not os.path.exists(path):
-        return findings
+        return
+
+    if fields is not None:
+        fields = frozenset(fields)
 
     root = os.path.abspath(path)
-    changed_files = _git_changed_files()
+
+    # ---- Archive target: stream its members ----
+    if os.path.isfile(root) and is_archive(root):
+        classifier = FileClassifier(os.path.dirname(root)) if classify else None
+        yield from iter_scan_archive(root, fields, classifier)
+        return
+
+    ignore = ignore or IgnoreMatcher.discover(root)
+    changed_files = _git_changed_files(root, base_branch)
+    classifier = FileClassifier(root) if classify else None
 
     # Determine whether PR-diff mode is actually relevant
-    relevant_changes = [
+    relevant_changes = sorted(
         f for f in changed_files
-        if f.startswith(root) and os.path.isfile(f)
-    ]
+        if f.startswith(root) and os.path.isfile(f) and not ignore.is_excluded(f)
+    )
 
     # ---- PR diff mode (only if relevant) ----
     if relevant_changes:
-        for file_path in relevant_changes:
-            findings.append(_scan_file(file_path))
-        return findings
+        for findings in bounded_map(
+            lambda f: _scan_path(f, index, fields=fields, classifier=classifier),
+            relevant_changes,
+            workers,
+        ):
+            yield from findings
+        return
 
     # ---- Full scan fallback ----
-    for dirpath, _, filenames in os.walk(root):
-        for name in filenames:
-            file_path = os.path.join(dirpath, name)
-            if os.path.isfile(file_path):
-                findings.append(_scan_file(file_path))
+    for findings in bounded_map(
+        lambda entry: _scan_entry(entry, index, fields, classifier),
+        iter_files(root, ignore),
+        workers,
+    ):
+        yield from findings
 
-    return findings
+    # Only reached when the walk ran to completion
+    if index is not None:
+        index.prune(root)
+
+
+def scan_target(
+    path: str,
+    index: Optional[ScanIndex] = None,
+    workers: Optional[int] = None,
+    ignore: Optional[IgnoreMatcher] = None,
+    fields: Optional[Iterable[str]] = None,
+    classify: bool = True,
+    base_branch: Optional[str] = None,
+) -> List[Finding]:
+    return list(
+        iter_scan_target(path, index, workers, ignore, fields, classify, base_branch)
+    )
@@ -0,0 +1,140 @@
+"""
+Secret Scan — hardcoded credential detection over raw file bytes.
+
+Every token signature has a short literal anchor (its prefix, or the
+keyword of a generic `api_key = "..."` assignment). A regex alternation
+or automaton in pure Python inspects every byte, which is far slower
+than the C substring search, so scanning works the other way round:
+each anchor is located with bytes.find over a lowercased window of the
+buffer, and the signature's full regex is only tried at those offsets.
+Generic assignments must also carry enough Shannon entropy to count.
+
+The buffer can be an mmap. It is never copied whole: windows of
+SCAN_WINDOW bytes are lowercased one at a time, and the regexes match
+against the buffer itself. Matches are reported as (signature, line)
+pairs, with 1-based line numbers.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+
+
+# Values of generic assignments below this many bits per byte are
+# treated as placeholders ("changeme", "xxxxxxxx", ...)
+MIN_ENTROPY = 3.5
+MIN_GENERIC_LENGTH = 12
+MAX_REPORTED = 20
+
+SCAN_WINDOW = 1 << 20
+
+
+class Signature(NamedTuple):
+    name: str
+    anchors: Tuple[bytes, ...]      # lowercase; the match starts at one
+    pattern: Pattern[bytes]
+    entropy_group: Optional[int] = None
+
+
+SIGNATURES: Tuple[Signature, ...] = (
+    Signature(
+        "aws_access_key",
+        (b"akia", b"asia"),
+        re.compile(rb"(?:AKIA|ASIA)[0-9A-Z]{16}(?![0-9A-Za-z])"),
+    ),
+    Signature(
+        "github_token",
+        (b"gh",),
+        re.compile(rb"gh[pousr]_[A-Za-z0-9_]{20,255}(?![0-9A-Za-z_])"),
+    ),
+    Signature(
+        "openai_key",
+        (b"sk-",),
+        re.compile(rb"sk-(?:proj-)?[A-Za-z0-9_-]{20,}"),
+    ),
+    Signature(
+        "slack_token",
+        (b"xox",),
+        re.compile(rb"xox[baprs]-[A-Za-z0-9-]{10,}"),
+    ),
+    Signature(
+        "stripe_key",
+        (b"sk_live_", b"rk_live_"),
+        re.compile(rb"[rs]k_live_[A-Za-z0-9]{20,}"),
+    ),
+    Signature(
+        "google_api_key",
+        (b"aiza",),
+        re.compile(rb"AIza[0-9A-Za-z_-]{35}"),
+    ),
+    Signature(
+        "private_key",
+        (b"-----begin",),
+        re.compile(rb"-----BEGIN [A-Z ]*PRIVATE KEY-----"),
+    ),
+    Signature(
+        "generic_secret",
+        (b"api", b"secret", b"token", b"passw"),
+        re.compile(
+            rb"(?i:api[_-]?key|secret|token|passw(?:or)?d)[A-Za-z0-9_]*[\"']?"
+            rb"[ \t]*[:=][ \t]*[\"']([^\"'\s]{%d,})[\"']" % MIN_GENERIC_LENGTH
+        ),
+        entropy_group=1,
+    ),
+)
+
+# Bytes that may not precede a token signature (its anchor would be mid-word)
+_WORD = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+
+
+def shannon_entropy(data: bytes) -> float:
+    """Bits per byte of data."""
+    if not data:
+        return 0.0
+    n = len(data)
+    return -sum(c / n * math.log2(c / n) for c in Counter(data).values())
+
+
+def _accepts(signature: Signature, match: "re.Match[bytes]") -> bool:
+    if signature.entropy_group is None:
+        return True
+    return shannon_entropy(match.group(signature.entropy_group)) >= MIN_ENTROPY
+
+
+# Windows overlap by this much, so an anchor across a boundary is found
+_OVERLAP = max(len(a) for s in SIGNATURES for a in s.anchors) - 1
+
+
+def find_secrets(buffer) -> List[Tuple[str, int]]:
+    """
+    Sorted, distinct (signature name, line number) pairs for the matches
+    in a bytes-like buffer, at most MAX_REPORTED of them.
+    """
+    found = set()
+    line = 1
+    for start in range(0, len(buffer), SCAN_WINDOW):
+        lowered = buffer[start:start + SCAN_WINDOW + _OVERLAP].lower()
+
+        hits = set()
+        for signature in SIGNATURES:
+            for anchor in signature.anchors:
+                # Only anchors starting in this window; the next one has the rest
+                end = SCAN_WINDOW + len(anchor) - 1
+                pos = lowered.find(anchor, 0, end)
+                while pos != -1:
+                    at = start + pos
+                    if at == 0 or buffer[at - 1] not in _WORD or signature.entropy_group:
+                        match = signature.pattern.match(buffer, at)
+                        if match and _accepts(signature, match):
+                            hits.add((pos, signature.name))
+                    pos = lowered.find(anchor, pos + 1, end)
+
+        scanned = 0
+        for pos, name in sorted(hits):
+            line += lowered.count(b"\n", scanned, pos)
+            scanned = pos
+            found.add((name, line))
+        line += lowered.count(b"\n", scanned, SCAN_WINDOW)
+
+    return sorted(found, key=lambda hit: (hit[1], hit[0]))[:MAX_REPORTED]
@@ -11,7 +11,7 @@ def test_gate_fails_on_forbidden_path():
 
         bad_file = os.path.join(secrets_dir, "config.py")
         with open(bad_file, "w") as f:
-            f.write("password = 'oops'\n")
+            f.write("# SPDX-License-Identifier: MIT\npassword = 'oops'\n")
 
         result = subprocess.run(
             [sys.executable, "claude_cli.py", tmp, "--gate"],
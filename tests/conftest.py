@@ -0,0 +1,33 @@
+import subprocess
+
+import pytest
+
+
+HEADER = "# SPDX-License-Identifier: MIT\n"
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def commit(repo, message, **files):
+    """Write the files, commit everything and return the new HEAD."""
+    for name, text in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """An empty git repository on branch main, with a committer identity."""
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    git(tmp_path, "init", "-q", "-b", "main")
+    return tmp_path
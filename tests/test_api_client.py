@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+import api_client
+from api_client import pool_limits, run_sync, shared_async_client, shared_client
+
+
+def test_pool_limits_from_environment(monkeypatch):
+    monkeypatch.setenv(api_client.MAX_CONNECTIONS_ENV, "8")
+    monkeypatch.setenv(api_client.MAX_KEEPALIVE_ENV, "4")
+
+    limits = pool_limits()
+
+    assert limits.max_connections == 8
+    assert limits.max_keepalive_connections == 4
+    assert limits.keepalive_expiry == api_client.DEFAULT_KEEPALIVE_EXPIRY
+
+
+def test_one_client_per_key():
+    assert shared_client("key-a") is shared_client("key-a")
+    assert shared_client("key-a") is not shared_client("key-b")
+
+
+def test_one_async_client_per_loop():
+    async def get():
+        return shared_async_client("key-a"), shared_async_client("key-a")
+
+    first, again = asyncio.run(get())
+    other, _ = asyncio.run(get())
+
+    assert first is again
+    assert first is not other
+
+
+def test_run_sync_shares_one_loop_across_threads():
+    async def client():
+        return shared_async_client("key-a")
+
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(run_sync(client())))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(clients) == 4
+    assert len({id(c) for c in clients}) == 1
@@ -0,0 +1,171 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+import profiles
+import scanner
+from file_classifier import VENDORED
+from policy_engine import apply_policy_engine
+from scan_index import ScanIndex
+
+
+HEADER = b"# SPDX-License-Identifier: MIT\n"
+
+MEMBERS = {
+    "pkg/__init__.py": HEADER + b"x = 1\n",
+    "pkg/secrets/config.py": HEADER + b"password = 'oops'\n",
+    "pkg/_vendor/six.py": b"x = 1\n",
+    "pkg-1.0.dist-info/METADATA": b"Name: pkg\n",
+}
+
+
+def _write_wheel(path):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("pkg/", b"")
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+
+
+def _write_sdist(path):
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture(autouse=True)
+def _no_git_diff(monkeypatch):
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+
+@pytest.mark.parametrize("name, write", [
+    ("pkg-1.0-py3-none-any.whl", _write_wheel),
+    ("pkg-1.0.tar.gz", _write_sdist),
+])
+def test_archive_members_are_scanned_in_place(tmp_path, name, write):
+    archive = tmp_path / name
+    write(archive)
+
+    findings = scanner.scan_target(str(archive))
+
+    assert [f.path for f in findings] == [f"{archive}!{m}" for m in MEMBERS]
+    assert [f.type for f in findings] == ["file", "file", VENDORED, "file"]
+    assert findings[0].metadata["line_count"] == 2
+    assert findings[0].metadata["size"] == len(MEMBERS["pkg/__init__.py"])
+    assert findings[0].signal == "ok"
+    # Nothing was extracted
+    assert [p.name for p in tmp_path.iterdir()] == [name]
+
+    result = apply_policy_engine(findings)
+
+    assert [j.finding_id for j in result["judgements"]] == [f"{archive}!pkg/secrets/config.py"]
+    assert result["policy_summary"].violations == 1
+    assert result["policy_summary"].skipped == {VENDORED: 1}
+
+
+def test_archives_in_a_tree_are_expanded(tmp_path):
+    (tmp_path / "dist").mkdir()
+    _write_wheel(tmp_path / "dist" / "pkg.whl")
+    (tmp_path / "setup.py").write_bytes(HEADER)
+
+    paths = [f.path for f in scanner.scan_target(str(tmp_path), workers=4)]
+
+    assert paths[0] == str(tmp_path / "setup.py")
+    assert paths[1:] == [f"{tmp_path / 'dist' / 'pkg.whl'}!{m}" for m in MEMBERS]
+
+
+def test_member_fields_are_limited(tmp_path):
+    archive = tmp_path / "pkg.whl"
+    _write_wheel(archive)
+
+    finding = scanner.scan_target(str(archive), fields={"header"})[0]
+
+    assert finding.metadata["header"] == MEMBERS["pkg/__init__.py"].decode()
+    assert finding.metadata.get("line_count") is None
+    assert "sha256" not in finding.metadata
+
+
+def test_unreadable_archive_is_scanned_as_a_file(tmp_path):
+    archive = tmp_path / "broken.zip"
+    archive.write_bytes(b"not a zip")
+
+    findings = scanner.scan_target(str(archive))
+
+    assert [f.path for f in findings] == [str(archive)]
+    assert findings[0].metadata["size"] == 9
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_top_level_members_are_under_the_archive(tmp_path, columnar):
+    archive = tmp_path / "pkg.whl"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("secrets/key.py", HEADER)
+        zf.writestr("ok.py", HEADER)
+
+    findings = scanner.scan_target(str(archive))
+    result = apply_policy_engine(findings, columnar=columnar)
+
+    assert [j.finding_id for j in result["judgements"]] == [f"{archive}!secrets/key.py"]
+    assert profiles.resolve_profile(f"{archive}!secrets/key.py").name == "strict"
+    assert profiles.resolve_profile(f"{tmp_path}/notes!secrets.py").name == "default"
+
+
+def test_archive_broken_part_way_keeps_what_was_read(tmp_path):
+    archive = tmp_path / "pkg.tar"
+    with tarfile.open(archive, "w") as tf:
+        for name, data in [("a.py", HEADER), ("b.py", HEADER * 2000)]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    data = archive.read_bytes()
+    archive.write_bytes(data[:len(data) // 2])
+
+    findings = scanner.scan_target(str(archive))
+
+    # The member cut short is still reported, but not the archive itself
+    assert [f.path for f in findings] == [f"{archive}!a.py", f"{archive}!b.py"]
+
+
+def test_archive_members_stream(tmp_path):
+    archive = tmp_path / "pkg.whl"
+    _write_wheel(archive)
+
+    findings = scanner._scan_path(str(archive), None)
+
+    assert iter(findings) is findings
+    assert next(findings).path == f"{archive}!pkg/__init__.py"
+    findings.close()
+
+
+@pytest.mark.parametrize("fields", [None, frozenset({"line_count", "secrets"})])
+def test_unchanged_archives_come_from_the_index(tmp_path, monkeypatch, fields):
+    archive = tmp_path / "dist" / "pkg-1.0-py3-none-any.whl"
+    archive.parent.mkdir()
+    _write_wheel(archive)
+    opened = []
+    iter_members = scanner.iter_members
+    monkeypatch.setattr(
+        scanner, "iter_members", lambda path: opened.append(path) or iter_members(path)
+    )
+
+    def scan(index, fields):
+        return scanner.scan_target(str(archive.parent), index=index, fields=fields)
+
+    cold = ScanIndex.load(tmp_path / "index.json")
+    first = scan(cold, fields)
+    cold.save()
+    warm = ScanIndex.load(tmp_path / "index.json")
+    second = scan(warm, fields)
+
+    assert opened == [str(archive)]
+    assert second == first
+    assert [f.type for f in second] == ["file", "file", VENDORED, "file"]
+    assert warm.recorded_hash(str(archive), archive.stat()) is not None
+
+    # A field the members were not recorded with reads them again
+    third = scan(warm, {"line_stats"})
+    assert len(opened) == (1 if fields is None else 2)
+    assert third[0].metadata["line_stats"]["max_line_length"] == len(HEADER) - 1
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+import claude_backend
+from claude_backend import AsyncClaudeBackend, ClaudeBackend
+
+
+class FakeMessages:
+    """Answers after a short await, failing the first `failures` calls."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("429 rate limit")
+            return SimpleNamespace(
+                usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+                content=[SimpleNamespace(text=" ok ")],
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def _backend(cls, messages, **kwargs):
+    backend = cls(**kwargs)
+    target = backend.backend if isinstance(backend, ClaudeBackend) else backend
+    target.available = True
+    target.client = SimpleNamespace(messages=messages)
+    return backend
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.setattr(claude_backend, "BACKOFF_SECONDS", [0.05, 0.05, 0.05])
+
+
+def test_concurrency_is_bounded():
+    messages = FakeMessages()
+    backend = _backend(AsyncClaudeBackend, messages, max_concurrency=4)
+
+    async def run():
+        return await asyncio.gather(*(backend.judge("s", "u") for _ in range(50)))
+
+    results = asyncio.run(run())
+
+    assert all(r["ok"] and r["text"] == "ok" for r in results)
+    assert results[0]["usage"]["total_tokens"] == 15
+    assert messages.calls == 50
+    assert messages.peak == 4
+
+
+def test_backend_is_reused_across_event_loops(monkeypatch):
+    monkeypatch.setattr(claude_backend, "MAX_RETRIES", 1)
+    messages = FakeMessages()
+    backend = _backend(AsyncClaudeBackend, messages, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(backend.judge("s", "u") for _ in range(5)))
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+
+    assert all(r["ok"] for r in first + second)
+    assert messages.calls == 10
+    assert messages.peak == 2
+
+
+def test_backoff_does_not_block_the_loop():
+    messages = FakeMessages(failures=1)
+    backend = _backend(AsyncClaudeBackend, messages)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(None)
+            await asyncio.sleep(0.005)
+
+    async def run():
+        result, _ = await asyncio.gather(backend.judge("s", "u"), ticker())
+        return result
+
+    result = asyncio.run(run())
+
+    assert result["ok"]
+    assert messages.calls == 2
+    assert len(ticks) == 5
+
+
+def test_non_retryable_errors_are_structured():
+    backend = AsyncClaudeBackend()
+    backend.available = False
+
+    result = asyncio.run(backend.judge("s", "u"))
+
+    assert result["ok"] is False
+    assert result["error_type"] == "no_api_key"
+
+
+def test_sync_wrapper():
+    messages = FakeMessages(failures=1)
+    backend = _backend(ClaudeBackend, messages, model="m")
+
+    first = backend.judge("s", "u")
+    second = backend.judge("s", "u")
+
+    assert first["ok"] and second["ok"]
+    assert backend.model == "m"
+    assert backend.last_usage["total_tokens"] == 15
@@ -0,0 +1,105 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import commit_audit
+import git_blobs
+import profiles
+from commit_audit import audit_commits
+from conftest import HEADER, commit, git
+from git_blobs import list_commits
+
+
+def test_list_commits(repo):
+    first = commit(repo, "one", **{"a.py": HEADER})
+    git(repo, "tag", "v1")
+    second = commit(repo, "two", **{"b.py": HEADER})
+    third = commit(repo, "three", **{"c.py": HEADER})
+
+    assert list_commits(str(repo), last=2) == [third, second]
+    assert list_commits(str(repo), rev_range=f"{first}..HEAD") == [third, second]
+    assert list_commits(str(repo), tags=True) == [first]
+
+
+def test_results_map_back_to_every_commit(repo):
+    first = commit(repo, "one", **{
+        "secrets/key.py": HEADER,
+        "big.py": HEADER + "x = 1\n" * 600,
+        "vendor/lib.py": "password = 'Zq8!vR2#pL9@wX4m'\n" + "x = 1\n" * 600,
+    })
+    second = commit(repo, "two", **{"ok.py": HEADER})
+    third = commit(repo, "three", **{"big.py": HEADER})
+
+    result = audit_commits(list_commits(str(repo)), repo=str(repo))
+    found = {(e.path, j.rule_id): e.commits for e in result.entries for j in e.judgements}
+
+    assert found == {
+        ("secrets/key.py", "FORBIDDEN_PATH"): [third, second, first],
+        ("big.py", "FILE_TOO_LARGE"): [second, first],
+        # Vendored: the secret still counts, the size does not
+        ("vendor/lib.py", "HARDCODED_SECRET"): [third, second, first],
+    }
+    assert result.occurrences("fail") == 6
+    assert result.occurrences("warn") == 2
+    assert result.skipped == {"vendored": 1}
+
+
+def test_each_distinct_blob_is_read_once(repo, monkeypatch):
+    for i in range(5):
+        commit(repo, f"c{i}", **{"same.py": HEADER, "copy.py": HEADER, f"f{i}.py": HEADER + f"{i}\n"})
+
+    reads = []
+    read = git_blobs.CatFileBatch.read
+    monkeypatch.setattr(
+        git_blobs.CatFileBatch, "read", lambda self, oid: reads.append(oid) or read(self, oid)
+    )
+
+    result = audit_commits(list_commits(str(repo)), repo=str(repo))
+
+    # HEADER (shared by same.py, copy.py) plus one blob per f{i}.py
+    assert len(reads) == len(set(reads)) == result.blobs_read == 6
+    assert result.pairs_judged == 2 + 5
+
+
+def test_evicted_blobs_are_read_again(repo, monkeypatch):
+    monkeypatch.setattr(commit_audit, "MAX_MEMO_BLOBS", 1)
+    commit(repo, "one", **{"a.py": HEADER})
+    commit(repo, "two", **{"b.py": HEADER + "x = 1\n"})
+    commit(repo, "three", **{"c.py": HEADER})
+
+    result = audit_commits(list_commits(str(repo)), repo=str(repo))
+
+    # HEADER is evicted by b.py's blob before c.py needs it again
+    assert result.blobs_read == 3
+    assert result.pairs_judged == 3
+
+
+def test_warnings_fail_strict_profiles(repo, monkeypatch):
+    commit(repo, "one", **{"src/big.py": HEADER + "x = 1\n" * 600})
+    commits = list_commits(str(repo))
+
+    lenient = audit_commits(commits, repo=str(repo)).to_dict()
+    assert (lenient["audit_pass"], lenient["violations"], lenient["warnings"]) == (True, 0, 1)
+
+    monkeypatch.setattr(profiles, "OWNERSHIP_RULES", (("/src", "strict"),))
+    strict = audit_commits(commits, repo=str(repo)).to_dict()
+    assert (strict["audit_pass"], strict["violations"], strict["warnings"]) == (False, 1, 1)
+
+
+def test_audit_cli(repo):
+    commit(repo, "one", **{"secrets/key.py": HEADER})
+    commit(repo, "two", **{"ok.py": HEADER})
+
+    result = subprocess.run(
+        [sys.executable, "claude_cli.py", str(repo), "--audit", "HEAD"],
+        capture_output=True,
+        text=True,
+    )
+    output = json.loads(result.stdout)
+
+    assert result.returncode == 1
+    assert output["commits"] == 2
+    assert output["violations"] == 2
+    assert [r["rule_id"] for r in output["results"]] == ["FORBIDDEN_PATH"]
@@ -0,0 +1,118 @@
+import pytest
+
+import scanner
+from file_classifier import GENERATED, VENDORED, FileClassifier
+from policy_engine import POLICY_RULES, apply_policy_engine, required_metadata_fields
+
+
+HEADER = "# SPDX-License-Identifier: MIT\n"
+TOKEN = "ghp_" + "aB3dE5fG7hJ9kL1mN3pQ5rS7tU9vW1xY3zA5"
+
+
+@pytest.mark.parametrize("path, kind", [
+    ("api/service_pb2.py", GENERATED),
+    ("api/service_pb2_grpc.py", GENERATED),
+    ("app/migrations/0001_initial.py", GENERATED),
+    ("static/app.min.js", GENERATED),
+    ("vendor/requests/api.py", VENDORED),
+    ("pkg/_vendor/six.py", VENDORED),
+    ("web/node_modules/left-pad/index.js", VENDORED),
+    ("app/migrations/helpers.py", None),
+    ("src/vendors.py", None),
+    ("src/main.py", None),
+])
+def test_classify_path(tmp_path, path, kind):
+    assert FileClassifier(str(tmp_path)).classify_path(path) == kind
+
+
+@pytest.mark.parametrize("path, head, kind", [
+    ("schema.py", "# Generated by the protocol buffer compiler.  DO NOT EDIT!\n", GENERATED),
+    ("api.go", "// Code generated by mockgen. DO NOT EDIT.\npackage api\n", GENERATED),
+    ("models.py", '"""\n@generated by sqlacodegen\n"""\n', GENERATED),
+    ("bundle.js", "var a=1;" * 100, GENERATED),
+    ("data.json", "[1," * 300, None),                  # long lines are fine outside js/css
+    ("main.py", "# SPDX-License-Identifier: MIT\n" + "\n" * 10 + "# do not edit\n", None),
+    ("main.py", "", None),
+])
+def test_classify_head(path, head, kind):
+    assert FileClassifier.classify_head(path, head) == kind
+
+
+def test_path_match_never_reads_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("file_classifier.sniff_head", lambda path: pytest.fail(path))
+    classifier = FileClassifier(str(tmp_path))
+
+    assert classifier.classify_file("vendor/lib.py") == VENDORED
+    assert classifier.skipped == {VENDORED: 1}
+
+
+def test_scan_skips_generated_and_vendored(tmp_path, monkeypatch):
+    header = "# SPDX-License-Identifier: MIT\n"
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "lib.py").write_text(header + "x = 1\n" * 1000)
+    (tmp_path / "api_pb2.py").write_text("# Generated by protoc. DO NOT EDIT!\n")
+    (tmp_path / "models.py").write_text("# @generated\nx = 1\n")
+    (tmp_path / "main.py").write_text(header + "x = 1\n")
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+    findings = scanner.scan_target(
+        str(tmp_path), fields=required_metadata_fields(POLICY_RULES)
+    )
+    by_name = {f.path.rsplit("/", 1)[-1]: f for f in findings}
+
+    assert by_name["lib.py"].type == VENDORED
+    assert by_name["api_pb2.py"].type == GENERATED
+    assert by_name["models.py"].type == GENERATED
+    assert by_name["main.py"].type == "file"
+    assert by_name["lib.py"].signal == "skipped"
+
+    result = apply_policy_engine(findings)
+    summary = result["policy_summary"]
+
+    assert result["judgements"] == []
+    assert summary.skipped == {VENDORED: 1, GENERATED: 2}
+    assert summary.violations == summary.warnings == 0
+
+
+def test_scan_without_classification(tmp_path, monkeypatch):
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "lib.py").write_text("x = 1\n")
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+    findings = scanner.scan_target(str(tmp_path), classify=False)
+
+    assert [f.type for f in findings] == ["file"]
+
+
+@pytest.mark.parametrize("path, text, rule_id", [
+    ("secrets/creds.py", "# DO NOT EDIT\nx = 1\n", "FORBIDDEN_PATH"),
+    ("src/app.py", f"# generated by hand\ntoken = '{TOKEN}'\n", "HARDCODED_SECRET"),
+    ("vendor/x.py", f"token = '{TOKEN}'\n", "HARDCODED_SECRET"),
+])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_classification_never_hides_paths_or_secrets(tmp_path, monkeypatch, path, text, rule_id, columnar):
+    target = tmp_path / path
+    target.parent.mkdir(parents=True)
+    target.write_text(text)
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+    findings = scanner.scan_target(
+        str(tmp_path), fields=required_metadata_fields(POLICY_RULES)
+    )
+    assert [f.type for f in findings] != ["file"]
+
+    result = apply_policy_engine(findings, columnar=columnar)
+
+    assert [j.rule_id for j in result["judgements"]] == [rule_id]
+    assert result["policy_summary"].violations == 1
+
+
+def test_skipped_files_keep_only_their_secrets(tmp_path, monkeypatch):
+    (tmp_path / "vendor").mkdir()
+    (tmp_path / "vendor" / "x.py").write_text(f"token = '{TOKEN}'\n")
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+    (finding,) = scanner.scan_target(str(tmp_path))
+
+    assert finding.type == VENDORED
+    assert list(finding.metadata) == ["secrets"]
@@ -0,0 +1,50 @@
+import json
+import pickle
+
+import pytest
+
+import scanner
+from file_metadata import FileMetadata
+from policy_engine import Finding, PolicyJudgement
+from repair_types import RepairPlan
+
+
+def test_behaves_like_a_read_only_mapping():
+    metadata = FileMetadata({"line_count": 3, "sha256": "ab", "custom": [1]})
+
+    assert metadata["line_count"] == 3
+    assert metadata.get("size") is None
+    assert "size" not in metadata
+    assert "custom" in metadata
+    assert dict(metadata) == {"line_count": 3, "sha256": "ab", "custom": [1]}
+    assert metadata == {"line_count": 3, "sha256": "ab", "custom": [1]}
+    with pytest.raises(KeyError):
+        metadata["missing"]
+    with pytest.raises(TypeError):
+        metadata["line_count"] = 4
+
+
+def test_enumerated_values_from_json_are_interned():
+    a, b = (FileMetadata(json.loads('{"encoding": "utf-8"}')) for _ in range(2))
+
+    assert a["encoding"] is b["encoding"]
+
+
+@pytest.mark.parametrize("metadata", [
+    FileMetadata({"line_count": 1, "extra": "x"}),
+    scanner.LazyMetadata("/nonexistent", {"line_count": 1}),
+])
+def test_pickles_without_computing_missing_fields(metadata):
+    restored = pickle.loads(pickle.dumps(metadata))
+
+    assert type(restored) is type(metadata)
+    assert restored.computed() == metadata.computed()
+
+
+def test_data_contracts_have_no_instance_dict():
+    finding = Finding(id="a", type="file", path="a", signal="ok", metadata=FileMetadata())
+    judgement = PolicyJudgement("a", "R", "warn", 0.5, "reason")
+    plan = RepairPlan("R", "a", "noop")
+
+    for obj in (finding, judgement, plan):
+        assert not hasattr(obj, "__dict__")
@@ -0,0 +1,134 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import claude_cli
+import gate_memo
+import scanner
+from conftest import HEADER, commit, git
+from gate_memo import GateMemo, gate_fingerprint, git_tree_oid, index_merkle
+from policy_engine import POLICY_RULES
+from scan_index import ScanIndex
+
+
+CLI = Path(__file__).resolve().parent.parent / "claude_cli.py"
+
+
+@pytest.fixture
+def repo(repo):
+    commit(repo, "one", **{"src/main.py": HEADER})
+    return repo
+
+
+def test_memo_round_trip_and_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(gate_memo, "MAX_ENTRIES", 2)
+    memo = GateMemo(tmp_path / "memo.json")
+    for i in range(3):
+        memo.store(f"fp{i}", {"gate_pass": True, "n": i})
+    memo.save()
+
+    loaded = GateMemo.load(tmp_path / "memo.json")
+
+    assert loaded.lookup("fp0") is None
+    assert loaded.lookup("fp2") == {"gate_pass": True, "n": 2}
+    assert (loaded.hits, loaded.misses) == (1, 1)
+
+
+def test_fingerprint_covers_settings():
+    assert gate_fingerprint("git:abc", rules="r1") == gate_fingerprint("git:abc", rules="r1")
+    assert gate_fingerprint("git:abc", rules="r1") != gate_fingerprint("git:abc", rules="r2")
+    assert gate_fingerprint("git:abc") != gate_fingerprint("git:abd")
+
+
+def test_git_tree_oid_needs_a_clean_tree(repo):
+    tree = git_tree_oid(str(repo))
+    assert tree == f"git:{git(repo, 'rev-parse', 'HEAD^{tree}')}"
+    assert git_tree_oid(str(repo / "src")) == f"git:{git(repo, 'rev-parse', 'HEAD:src')}"
+
+    # Gatekeeper's own state does not count
+    (repo / ".gatekeeper").mkdir()
+    (repo / ".gatekeeper" / "gate_memo.json").write_text("{}")
+    assert git_tree_oid(str(repo)) == tree
+
+    (repo / "src" / "new.py").write_text(HEADER)
+    assert git_tree_oid(str(repo)) is None
+    assert git_tree_oid(str(repo / "src")) is None
+
+
+def test_git_tree_oid_sees_files_only_git_ignores(repo):
+    (repo / "src" / ".gitignore").write_text("*.log\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "nested ignore")
+    assert git_tree_oid(str(repo)) is not None
+
+    # Ignored by git through src/.gitignore, but scanned
+    (repo / "src" / "debug.log").write_text("x\n")
+    assert git_tree_oid(str(repo)) is None
+    assert git_tree_oid(str(repo / "src")) is None
+
+    # Ignored by both
+    (repo / "src" / "debug.log").unlink()
+    (repo / ".gitignore").write_text("build/\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "root ignore")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.py").write_text(HEADER)
+    assert git_tree_oid(str(repo)) == f"git:{git(repo, 'rev-parse', 'HEAD^{tree}')}"
+
+
+def test_index_merkle(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+    (tmp_path / "a.py").write_text(HEADER)
+    index = ScanIndex(tmp_path / "index.json")
+
+    assert index_merkle(str(tmp_path), index) is None
+
+    scanner.scan_target(str(tmp_path), index=index)
+    first = index_merkle(str(tmp_path), index)
+    assert first is not None
+    assert index_merkle(str(tmp_path), index) == first
+
+    (tmp_path / "a.py").write_text(HEADER + "x = 1\n")
+    assert index_merkle(str(tmp_path), index) is None
+
+
+def _gate(repo, *args):
+    # Run from the repository, so the memo lands in its .gatekeeper/
+    result = subprocess.run(
+        [sys.executable, str(CLI), ".", "--gate", "--memo", *args],
+        capture_output=True,
+        text=True,
+        cwd=repo,
+    )
+    return result.returncode, json.loads(result.stdout)
+
+
+def test_identical_tree_returns_the_stored_result(repo):
+    code, first = _gate(repo)
+    assert code == 0
+    assert first["memoized"] is False
+
+    code, second = _gate(repo)
+    assert code == 0
+    assert second["memoized"] is True
+    assert {**second, "memoized": False} == first
+
+    # Other options are another fingerprint
+    assert _gate(repo, "--rule-set", "paths")[1]["memoized"] is False
+
+    (repo / "src" / "main.py").write_text("no header\n")
+    assert _gate(repo)[1]["memoized"] is False
+    assert (repo / ".gatekeeper" / "gate_memo.json").exists()
+
+
+def test_release_is_part_of_the_fingerprint(repo, monkeypatch):
+    def fingerprint():
+        return claude_cli._gate_fingerprint(str(repo), POLICY_RULES, None, None)
+
+    current = fingerprint()
+    assert current is not None
+    monkeypatch.setattr(claude_cli, "__version__", "0.0.0")
+    assert fingerprint() != current
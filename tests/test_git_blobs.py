@@ -0,0 +1,72 @@
+import subprocess
+import sys
+
+import pytest
+
+import scanner
+from conftest import HEADER, git
+from git_blobs import CatFileBatch, staged_blobs
+from policy_engine import apply_policy_engine
+
+
+def test_staged_blobs_lists_index_changes(repo):
+    (repo / "a.py").write_text(HEADER)
+    (repo / "b.py").write_text(HEADER)
+    git(repo, "add", "a.py")
+
+    assert staged_blobs(str(repo)) == [("a.py", git(repo, "rev-parse", ":a.py"))]
+
+
+def test_staged_blobs_outside_a_repository(tmp_path):
+    assert staged_blobs(str(tmp_path / "missing")) == []
+
+
+def test_cat_file_batch_reuses_one_process(repo):
+    (repo / "a.py").write_bytes(b"a\n")
+    (repo / "b.py").write_bytes(b"\0binary\n")
+    git(repo, "add", ".")
+    oids = dict(staged_blobs(str(repo)))
+
+    with CatFileBatch(str(repo)) as blobs:
+        pid = blobs._proc.pid
+        assert blobs.read(oids["a.py"]) == b"a\n"
+        assert blobs.read(oids["b.py"]) == b"\0binary\n"
+        assert blobs.read("0" * 40) is None
+        assert blobs.read(oids["a.py"]) == b"a\n"
+        assert blobs._proc.pid == pid
+
+
+def test_staged_content_is_scanned_not_the_work_tree(repo):
+    (repo / "secrets").mkdir()
+    (repo / "secrets" / "key.py").write_text(HEADER)
+    (repo / "main.py").write_text(HEADER + "x = 1\n")
+    (repo / "untracked.py").write_text("x = 1\n")
+    git(repo, "add", "secrets/key.py", "main.py")
+    # Unstaged edits are not what gets committed
+    (repo / "main.py").write_text("x = 1\n" * 1000)
+
+    findings = list(scanner.iter_scan_staged(str(repo)))
+
+    assert [f.path for f in findings] == [str(repo / "main.py"), str(repo / "secrets" / "key.py")]
+    main = findings[0]
+    assert main.metadata["line_count"] == 2
+    assert main.signal == "ok"
+    assert scanner.content_hash(main) == git(repo, "rev-parse", ":main.py")
+
+    result = apply_policy_engine(findings)
+    assert [j.rule_id for j in result["judgements"]] == ["FORBIDDEN_PATH"]
+
+
+def test_gate_staged(repo):
+    (repo / "main.py").write_text(HEADER)
+    git(repo, "add", "main.py")
+    (repo / "main.py").write_text("no header\n")
+
+    result = subprocess.run(
+        [sys.executable, "claude_cli.py", str(repo), "--gate", "--staged"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert '"warnings": 0' in result.stdout
@@ -0,0 +1,75 @@
+import os
+
+import scanner
+import tree_walker
+from ignore_rules import IgnoreMatcher
+from scanner import scan_target
+from tree_walker import glob_files
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("x\n")
+
+
+def test_gitignore_semantics(tmp_path):
+    m = IgnoreMatcher(
+        ["*.log", "build/", "/top.txt", "docs/**/tmp", "!keep.log"],
+        base=str(tmp_path),
+    )
+
+    assert m.match("a/b/debug.log", False)
+    assert not m.match("a/keep.log", False)
+    assert m.match("pkg/build", True)
+    assert not m.match("pkg/build", False)
+    assert m.match("top.txt", False)
+    assert not m.match("sub/top.txt", False)
+    assert m.match("docs/tmp", True)
+    assert m.match("docs/x/y/tmp", False)
+    assert m.match(".git", True)
+    assert m.match(".gatekeeper", True)
+    assert m.is_excluded(str(tmp_path / "pkg" / "build" / "out.py"))
+
+
+def test_ignored_directories_are_never_opened(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+    (tmp_path / ".gatekeeperignore").write_text("node_modules/\n.cache/\n")
+    (tmp_path / ".gitignore").write_text("*.pyc\n")
+    touch(str(tmp_path / "src" / "a.py"))
+    touch(str(tmp_path / "src" / "a.pyc"))
+    touch(str(tmp_path / "web" / "node_modules" / "dep" / "index.js"))
+    touch(str(tmp_path / ".cache" / "x.json"))
+    touch(str(tmp_path / ".git" / "HEAD"))
+    touch(str(tmp_path / ".gatekeeper" / "scan_index.json"))
+
+    opened = []
+    real_scandir = os.scandir
+
+    def spy(path):
+        opened.append(os.path.relpath(path, tmp_path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(tree_walker.os, "scandir", spy)
+
+    findings = scan_target(str(tmp_path), workers=1)
+    rels = sorted(os.path.relpath(f.path, tmp_path) for f in findings)
+
+    assert rels == [".gatekeeperignore", ".gitignore", "src/a.py"]
+    assert not any(
+        "node_modules" in p or ".cache" in p or p in (".git", ".gatekeeper") for p in opened
+    )
+
+
+def test_glob_files_matches_pathlib_and_prunes(tmp_path):
+    touch(str(tmp_path / "a.py"))
+    touch(str(tmp_path / "pkg" / "b.py"))
+    touch(str(tmp_path / "pkg" / "deep" / "c.py"))
+    touch(str(tmp_path / "node_modules" / "d.py"))
+
+    ignore = IgnoreMatcher(["node_modules/"], base=str(tmp_path))
+
+    assert glob_files(["**/*.py"], base=str(tmp_path), ignore=ignore) == [
+        "a.py", "pkg/b.py", "pkg/deep/c.py",
+    ]
+    assert glob_files(["pkg/*.py", "a.py"], base=str(tmp_path)) == ["a.py", "pkg/b.py"]
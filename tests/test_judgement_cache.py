@@ -0,0 +1,137 @@
+import pytest
+
+import line_stats
+import policy_engine
+import profiles
+import secret_scan
+from judgement_cache import JudgementCache
+from policy_engine import Finding, apply_policy_engine
+
+
+def make_findings(n, sha="0"):
+    return [
+        Finding(
+            id=f"{'secrets' if i % 4 == 0 else 'src'}/f{i}.py",
+            type="file",
+            path=f"{'secrets' if i % 4 == 0 else 'src'}/f{i}.py",
+            signal="ok",
+            metadata={"line_count": 600 if i % 3 == 0 else 10, "sha256": f"{sha}{i}"},
+        )
+        for i in range(n)
+    ]
+
+
+def counting_rules():
+    calls = []
+
+    def rule(finding):
+        calls.append(finding.path)
+        return policy_engine.rule_file_too_large(finding)
+
+    rules = [policy_engine.rule_forbidden_path, rule]
+    return rules, calls
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}, {"workers": 2}])
+def test_warm_run_matches_cold_run(tmp_path, options):
+    findings = make_findings(50)
+    expected = apply_policy_engine(findings, **options)
+
+    cache = JudgementCache.load(tmp_path / "cache.json")
+    cold = apply_policy_engine(findings, cache=cache, **options)
+    cache.save()
+
+    warm_cache = JudgementCache.load(tmp_path / "cache.json")
+    warm = apply_policy_engine(findings, cache=warm_cache, **options)
+
+    assert cold == expected
+    assert warm == expected
+    assert warm_cache.hits == 50
+    assert warm_cache.misses == 0
+
+
+@pytest.mark.parametrize("options", [{}, {"columnar": True}])
+@pytest.mark.parametrize("warm", [False, True])
+def test_fail_fast_streams_over_the_cache(tmp_path, options, warm):
+    # src/f1.py is clean, secrets/f0.py and secrets/f4.py fail
+    findings = make_findings(1001)[1:]
+    cache = JudgementCache(tmp_path / "cache.json")
+    if warm:
+        apply_policy_engine(findings, cache=cache, **options)
+
+    read = []
+
+    def stream():
+        for finding in findings:
+            read.append(finding)
+            yield finding
+
+    result = apply_policy_engine(stream(), cache=cache, fail_fast=True, **options)
+
+    assert result["policy_summary"].truncated
+    assert result["judgements"][-1].finding_id == "secrets/f4.py"
+    if warm or not options:
+        assert len(read) == 4
+
+
+def test_only_changed_files_are_evaluated(tmp_path):
+    rules, calls = counting_rules()
+    findings = make_findings(10)
+
+    cache = JudgementCache(tmp_path / "cache.json")
+    apply_policy_engine(findings, rules=rules, cache=cache)
+    calls.clear()
+
+    changed = list(findings)
+    changed[3] = make_findings(10, sha="new")[3]
+    result = apply_policy_engine(changed, rules=rules, cache=cache)
+
+    assert calls == [changed[3].path]
+    assert result == apply_policy_engine(changed, rules=rules)
+
+
+def test_findings_without_hash_are_always_evaluated(tmp_path):
+    finding = Finding(
+        id="src/big.py", type="file", path="src/big.py", signal="ok",
+        metadata={"line_count": 600},
+    )
+    cache = JudgementCache(tmp_path / "cache.json")
+
+    apply_policy_engine([finding], cache=cache)
+    result = apply_policy_engine([finding], cache=cache)
+
+    assert cache.hits == 0
+    assert cache.entries == {}
+    assert [j.rule_id for j in result["judgements"]] == ["FILE_TOO_LARGE"]
+
+
+@pytest.mark.parametrize("module, name, value", [
+    (policy_engine, "FORBIDDEN_PATHS", ("vendor",)),
+    (policy_engine, "MAX_LINE_COUNT", 5),
+    (profiles, "OWNERSHIP_RULES", (("/src", "strict"),)),
+    (secret_scan, "MIN_ENTROPY", 2.0),
+    (secret_scan, "SIGNATURES", secret_scan.SIGNATURES[:-1]),
+    (line_stats, "LINE_STATS_KEYS", ("max_line_length",)),
+])
+def test_settings_change_invalidates_cache(tmp_path, monkeypatch, module, name, value):
+    findings = make_findings(8)
+    cache = JudgementCache(tmp_path / "cache.json")
+    apply_policy_engine(findings, cache=cache)
+
+    monkeypatch.setattr(module, name, value)
+    hits = cache.hits
+    result = apply_policy_engine(findings, cache=cache)
+
+    assert cache.hits == hits
+    assert result == apply_policy_engine(findings)
+
+
+def test_rule_set_change_invalidates_cache(tmp_path):
+    findings = make_findings(8)
+    cache = JudgementCache(tmp_path / "cache.json")
+    apply_policy_engine(findings, cache=cache)
+
+    result = apply_policy_engine(findings, rules=policy_engine.RULE_SETS["paths"], cache=cache)
+
+    assert cache.hits == 0
+    assert result == apply_policy_engine(findings, rules=policy_engine.RULE_SETS["paths"])
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import line_stats
+import scanner
+from policy_engine import RULE_SETS, apply_policy_engine
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"", (0, 0, 0, 0)),
+    (b"\n", (0, 0, 0, 0)),
+    (b"short\n" + b"x" * 130 + b"\n", (130, 0, 0, 0)),
+    (b"a \nb\t\nc\n", (2, 2, 0, 0)),
+    (b"\tindented\n  spaces\n", (9, 0, 1, 0)),
+    (b"a\r\nb\r\nlast\r", (5, 0, 0, 2)),
+    (b"\r\n \r\n", (1, 1, 0, 2)),
+])
+def test_line_stats(data, expected):
+    assert tuple(line_stats.line_stats(data)[key] for key in line_stats.LINE_STATS_KEYS) == expected
+
+
+def test_numpy_and_python_paths_agree():
+    if line_stats.np is None:
+        pytest.skip("numpy not installed")
+
+    rng = random.Random(3)
+    for _ in range(500):
+        data = bytes(rng.choice(b"a \t\r\n") for _ in range(rng.randrange(1, 40)))
+        assert line_stats._line_stats_numpy(data) == line_stats._line_stats_python(data)
+
+
+def test_scanner_maps_text_files_only(tmp_path):
+    text = tmp_path / "a.py"
+    text.write_bytes(b"x = 1 \r\n\ty = 2\r\n")
+    blob = tmp_path / "b.bin"
+    blob.write_bytes(b"\x00 \r\n")
+
+    assert scanner._read_file_metadata(str(text))["line_stats"] == {
+        "max_line_length": 6, "trailing_whitespace": 1, "tab_indented": 1, "crlf": 2,
+    }
+    assert scanner._read_file_metadata(str(blob))["line_stats"] is None
+    assert "line_stats" not in scanner._read_file_metadata(str(text), {"line_count"})
+
+
+def test_content_rule_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+    (tmp_path / "clean.py").write_text("# SPDX-License-Identifier: MIT\nx = 1\n")
+    (tmp_path / "messy.py").write_bytes(b"# License: MIT\nx = 1 \r\n\ty = '" + b"z" * 200 + b"'\r\n")
+
+    rules = RULE_SETS["content"]
+    result = apply_policy_engine(scanner.scan_target(str(tmp_path), fields={"line_stats"}), rules=rules)
+
+    assert [(j.finding_id.rsplit("/", 1)[-1], j.rule_id) for j in result["judgements"]] == [
+        ("messy.py", "LINE_TOO_LONG"),
+        ("messy.py", "TRAILING_WHITESPACE"),
+        ("messy.py", "TAB_INDENTATION"),
+        ("messy.py", "CRLF_LINE_ENDINGS"),
+    ]
+    assert result["policy_summary"].checked_rules == 8
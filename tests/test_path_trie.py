@@ -0,0 +1,79 @@
+import itertools
+import os
+
+import profiles
+from path_trie import PathTrie
+from policy_engine import FORBIDDEN_PATHS, _is_forbidden
+
+
+COMPONENTS = ["", ".", "..", "a", "src", "secrets", "private", ".env", "x.py"]
+
+
+def all_paths(max_depth=4):
+    for depth in range(max_depth + 1):
+        for comps in itertools.product(COMPONENTS, repeat=depth):
+            yield "/".join(comps)
+
+
+def substring_profile(path):
+    for prefix, name in profiles.OWNERSHIP_RULES:
+        if f"/{prefix.strip('/')}/" in f"/{path}/":
+            return name
+    return "default"
+
+
+def substring_forbidden(path):
+    norm = "/".join(os.path.normpath(path).split(os.sep))
+    return any(f"/{p}/" in f"/{norm}/" for p in FORBIDDEN_PATHS)
+
+
+def test_profile_resolution_matches_substring_semantics():
+    for path in all_paths():
+        assert profiles.resolve_profile(path).name == substring_profile(path), path
+
+
+def test_forbidden_paths_match_substring_semantics():
+    for path in all_paths():
+        assert _is_forbidden(path) == substring_forbidden(path), path
+
+
+def test_earliest_pattern_wins_across_components():
+    trie = PathTrie([("a/b", "first"), ("b", "second"), ("c", "third")])
+
+    assert trie.lookup("x/a/b/c") == "first"
+    assert trie.lookup("x/a/c") == "third"
+    assert trie.lookup("a/b") == "first"
+    assert trie.lookup("a/x") is None
+
+
+def test_directory_walk_is_memoized(monkeypatch):
+    trie = PathTrie([("secrets", True)], normalize=True)
+    calls = []
+    real = trie._walk
+    monkeypatch.setattr(trie, "_walk", lambda comps: calls.append(1) or real(comps))
+
+    for i in range(100):
+        assert trie.matches(f"/repo/secrets/f{i}.py")
+
+    assert len(calls) == 1
+
+
+def test_rebinding_rules_recompiles(monkeypatch):
+    monkeypatch.setattr(profiles, "OWNERSHIP_RULES", (("/vendor", "lenient"),))
+
+    assert profiles.resolve_profile("/vendor/lib.py").name == "lenient"
+    assert profiles.resolve_profile("/secrets/x.py").name == "default"
+
+
+def test_match_mask_agrees_with_matches():
+    trie = PathTrie([(p, True) for p in FORBIDDEN_PATHS], normalize=True)
+    paths = sorted(all_paths(3))
+
+    assert trie.match_mask(paths) == [trie.matches(p) for p in paths]
+
+
+def test_match_mask_top_level_files():
+    trie = PathTrie([(p, True) for p in FORBIDDEN_PATHS], normalize=True)
+    paths = ["main.py", ".env", "setup.py", "secrets/key.py", "README"]
+
+    assert trie.match_mask(paths) == [trie.matches(p) for p in paths]
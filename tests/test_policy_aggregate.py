@@ -0,0 +1,198 @@
+import hashlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import claude_cli
+import policy_aggregate
+from conftest import HEADER, commit, git
+from policy_aggregate import (
+    AGGREGATE_METADATA_FIELDS,
+    AggregateState,
+    BottomKSample,
+    HyperLogLog,
+    _hash64,
+)
+from policy_engine import Finding, apply_policy_engine, iter_policy_engine, new_policy_summary
+
+
+CLI = Path(__file__).resolve().parent.parent / "claude_cli.py"
+
+
+def sha256(n):
+    return hashlib.sha256(str(n).encode()).hexdigest()
+
+
+def make_findings(n, duplicate_every=4, oversized_every=5):
+    return [
+        Finding(
+            id=f"src/pkg{i % 3}/f{i}.py",
+            type="file",
+            path=f"src/pkg{i % 3}/f{i}.py",
+            signal="ok",
+            metadata={
+                "line_count": 600 if i % oversized_every == 0 else 10,
+                "size": 100,
+                "sha256": sha256(0 if i % duplicate_every == 0 else i + 1),
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def aggregate_ids(result):
+    return [j.rule_id for j in result["judgements"] if j.finding_id == "<repo>"]
+
+
+def test_hyperloglog_estimates_and_merges():
+    whole, left, right = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        h = _hash64(str(i))
+        whole.add(h)
+        (left if i % 2 else right).add(h)
+    left.merge(right)
+
+    assert left.registers == whole.registers
+    assert abs(whole.estimate() - 20000) < 20000 * 0.05
+
+    small = HyperLogLog()
+    for i in range(50):
+        small.add(_hash64(str(i % 25)))
+    assert small.estimate() == 25
+
+
+def test_bottom_k_sample_is_order_independent():
+    keys = [(_hash64(str(i)), f"p{i}") for i in range(100)] * 2
+
+    whole = BottomKSample(4)
+    for key, item in keys:
+        whole.add(key, item)
+
+    left, right = BottomKSample(4), BottomKSample(4)
+    for key, item in reversed(keys[::2]):
+        left.add(key, item)
+    for key, item in keys[1::2]:
+        right.add(key, item)
+    right.merge(left)
+
+    assert right.sample() == whole.sample()
+    assert all(count == 2 for _, count in whole.sample())
+
+
+def test_aggregate_rules_run_after_file_rules():
+    findings = make_findings(100)
+    state = AggregateState(baseline_file_count=40)
+
+    result = apply_policy_engine(findings, aggregate=state)
+
+    assert aggregate_ids(result) == [
+        "REPO_DUPLICATE_FILES",
+        "REPO_OVERSIZED_FRACTION",
+        "REPO_FILE_COUNT_GROWTH",
+    ]
+    assert result["judgements"][-1].rule_id == "REPO_FILE_COUNT_GROWTH"
+    assert result["policy_summary"].checked_rules == 4 + len(policy_aggregate.AGGREGATE_RULES)
+    assert state.files == 100
+    assert state.total_size == 10000
+
+
+def test_clean_repo_has_no_aggregate_judgements(monkeypatch):
+    monkeypatch.setattr(policy_aggregate, "MAX_REPO_BYTES", 10 ** 6)
+    findings = make_findings(100, duplicate_every=1000, oversized_every=1000)
+
+    result = apply_policy_engine(findings[1:], aggregate=AggregateState(99))
+    plain = apply_policy_engine(findings[1:])
+
+    assert aggregate_ids(result) == []
+    assert result["judgements"] == plain["judgements"]
+    assert result["policy_summary"].passes == plain["policy_summary"].passes + 4
+
+
+def test_repo_too_large(monkeypatch):
+    monkeypatch.setattr(policy_aggregate, "MAX_REPO_BYTES", 500)
+
+    result = apply_policy_engine(make_findings(10), aggregate=AggregateState())
+
+    assert "REPO_TOO_LARGE" in aggregate_ids(result)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_sharded_aggregate_matches_sequential(columnar):
+    findings = make_findings(300)
+    sequential_state = AggregateState(100)
+    sequential = apply_policy_engine(findings, aggregate=sequential_state)
+
+    state = AggregateState(100)
+    summary = new_policy_summary()
+    judgements = list(iter_policy_engine(
+        iter(findings), summary, columnar=columnar, batch_size=7, workers=2, aggregate=state
+    ))
+
+    assert judgements == sequential["judgements"]
+    assert summary == sequential["policy_summary"]
+    assert state.paths.registers == sequential_state.paths.registers
+    assert state.content_sample.sample() == sequential_state.content_sample.sample()
+
+
+def test_tiny_files_are_never_duplicates():
+    findings = [
+        Finding(
+            id=f"pkg{i}/__init__.py",
+            type="file",
+            path=f"pkg{i}/__init__.py",
+            signal="ok",
+            metadata={"size": 0, "sha256": sha256("")},
+        )
+        for i in range(8)
+    ] + make_findings(10, duplicate_every=1000)
+    state = AggregateState()
+
+    result = apply_policy_engine(findings, aggregate=state)
+
+    assert "REPO_DUPLICATE_FILES" not in aggregate_ids(result)
+    assert state.hashed_files == 10
+    assert state.files == 18
+
+
+def test_pr_diff_gate_skips_the_aggregate(repo):
+    commit(repo, "one", **{f"m{i}.py": HEADER + f"x = {i}\n" for i in range(4)})
+
+    def gate():
+        return subprocess.run(
+            [sys.executable, str(CLI), ".", "--gate", "--aggregate"],
+            capture_output=True,
+            text=True,
+            cwd=repo,
+        )
+
+    baseline = repo / ".gatekeeper" / "aggregate.json"
+    assert gate().returncode == 0
+    assert json.loads(baseline.read_text())["file_count"] == 4
+
+    git(repo, "checkout", "-q", "-b", "feature")
+    commit(repo, "two", **{"feature.py": HEADER})
+
+    result = gate()
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout)["checked_rules"] == 4
+    assert json.loads(baseline.read_text())["file_count"] == 4
+
+
+@pytest.mark.parametrize("rule_set", ["default", "paths"])
+def test_gate_reads_aggregate_fields_up_front(tmp_path, monkeypatch, rule_set):
+    scans = []
+
+    def scan(target, fields=None, **kwargs):
+        scans.append(fields)
+        return iter(())
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(claude_cli, "iter_scan_target", scan)
+    claude_cli.run_gate_mode(".", False, False, rule_set=rule_set, aggregate=True)
+
+    # "paths" reads no metadata: an empty set, not "all fields"
+    assert AGGREGATE_METADATA_FIELDS <= scans[0]
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+import policy_columnar
+from policy_engine import Finding, apply_policy_engine, iter_policy_engine, new_policy_summary
+
+
+def synthetic_findings(n, seed=7):
+    rng = random.Random(seed)
+    dirs = ["src", "secrets", "private/x", "lib/.env", "docs", "a/../secrets"]
+    signals = ["ok", "ok", "ok", "missing_metadata"]
+    line_counts = [10, 499, 500, 501, 5000, None, "n/a"]
+    return [
+        Finding(
+            id=f"f{i}",
+            type="file",
+            path=f"/repo/{rng.choice(dirs)}/f{i}.py",
+            signal=rng.choice(signals),
+            metadata={"line_count": rng.choice(line_counts)},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_columnar_matches_scalar(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(policy_columnar, "np", None)
+    elif policy_columnar.np is None:
+        pytest.skip("numpy not installed")
+
+    findings = synthetic_findings(2000)
+
+    scalar = apply_policy_engine(findings)
+    columnar = apply_policy_engine(findings, columnar=True)
+
+    assert columnar == scalar
+    assert scalar["judgements"]
+
+
+def test_small_batches_keep_order_and_counts():
+    findings = synthetic_findings(300)
+
+    expected = new_policy_summary()
+    expected_judgements = list(iter_policy_engine(findings, expected))
+
+    summary = new_policy_summary()
+    judgements = list(iter_policy_engine(findings, summary, columnar=True, batch_size=7))
+
+    assert judgements == expected_judgements
+    assert summary == expected
+
+
+def test_top_level_files():
+    findings = [
+        Finding(id=p, type="file", path=p, signal="ok", metadata={"line_count": 10})
+        for p in ["main.py", ".env", "src/app.py", "setup.py"]
+    ]
+
+    scalar = apply_policy_engine(findings)
+    columnar = apply_policy_engine(findings, columnar=True)
+
+    assert columnar == scalar
+    assert [j.finding_id for j in columnar["judgements"]] == [".env"]
@@ -3,6 +3,8 @@ import pytest
 from policy_engine import (
     Finding,
     apply_policy_engine,
+    iter_policy_engine,
+    new_policy_summary,
 )
 
 
@@ -36,10 +38,10 @@ def test_empty_findings_produces_summary_only():
     summary = result["policy_summary"]
     judgements = result["judgements"]
 
-    assert summary.checked_rules == 3
+    assert summary.checked_rules == 4
     assert summary.violations == 0
     assert summary.warnings == 0
-    assert summary.passes == 3
+    assert summary.passes == 4
     assert judgements == []
 
 
@@ -115,7 +117,111 @@ def test_summary_counts_failures_and_warnings():
     result = apply_policy_engine([finding])
     summary = result["policy_summary"]
 
-    assert summary.checked_rules == 3
+    assert summary.checked_rules == 4
     assert summary.violations == 1
     assert summary.warnings == 2
-    assert summary.passes == 0
+    assert summary.passes == 1
+
+
+def test_streaming_engine_consumes_lazily_and_updates_summary():
+    produced = []
+
+    def findings():
+        for i, path in enumerate(["/private/a.py", "src/b.py", "/secrets/c.py"]):
+            produced.append(path)
+            yield make_finding(fid=path, path=path, line_count=10 + i)
+
+    summary = new_policy_summary()
+    stream = iter_policy_engine(findings(), summary)
+
+    first = next(stream)
+    assert first.finding_id == "/private/a.py"
+    assert produced == ["/private/a.py"]
+    assert summary.violations == 1
+    assert summary.profile == "strict"
+
+    rest = list(stream)
+    assert [j.finding_id for j in rest] == ["/secrets/c.py"]
+    assert summary.violations == 2
+    assert summary.passes == 2
+
+
+def test_apply_policy_engine_accepts_any_iterable():
+    findings = [make_finding(fid=str(i), line_count=600) for i in range(3)]
+
+    from_list = apply_policy_engine(findings)
+    from_gen = apply_policy_engine(f for f in findings)
+
+    assert from_gen == from_list
+    assert from_gen["policy_summary"].warnings == 3
+
+
+def test_required_metadata_fields():
+    from policy_engine import POLICY_RULES, required_metadata_fields
+
+    assert required_metadata_fields(POLICY_RULES) == {"line_count", "secrets", "header"}
+    assert required_metadata_fields([lambda finding: None]) is None
+
+
+def test_hardcoded_secret_fails():
+    finding = Finding(
+        id="src/config.py",
+        type="file",
+        path="src/config.py",
+        signal="ok",
+        metadata={"line_count": 3, "secrets": [["github_token", 3]]},
+    )
+
+    result = apply_policy_engine([finding])
+    j = result["judgements"][0]
+
+    assert j.rule_id == "HARDCODED_SECRET"
+    assert j.status == "fail"
+    assert "github_token on line 3" in j.reason
+    assert result["policy_summary"].violations == 1
+
+
+def test_fail_fast_stops_at_first_blocking_judgement():
+    produced = []
+
+    def findings():
+        for path in ["src/a.py", "src/big.py", "/secrets/c.py", "/secrets/d.py"]:
+            produced.append(path)
+            yield make_finding(
+                fid=path, path=path, line_count=600 if "big" in path else 10
+            )
+
+    result = apply_policy_engine(findings(), fail_fast=True)
+    summary = result["policy_summary"]
+
+    # The warning under the default profile does not block
+    assert [j.rule_id for j in result["judgements"]] == ["FILE_TOO_LARGE", "FORBIDDEN_PATH"]
+    assert produced == ["src/a.py", "src/big.py", "/secrets/c.py"]
+    assert summary.truncated is True
+    assert summary.violations == 1
+    assert summary.warnings == 1
+
+
+def test_fail_fast_blocks_on_warnings_under_strict_profile(monkeypatch):
+    import profiles
+
+    monkeypatch.setattr(
+        profiles, "OWNERSHIP_RULES", (("/strict", "strict"),) + profiles.OWNERSHIP_RULES
+    )
+    findings = [
+        make_finding(fid=f"/strict/f{i}.py", path=f"/strict/f{i}.py", line_count=600)
+        for i in range(3)
+    ]
+
+    result = apply_policy_engine(findings, fail_fast=True)
+
+    assert [j.finding_id for j in result["judgements"]] == ["/strict/f0.py"]
+    assert result["policy_summary"].truncated is True
+    assert result["policy_summary"].violations == 1
+
+
+def test_fail_fast_without_violations_is_not_truncated():
+    result = apply_policy_engine([make_finding()], fail_fast=True)
+
+    assert result["policy_summary"].truncated is False
+    assert result["policy_summary"] == apply_policy_engine([make_finding()])["policy_summary"]
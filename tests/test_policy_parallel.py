@@ -0,0 +1,69 @@
+import pytest
+
+import policy_parallel
+import scanner
+from policy_engine import (
+    Finding,
+    apply_policy_engine,
+    iter_policy_engine,
+    new_policy_summary,
+)
+
+
+LICENSE = "# SPDX-License-Identifier: MIT\n"
+
+
+def make_findings(n):
+    return [
+        Finding(
+            id=f"{'secrets' if i % 11 == 0 else 'src'}/pkg{i % 5}/f{i}.py",
+            type="file",
+            path=f"{'secrets' if i % 11 == 0 else 'src'}/pkg{i % 5}/f{i}.py",
+            signal="missing_metadata" if i % 7 == 0 else "ok",
+            metadata={"line_count": 600 if i % 3 == 0 else 10},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_sharded_matches_sequential(columnar):
+    findings = make_findings(200)
+    sequential = apply_policy_engine(findings)
+
+    summary = new_policy_summary()
+    judgements = list(iter_policy_engine(
+        iter(findings), summary, columnar=columnar, batch_size=7, workers=2
+    ))
+
+    assert judgements == sequential["judgements"]
+    assert summary == sequential["policy_summary"]
+
+
+def test_lazy_metadata_is_computed_in_workers(tmp_path, monkeypatch):
+    (tmp_path / "big.py").write_text(LICENSE + "x = 1\n" * 600)
+    (tmp_path / "small.py").write_text(LICENSE + "x = 1\n")
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+
+    eager = apply_policy_engine(scanner.scan_target(str(tmp_path)))
+    lazy = apply_policy_engine(
+        scanner.scan_target(str(tmp_path), fields=()), workers=2
+    )
+
+    assert lazy["judgements"] == eager["judgements"]
+    assert lazy["policy_summary"].warnings == 1
+
+
+def test_workers_are_not_forked(monkeypatch):
+    contexts = []
+    executor = policy_parallel.ProcessPoolExecutor
+
+    def spy(*args, mp_context=None, **kwargs):
+        contexts.append(mp_context.get_start_method())
+        return executor(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(policy_parallel, "ProcessPoolExecutor", spy)
+    findings = make_findings(20)
+
+    assert apply_policy_engine(findings, workers=2) == apply_policy_engine(findings)
+    assert contexts and "fork" not in contexts
@@ -0,0 +1,111 @@
+import pytest
+
+import policy_engine
+import pr_diff
+import scanner
+from conftest import HEADER, commit, git
+from judgement_cache import JudgementCache
+from policy_engine import Finding, apply_policy_engine, uses_metadata
+from pr_diff import resolve_changes
+
+
+@pytest.fixture
+def repo(repo, monkeypatch):
+    monkeypatch.delenv(pr_diff.BASE_BRANCH_ENV, raising=False)
+    monkeypatch.delenv("GITHUB_BASE_REF", raising=False)
+
+    commit(repo, "base", **{
+        "a.py": HEADER,
+        "b.py": HEADER + "x = 1\n" * 20,
+        "f.py": HEADER,
+    })
+    git(repo, "checkout", "-q", "-b", "feature")
+    commit(repo, "one", **{"a.py": HEADER + "a = 1\n"})
+    git(repo, "mv", "b.py", "c.py")
+    commit(repo, "two", **{"d.py": HEADER})
+    # Moves on the target branch after the PR forked are not the PR's
+    git(repo, "checkout", "-q", "main")
+    commit(repo, "main moves on", **{"f.py": HEADER + "f = 1\n"})
+    git(repo, "checkout", "-q", "feature")
+    return repo
+
+
+def test_changes_since_the_merge_base(repo):
+    (repo / "d.py").write_text(HEADER + "uncommitted = 1\n")
+
+    changes = resolve_changes(str(repo))
+
+    assert changes.base == git(repo, "merge-base", "main", "HEAD")
+    assert [(f.path, f.status, f.old_path) for f in changes.files] == [
+        ("a.py", "M", None),
+        ("c.py", "R", "b.py"),
+        ("d.py", "A", None),
+    ]
+    assert changes.renames() == {str(repo / "c.py"): str(repo / "b.py")}
+
+
+def test_configured_base_branch(repo, monkeypatch):
+    monkeypatch.setenv(pr_diff.BASE_BRANCH_ENV, "feature~1")
+
+    changes = resolve_changes(str(repo))
+
+    assert [f.path for f in changes.files] == ["c.py", "d.py"]
+
+
+def test_committed_changes_are_memoized_per_base_and_head(repo):
+    pr_diff._committed_changes.cache_clear()
+
+    resolve_changes(str(repo))
+    resolve_changes(str(repo))
+    info = pr_diff._committed_changes.cache_info()
+
+    assert (info.hits, info.misses) == (1, 1)
+
+    commit(repo, "three", **{"e.py": HEADER})
+    assert "e.py" in [f.path for f in resolve_changes(str(repo)).files]
+
+
+def test_scan_covers_every_commit_of_the_pr(repo):
+    paths = [f.path for f in scanner.scan_target(str(repo))]
+
+    assert paths == [str(repo / name) for name in ("a.py", "c.py", "d.py")]
+
+
+def test_outside_a_repository(tmp_path):
+    assert resolve_changes(str(tmp_path)) is None
+
+
+def _finding(path, sha256="s"):
+    return Finding(id=path, type="file", path=path, signal="ok", metadata={"sha256": sha256})
+
+
+def test_pure_renames_reuse_their_judgements(tmp_path):
+    calls = []
+
+    @uses_metadata("line_count")
+    def rule(finding):
+        calls.append(finding.path)
+        return None
+
+    rules = [policy_engine.rule_forbidden_path, rule]
+    cache = JudgementCache(tmp_path / "cache.json")
+    apply_policy_engine([_finding("src/old.py")], rules=rules, cache=cache)
+    calls.clear()
+
+    cache.carry_over({
+        "src/new.py": "src/old.py",
+        "secrets/new.py": "src/old.py",     # the path rules disagree
+        "src/new.txt": "src/old.py",        # the suffix changed
+        "src/other.py": "src/old.py",
+    })
+    findings = [
+        _finding("src/new.py"),
+        _finding("secrets/new.py"),
+        _finding("src/new.txt"),
+        _finding("src/other.py", sha256="edited"),
+    ]
+    result = apply_policy_engine(findings, rules=rules, cache=cache)
+
+    assert calls == ["secrets/new.py", "src/new.txt", "src/other.py"]
+    assert cache.hits == 1
+    assert [j.finding_id for j in result["judgements"]] == ["secrets/new.py"]
@@ -0,0 +1,170 @@
+import hashlib
+
+import pytest
+
+import scanner
+from scanner import _read_file_metadata
+
+
+def legacy_line_count(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in f)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"one line no newline",
+    b"a\nb\nc\n",
+    b"a\r\nb\r\nc",
+    b"mac\rstyle\rlines\r",
+    b"mixed\r\n\r\rx\n\n",
+    "unicode \u2028 not a break\nok\n".encode("utf-8"),
+    b"\xff\xfe invalid utf8\nline\n",
+])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 20])
+def test_line_count_matches_text_iteration(tmp_path, monkeypatch, data, chunk_size):
+    monkeypatch.setattr(scanner, "CHUNK_SIZE", chunk_size)
+    path = tmp_path / "f.txt"
+    path.write_bytes(data)
+
+    metadata = _read_file_metadata(str(path))
+
+    assert metadata["line_count"] == legacy_line_count(path)
+    assert metadata["binary"] is False
+    assert metadata["size"] == len(data)
+    assert metadata["sha256"] == hashlib.sha256(data).hexdigest()
+
+
+def test_binary_files_are_sniffed_and_not_counted(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00" + b"\n" * 1000)
+
+    metadata = _read_file_metadata(str(path))
+
+    assert metadata["binary"] is True
+    assert metadata["line_count"] is None
+    assert metadata["encoding"] is None
+    assert metadata["header"] is None
+
+
+@pytest.mark.parametrize("data, encoding", [
+    (b"plain ascii\n", "ascii"),
+    ("caf\u00e9\n".encode("utf-8"), "utf-8"),
+    (b"\xef\xbb\xbfbom\n", "utf-8-sig"),
+    ("hi\n".encode("utf-16"), "utf-16"),
+    (b"latin-1 caf\xe9\n", "unknown"),
+])
+def test_encoding_detection(tmp_path, monkeypatch, data, encoding):
+    monkeypatch.setattr(scanner, "CHUNK_SIZE", 3)
+    path = tmp_path / "f.txt"
+    path.write_bytes(data)
+
+    assert _read_file_metadata(str(path))["encoding"] == encoding
+
+
+def test_shebang_and_header(tmp_path):
+    path = tmp_path / "tool.py"
+    path.write_text("#!/usr/bin/env python3\n# SPDX-License-Identifier: MIT\n" + "x = 1\n" * 200)
+
+    metadata = _read_file_metadata(str(path))
+
+    assert metadata["shebang"] == "#!/usr/bin/env python3"
+    assert metadata["header"].startswith("#!/usr/bin/env python3\n# SPDX")
+    assert len(metadata["header"]) <= scanner.HEADER_BYTES
+    assert metadata["header"].endswith("\n")
+
+
+def test_content_hash_is_exposed_on_findings(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"x = 1\n")
+
+    finding = scanner._scan_file(str(path))
+
+    assert scanner.content_hash(finding) == hashlib.sha256(b"x = 1\n").hexdigest()
+
+
+def test_paths_rule_set_never_opens_files(tmp_path, monkeypatch):
+    from policy_engine import RULE_SETS, apply_policy_engine, required_metadata_fields
+
+    (tmp_path / "secrets").mkdir()
+    (tmp_path / "secrets" / "config.py").write_text("password = 'oops'\n")
+    (tmp_path / "ok.py").write_text("x = 1\n")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was opened")
+
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+    monkeypatch.setattr(scanner, "_read_file_metadata", fail)
+
+    rules = RULE_SETS["paths"]
+    findings = scanner.scan_target(
+        str(tmp_path), fields=required_metadata_fields(rules)
+    )
+    result = apply_policy_engine(findings, rules=rules)
+
+    assert result["policy_summary"].checked_rules == 1
+    assert result["policy_summary"].violations == 1
+
+
+def test_unrequested_fields_are_computed_lazily(tmp_path, monkeypatch):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"#!/bin/sh\nx = 1\n")
+    eager = _read_file_metadata(str(path))
+
+    calls = []
+    read = scanner._read_file_metadata
+    monkeypatch.setattr(
+        scanner, "_read_file_metadata",
+        lambda p, fields=None: calls.append(fields) or read(p, fields),
+    )
+
+    finding = scanner._scan_file(str(path), fields=frozenset({"line_count"}))
+    assert finding.metadata["line_count"] == 2
+    assert "sha256" not in finding.metadata.computed()
+    assert scanner.content_hash(finding) is None
+
+    assert finding.metadata["sha256"] == eager["sha256"]
+    assert finding.metadata["encoding"] == "ascii"
+    assert dict(finding.metadata) == eager
+    # line_count, then the rest of the full pass, then the mapped line_stats
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("name, text, signal", [
+    ("plain.py", "x = 1\n", "missing_metadata"),
+    ("spdx.py", "#!/usr/bin/env python3\n# SPDX-License-Identifier: MIT\nx = 1\n", "ok"),
+    ("copyright.py", '"""\nCopyright 2026 Example\n"""\n', "ok"),
+    ("notes.txt", "no header needed\n", "ok"),
+    ("empty.py", "", "ok"),
+])
+def test_header_sniff_sets_signal(tmp_path, name, text, signal):
+    path = tmp_path / name
+    path.write_text(text)
+
+    assert scanner._scan_file(str(path), fields=frozenset({"header"})).signal == signal
+    assert scanner._scan_file(str(path)).signal == signal
+
+
+def test_header_sniff_reads_only_the_first_block(tmp_path, monkeypatch):
+    path = tmp_path / "big.py"
+    path.write_text("# SPDX-License-Identifier: MIT\n" + "x = 1\n" * 100000)
+
+    def fail(*args):
+        raise AssertionError("whole file was read")
+
+    monkeypatch.setattr(scanner, "_iter_chunks", fail)
+    metadata = _read_file_metadata(str(path), frozenset({"header"}))
+
+    assert metadata["header"].startswith("# SPDX")
+    assert metadata["size"] == path.stat().st_size
+    assert "line_count" not in metadata
+
+
+def test_unread_header_leaves_signal_alone(tmp_path):
+    path = tmp_path / "plain.py"
+    path.write_text("x = 1\n")
+
+    finding = scanner._scan_file(str(path), fields=frozenset())
+
+    assert finding.signal == "ok"
+    assert "header" not in finding.metadata.computed()
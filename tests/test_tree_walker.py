@@ -0,0 +1,52 @@
+import os
+import threading
+
+import scanner
+from scanner import scan_target
+from tree_walker import bounded_map, iter_files
+
+
+def touch(path, text="x\n"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_iter_files_is_sorted_depth_first(tmp_path):
+    for rel in ["b.py", "a.py", "z/1.py", "m/2.py", "m/n/3.py"]:
+        touch(str(tmp_path / rel))
+    os.symlink(tmp_path / "m", tmp_path / "link")
+
+    rels = [os.path.relpath(e.path, tmp_path) for e in iter_files(str(tmp_path))]
+
+    assert rels == ["a.py", "b.py", "m/2.py", "m/n/3.py", "z/1.py"]
+
+
+def test_bounded_map_preserves_order_and_limits_in_flight():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def work(i):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        with lock:
+            state["running"] -= 1
+        return i * 2
+
+    out = list(bounded_map(work, range(200), workers=4, max_pending=8))
+
+    assert out == [i * 2 for i in range(200)]
+    assert state["peak"] <= 4
+
+
+def test_parallel_scan_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "_git_changed_files", lambda *args: set())
+    for i in range(50):
+        touch(str(tmp_path / f"d{i % 7}" / f"f{i}.py"), "y\n" * i)
+
+    sequential = scan_target(str(tmp_path), workers=1)
+    parallel = scan_target(str(tmp_path), workers=8)
+
+    assert parallel == sequential
+    assert len(parallel) == 50
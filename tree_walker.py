@@ -0,0 +1,153 @@
+"""
+Tree Walker — os.scandir-based file enumeration and bounded fan-out.
+
+iter_files() walks a tree depth-first in sorted order, so every caller
+sees the same file order on every run. The yielded os.DirEntry objects
+carry the stat information the OS already returned, so callers that need
+it do not pay for another os.stat(). Directories rejected by an
+IgnoreMatcher are pruned before they are opened.
+
+bounded_map() runs per-file work on a thread pool while keeping at most
+a fixed number of tasks in flight, yielding results in input order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, TypeVar
+
+from ignore_rules import IgnoreMatcher, compile_glob
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def iter_files(
+    root: str,
+    ignore: Optional[IgnoreMatcher] = None,
+) -> Iterator[os.DirEntry]:
+    """
+    Yield regular files under root (symlinked files included, symlinked
+    directories not descended), files of a directory before its
+    subdirectories, each group sorted by name.
+    """
+    rel_root = ignore.relative(root) if ignore is not None else None
+    if rel_root is None:
+        ignore = None
+
+    stack = [(root, rel_root)]
+
+    while stack:
+        dirpath, rel_dir = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel = None
+            if ignore is not None:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if ignore is None or not ignore.match(rel, True):
+                        subdirs.append((entry.path, rel))
+                elif entry.is_file():
+                    if ignore is None or not ignore.match(rel, False):
+                        yield entry
+            except OSError:
+                continue
+
+        # Reversed so the stack pops subdirectories in sorted order
+        stack.extend(reversed(subdirs))
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _static_prefix(pattern: str) -> str:
+    """Leading path components of a glob that contain no wildcards."""
+    parts = pattern.split("/")
+    static = []
+    for part in parts[:-1]:
+        if _GLOB_CHARS.intersection(part):
+            break
+        static.append(part)
+    return "/".join(static)
+
+
+def glob_files(
+    patterns: Iterable[str],
+    base: str = ".",
+    ignore: Optional[IgnoreMatcher] = None,
+) -> List[str]:
+    """
+    Expand pathlib-style glob patterns relative to base.
+
+    Literal paths are checked directly; wildcard patterns walk only their
+    static prefix directory, pruned by `ignore`. Returns sorted
+    '/'-separated paths relative to base.
+    """
+    base = os.path.abspath(base)
+    prefix = len(base.rstrip(os.sep)) + 1
+    matched = set()
+
+    by_root = {}
+    for pattern in patterns:
+        pattern = pattern.replace(os.sep, "/")
+        while pattern.startswith("./"):
+            pattern = pattern[2:]
+
+        if not _GLOB_CHARS.intersection(pattern):
+            if os.path.isfile(os.path.join(base, pattern)):
+                matched.add(os.path.normpath(pattern).replace(os.sep, "/"))
+            continue
+
+        by_root.setdefault(_static_prefix(pattern), []).append(compile_glob(pattern))
+
+    for root, regexes in by_root.items():
+        for entry in iter_files(os.path.join(base, root) if root else base, ignore):
+            rel = entry.path[prefix:].replace(os.sep, "/")
+            if any(r.match(rel) for r in regexes):
+                matched.add(rel)
+
+    return sorted(matched)
+
+
+def bounded_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Ordered, memory-bounded ThreadPoolExecutor.map().
+
+    workers <= 1 runs fn inline with no pool.
+    """
+    workers = DEFAULT_WORKERS if workers is None else workers
+
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    max_pending = max_pending or workers * 4
+    pending = deque()
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)